@@ -7,15 +7,17 @@ CONFIG_PATH="$1"
 # Check that a config file path was provided and correct
 if [ -z "$CONFIG_PATH" ]; then
   echo "Error: a config file path must be provided."
-  echo "Usage: docker run <image> <--config_file_path=[...]>"
+  echo "Usage: docker run <image> <--config_file_path=[...]> [--worker]"
   exit 1
 fi
 
+# All arguments (e.g. --worker) are passed on to Obscura
 /opt/blender/blender \
   --background \
   --python-expr "
 import obscura.main as cli
 import sys
-sys.argv = ['obscura', '$CONFIG_PATH']
+sys.argv = ['obscura'] + sys.argv[sys.argv.index('--') + 1:]
 cli.main()
-"
+" \
+  -- "$@"
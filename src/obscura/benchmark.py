@@ -0,0 +1,296 @@
+"""Benchmark of the render throughput and pipeline overhead of Obscura."""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import tempfile
+import time
+from typing import Any
+
+import numpy as np
+import yaml
+from munch import munchify
+
+from obscura.core.config import merge_config
+from obscura.core.image_io import wait_for_writes
+from obscura.core.mesh_io import write_binary_stl
+from obscura.core.profiling import StageProfiler, peak_rss_mb
+
+log = logging.getLogger("obscura")
+
+
+def synthetic_mesh(num_triangles: int) -> tuple[np.ndarray, np.ndarray]:
+    """Create a closed torus mesh with approximately the given number of
+    triangles.
+
+    Args:
+        num_triangles: Target number of triangles.
+
+    Returns:
+        Points (n, 3) and triangles (m, 3).
+    """
+
+    segments = max(3, int(np.ceil(np.sqrt(num_triangles / 2))))
+    angles = np.linspace(0, 2 * np.pi, segments, endpoint=False)
+    u, v = np.meshgrid(angles, angles, indexing="ij")
+    points = np.stack(
+        [
+            (1 + 0.3 * np.cos(v)) * np.cos(u),
+            (1 + 0.3 * np.cos(v)) * np.sin(u),
+            0.3 * np.sin(v),
+        ],
+        axis=-1,
+    ).reshape(-1, 3)
+
+    # two triangles per quad of the periodic grid
+    i, j = np.meshgrid(np.arange(segments), np.arange(segments), indexing="ij")
+    i_next, j_next = (i + 1) % segments, (j + 1) % segments
+    a = i * segments + j
+    b = i_next * segments + j
+    c = i_next * segments + j_next
+    d = i * segments + j_next
+    triangles = np.concatenate(
+        [np.stack([a, b, c], axis=-1), np.stack([a, c, d], axis=-1)]
+    ).reshape(-1, 3)
+
+    return points, triangles
+
+
+def run_benchmark(
+    config: Any,
+    sizes: list[int],
+    engines: list[str],
+    resolutions: list[tuple[int, int]],
+    samples: list[int],
+    repeats: int,
+    output_directory: str,
+) -> dict:
+    """Render synthetic meshes for all combinations of the settings.
+
+    Args:
+        config: Munch type object containing the base config.
+        sizes: Target number of triangles of the synthetic meshes, the
+        results hold the number of triangles of the generated meshes.
+        engines: Render engines.
+        resolutions: Output resolutions (x, y).
+        samples: Cycles sample counts.
+        repeats: Number of renders per combination.
+        output_directory: Directory for meshes and images.
+
+    Returns:
+        Benchmark results, the peak memory of every case is given as the
+        peak of the process so far and its increase during the case,
+        i.e. the memory the case needed beyond all previous cases.
+    """
+
+    from obscura.core.rendering.rendering_pipeline import rendering_pipeline
+
+    results = []
+    for size in sizes:
+        mesh_path = os.path.join(output_directory, f"mesh_{size}.stl")
+        points, triangles = synthetic_mesh(size)
+        write_binary_stl(mesh_path, points, triangles)
+
+        for engine in engines:
+            # samples only affect Cycles
+            engine_samples = samples if engine == "CYCLES" else samples[:1]
+            for resolution_x, resolution_y in resolutions:
+                for num_samples in engine_samples:
+                    case = {
+                        "triangles": len(triangles),
+                        "engine": engine,
+                        "resolution": [resolution_x, resolution_y],
+                        "samples": num_samples,
+                    }
+                    case_config = merge_config(
+                        config,
+                        {
+                            "general": {
+                                "input_file_path": mesh_path,
+                                "output_file_path": os.path.join(
+                                    output_directory, "render.png"
+                                ),
+                            },
+                            "render": {
+                                "engine": engine,
+                                "resolution_x": resolution_x,
+                                "resolution_y": resolution_y,
+                                "samples": num_samples,
+                                "preview": {"mode": False},
+                            },
+                        },
+                    )
+
+                    profiler = StageProfiler()
+                    peak_rss_start = peak_rss_mb()
+                    start_time = time.perf_counter()
+                    for repeat in range(repeats):
+                        rendering_pipeline(case_config, profiler=profiler)
+                    wait_for_writes()
+                    seconds = (time.perf_counter() - start_time) / repeats
+                    process_peak_rss = peak_rss_mb()
+
+                    case.update(
+                        {
+                            "seconds_per_image": seconds,
+                            "images_per_minute": 60.0 / seconds,
+                            "stages": {
+                                stage: wall_time / repeats
+                                for stage, wall_time in profiler.totals().items()
+                            },
+                            "process_peak_rss_mb": process_peak_rss,
+                            "peak_rss_increase_mb": process_peak_rss - peak_rss_start,
+                        }
+                    )
+                    results.append(case)
+                    log.info(
+                        f"{len(triangles)} triangles, {engine}, {resolution_x}x{resolution_y}, "
+                        f"{num_samples} samples: {case['images_per_minute']:.2f} "
+                        "images/min"
+                    )
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": {
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def compare_results(results: dict, baseline: dict) -> list[dict]:
+    """Compare the throughput of matching cases with a baseline.
+
+    Args:
+        results: Current benchmark results.
+        baseline: Benchmark results to compare with.
+
+    Returns:
+        Speedup of each case found in both results.
+    """
+
+    def _key(case: dict) -> tuple:
+        """Identify a case by its mesh size, engine, resolution and samples.
+
+        Args:
+            case: Result of a benchmark case.
+
+        Returns:
+            Key of the case.
+        """
+
+        return (
+            case["triangles"],
+            case["engine"],
+            tuple(case["resolution"]),
+            case["samples"],
+        )
+
+    baseline_cases = {_key(case): case for case in baseline["results"]}
+    comparison = []
+    for case in results["results"]:
+        if _key(case) in baseline_cases:
+            comparison.append(
+                {
+                    "case": _key(case),
+                    "speedup": case["images_per_minute"]
+                    / baseline_cases[_key(case)]["images_per_minute"],
+                }
+            )
+    return comparison
+
+
+def main() -> None:
+    """Run the Obscura benchmark.
+
+    Raises:
+        RuntimeError: If provided config is not a valid file.
+    """
+
+    parser = argparse.ArgumentParser(description="Benchmark Obscura")
+    parser.add_argument(
+        "--config_file_path",
+        "-cfp",
+        help="Path to base config file.",
+        type=str,
+        required=True,
+    )
+    parser.add_argument(
+        "--triangles",
+        help="Number of triangles of the synthetic meshes.",
+        type=int,
+        nargs="+",
+        default=[1_000, 10_000, 100_000, 1_000_000, 10_000_000],
+    )
+    parser.add_argument(
+        "--engines",
+        help="Render engines.",
+        nargs="+",
+        default=["BLENDER_WORKBENCH", "BLENDER_EEVEE_NEXT", "CYCLES"],
+    )
+    parser.add_argument(
+        "--resolutions",
+        help="Output resolutions as <x>x<y>.",
+        nargs="+",
+        default=["480x300", "1920x1200"],
+    )
+    parser.add_argument(
+        "--samples",
+        help="Cycles sample counts.",
+        type=int,
+        nargs="+",
+        default=[16, 128],
+    )
+    parser.add_argument(
+        "--repeats", help="Renders per combination.", type=int, default=1
+    )
+    parser.add_argument(
+        "--output", help="Path of the result file.", default="benchmark.json"
+    )
+    parser.add_argument(
+        "--compare", help="Path of a result file to compare with.", default=None
+    )
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.config_file_path):
+        raise RuntimeError("Config file not found! Obscura can not be executed!")
+
+    with open(args.config_file_path, "r") as file:
+        config = munchify(yaml.safe_load(file))
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    resolutions = []
+    for resolution in args.resolutions:
+        width, height = resolution.split("x")
+        resolutions.append((int(width), int(height)))
+
+    with tempfile.TemporaryDirectory() as output_directory:
+        results = run_benchmark(
+            config,
+            args.triangles,
+            args.engines,
+            resolutions,
+            args.samples,
+            args.repeats,
+            output_directory,
+        )
+
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+    log.info(f"Benchmark results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r") as file:
+            baseline = json.load(file)
+        for entry in compare_results(results, baseline):
+            log.info(f"{entry['case']}: {entry['speedup']:.2f}x")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
+    exit(0)
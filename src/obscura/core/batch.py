@@ -0,0 +1,253 @@
+"""Batch rendering of many meshes/configs within one Blender session."""
+
+import glob
+import json
+import logging
+import os
+import time
+from collections import Counter
+from typing import Any
+
+import yaml
+from munch import Munch
+
+from obscura.core.config import merge_config
+from obscura.core.profiling import StageProfiler
+from obscura.core.render_cache import RenderCache
+
+log = logging.getLogger("obscura")
+
+
+def expand_jobs(config: Any) -> list[Munch]:
+    """Expand the batch section of the config into single job configs.
+
+    One job is created for every file matching the entries of
+    `batch.input_file_paths` (paths or glob patterns) and for every
+    config override listed in `batch.jobs` or in the manifest file
+    `batch.manifest_file_path`.
+
+    Args:
+        config: Munch type object containing all configs for current
+        run.
+
+    Returns:
+        List of configs, one for each job.
+    """
+
+    batch = config.batch
+    base, ext = os.path.splitext(config.general.output_file_path)
+    output_dir = os.path.dirname(config.general.output_file_path)
+
+    input_file_paths = []
+    for pattern in batch.get("input_file_paths") or []:
+        input_file_paths += sorted(glob.glob(pattern)) or [pattern]
+
+    jobs = []
+    for input_file_path, name in zip(input_file_paths, _output_names(input_file_paths)):
+        jobs.append(
+            {
+                "general": {
+                    "input_file_path": input_file_path,
+                    "output_file_path": os.path.join(output_dir, name + ext),
+                }
+            }
+        )
+
+    overrides = list(batch.get("jobs") or [])
+    if batch.get("manifest_file_path"):
+        with open(batch.manifest_file_path, "r") as file:
+            overrides += yaml.safe_load(file) or []
+
+    for override in overrides:
+        override = dict(override)
+        general = dict(override.get("general", {}))
+        general.setdefault("output_file_path", f"{base}_{len(jobs):04d}{ext}")
+        override["general"] = general
+        jobs.append(override)
+
+    # jobs must not overwrite the images of other jobs
+    output_counts = Counter(job["general"]["output_file_path"] for job in jobs)
+    for index, job in enumerate(jobs):
+        output_file_path = job["general"]["output_file_path"]
+        if output_counts[output_file_path] > 1:
+            root, job_ext = os.path.splitext(output_file_path)
+            job["general"]["output_file_path"] = f"{root}_{index:04d}{job_ext}"
+            log.warning(
+                f"Output file {output_file_path} of job {index} is used by "
+                f"multiple jobs, writing {job['general']['output_file_path']}"
+            )
+
+    # the job configs do not carry the job lists of the whole batch
+    base_config = merge_config(
+        config,
+        {"batch": {"input_file_paths": [], "jobs": [], "manifest_file_path": None}},
+    )
+    return [merge_config(base_config, job) for job in jobs]
+
+
+def _output_names(input_file_paths: list[str]) -> list[str]:
+    """Name the output images of the input files after their stems.
+
+    Input files with the same stem in different directories are prefixed
+    by their directory relative to the common directory of these files.
+
+    Args:
+        input_file_paths: Paths of the input files.
+
+    Returns:
+        Output name (without extension) of every input file.
+    """
+
+    stems = [
+        os.path.splitext(os.path.basename(input_file_path))[0]
+        for input_file_path in input_file_paths
+    ]
+    stem_counts = Counter(stems)
+    directories = [
+        os.path.dirname(os.path.abspath(input_file_path))
+        for input_file_path in input_file_paths
+    ]
+
+    names = []
+    for stem, directory in zip(stems, directories):
+        if stem_counts[stem] > 1:
+            common = os.path.commonpath(
+                [d for s, d in zip(stems, directories) if s == stem]
+            )
+            relative = os.path.relpath(directory, common)
+            if relative != os.curdir:
+                stem = relative.replace(os.sep, "_") + "_" + stem
+        names.append(stem)
+    return names
+
+
+def run_batch(config: Any, profiler: StageProfiler | None = None) -> list[dict]:
+    """Render all jobs of the batch within the current Blender session.
+
+    The scene is reset to factory settings only once. Between jobs just
+    the objects of the previous job are removed. Jobs found in the
+    render cache are not rendered again. A summary including the
+    timings of all jobs is written to the output directory.
+
+    Args:
+        config: Munch type object containing all configs for current
+        run.
+        profiler: Profiler recording the stage timings of all jobs.
+
+    Returns:
+        Summary entry for each job.
+    """
+
+    from obscura.core.image_io import wait_for_writes
+
+    profiler = profiler or StageProfiler()
+    render_cache = RenderCache.from_config(config)
+    jobs = expand_jobs(config)
+    log.info(f"Batch rendering of {len(jobs)} jobs ...")
+    log.info("")
+
+    batch_start_time = time.time()
+    results = []
+    cache_keys: dict[int, str] = {}
+    num_rendered = 0
+    for index, job_config in enumerate(jobs):
+        result = {
+            "index": index,
+            "input_file_path": job_config.general.input_file_path,
+            "output_files": [],
+            "status": "done",
+            "error": None,
+        }
+
+        start_time = time.time()
+        profiler.label = f"job{index:04d}"
+        try:
+            cached_files = None
+            if render_cache is not None:
+                cache_keys[index] = render_cache.key(job_config)
+                cached_files = render_cache.lookup(job_config, cache_keys[index])
+            if cached_files:
+                result["output_files"] = cached_files
+                result["status"] = "cached"
+            else:
+                # Blender is only imported once a job has to be rendered
+                from obscura.core.rendering.rendering_pipeline import (
+                    rendering_pipeline,
+                )
+
+                result["output_files"] = rendering_pipeline(
+                    job_config, clear_only=num_rendered > 0, profiler=profiler
+                )
+                num_rendered += 1
+        except Exception as error:
+            if not config.batch.get("continue_on_error", True):
+                raise
+            log.exception(f"Job {index} failed!")
+            result["status"] = "failed"
+            result["error"] = str(error)
+        result["seconds"] = time.time() - start_time
+
+        log.info(
+            f"Job {index + 1}/{len(jobs)} {result['status']} in "
+            f"{result['seconds']:.3f} s ({result['input_file_path']})"
+        )
+        results.append(result)
+
+    profiler.label = None
+    for result in results:
+        if result["status"] != "done":
+            continue
+        # Images may still be encoded in the background
+        try:
+            wait_for_writes(result["output_files"])
+        except Exception as error:
+            if not config.batch.get("continue_on_error", True):
+                raise
+            log.exception(f"Writing the images of job {result['index']} failed!")
+            result["status"] = "failed"
+            result["error"] = str(error)
+
+    if render_cache is not None:
+        for job_config, result in zip(jobs, results):
+            if result["status"] == "done":
+                render_cache.store(
+                    job_config, cache_keys[result["index"]], result["output_files"]
+                )
+    write_batch_summary(config, results, time.time() - batch_start_time)
+
+    return results
+
+
+def write_batch_summary(config: Any, results: list[dict], seconds: float) -> None:
+    """Write the per-job results of a batch to a summary file.
+
+    Args:
+        config: Munch type object containing all configs for current
+        run.
+        results: Summary entry for each job.
+        seconds: Overall duration of the batch.
+    """
+
+    summary = {
+        "num_jobs": len(results),
+        "num_failed": sum(result["status"] == "failed" for result in results),
+        "num_cached": sum(result["status"] == "cached" for result in results),
+        "seconds": seconds,
+        "jobs": results,
+    }
+
+    summary_path = os.path.join(
+        config.general.output_directory,
+        config.general.sim_name,
+        "batch_summary.json",
+    )
+    os.makedirs(os.path.dirname(summary_path), exist_ok=True)
+    with open(summary_path, "w") as file:
+        json.dump(summary, file, indent=2)
+
+    log.info(
+        f"Batch finished: {summary['num_jobs'] - summary['num_failed']}/"
+        f"{summary['num_jobs']} jobs done ({summary['num_cached']} from the render "
+        f"cache) in {seconds:.3f} s."
+    )
+    log.info(f"Batch summary written to {summary_path}")
@@ -0,0 +1,41 @@
+"""Config helpers for Obscura."""
+
+import copy
+from typing import Any
+
+from munch import Munch, munchify
+
+
+def merge_config(config: Any, overrides: dict) -> Munch:
+    """Return a copy of the config with the overrides merged in.
+
+    Nested dictionaries are merged recursively, all other values of the
+    overrides replace the values of the config.
+
+    Args:
+        config: Munch type object containing the base config.
+        overrides: Nested dictionary with the config values to replace.
+
+    Returns:
+        Munch type object containing the merged config.
+    """
+
+    merged = copy.deepcopy(config.toDict())
+
+    def _merge(target: dict, source: dict) -> None:
+        """Recursively replace the values of a dictionary.
+
+        Args:
+            target: Dictionary updated in place.
+            source: Dictionary with the values to replace.
+        """
+
+        for key, value in source.items():
+            if isinstance(value, dict) and isinstance(target.get(key), dict):
+                _merge(target[key], value)
+            else:
+                target[key] = copy.deepcopy(value)
+
+    _merge(merged, dict(overrides))
+
+    return munchify(merged)
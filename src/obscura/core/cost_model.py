@@ -0,0 +1,160 @@
+"""Render time model of the engines to select the engine of "AUTO"
+renders."""
+
+import functools
+import json
+import logging
+from typing import Any
+
+import numpy as np
+
+log = logging.getLogger("obscura")
+
+AUTO_ENGINE = "AUTO"
+
+
+def _features(triangles: float, pixels: float, samples: float) -> list[float]:
+    """Get the terms of the linear render time model.
+
+    Args:
+        triangles: Number of triangles of the scene.
+        pixels: Number of output pixels.
+        samples: Cycles samples per pixel (0 for other engines).
+
+    Returns:
+        Constant, million triangles, million pixels and million pixel
+        samples.
+    """
+
+    return [1.0, triangles / 1e6, pixels / 1e6, pixels * samples / 1e6]
+
+
+def predict_seconds(
+    coefficients: list[float], triangles: float, pixels: float, samples: float
+) -> float:
+    """Predict the render time of an image.
+
+    Args:
+        coefficients: Seconds per image, per million triangles, per
+        million pixels (e.g. denoising) and per million pixel samples.
+        triangles: Number of triangles of the scene.
+        pixels: Number of output pixels.
+        samples: Cycles samples per pixel (0 for other engines).
+
+    Returns:
+        Predicted seconds per image.
+    """
+
+    return float(np.dot(coefficients, _features(triangles, pixels, samples)))
+
+
+def fit_cost_model(results: dict) -> dict[str, list[float]]:
+    """Fit the coefficients of all engines to benchmark results.
+
+    Args:
+        results: Results of `obscura.benchmark`.
+
+    Returns:
+        Non-negative coefficients by engine.
+    """
+
+    cases_by_engine: dict[str, list[dict]] = {}
+    for case in results["results"]:
+        cases_by_engine.setdefault(case["engine"], []).append(case)
+
+    cost_model = {}
+    for engine, cases in cases_by_engine.items():
+        features = np.array(
+            [
+                _features(
+                    case["triangles"],
+                    case["resolution"][0] * case["resolution"][1],
+                    case["samples"] if engine == "CYCLES" else 0,
+                )
+                for case in cases
+            ]
+        )
+        seconds = np.array([case["seconds_per_image"] for case in cases])
+        coefficients = np.linalg.lstsq(features, seconds, rcond=None)[0]
+        cost_model[engine] = np.maximum(coefficients, 0.0).tolist()
+    return cost_model
+
+
+@functools.lru_cache(maxsize=8)
+def _fitted_cost_model(benchmark_file: str) -> dict[str, list[float]]:
+    """Fit the cost model to a benchmark result file once per process.
+
+    Args:
+        benchmark_file: Path to the benchmark result file.
+
+    Returns:
+        Coefficients by engine.
+    """
+
+    with open(benchmark_file, "r") as file:
+        return fit_cost_model(json.load(file))
+
+
+def load_cost_model(auto: Any) -> dict[str, list[float]]:
+    """Get the coefficients of the candidate engines.
+
+    Args:
+        auto: Settings of the automatic engine selection.
+
+    Returns:
+        Coefficients by engine in the configured order, fitted to the
+        benchmark file if given.
+    """
+
+    cost_model = {engine: list(values) for engine, values in auto.cost_model.items()}
+    if auto.get("benchmark_file"):
+        fitted = _fitted_cost_model(auto.benchmark_file)
+        cost_model = {
+            engine: fitted.get(engine, values) for engine, values in cost_model.items()
+        }
+    return cost_model
+
+
+def select_engine(
+    auto: Any,
+    triangles: int,
+    pixels: int,
+    samples: int,
+    exclude: tuple[str, ...] = (),
+) -> str:
+    """Select the engine of the highest quality within the time limit.
+
+    Args:
+        auto: Settings of the automatic engine selection, the engines
+        of the cost model are ordered from highest to lowest quality.
+        triangles: Number of triangles of the scene.
+        pixels: Number of output pixels.
+        samples: Cycles samples per pixel.
+        exclude: Engines which can not render the scene.
+
+    Returns:
+        Engine predicted to render within the time limit, the fastest
+        engine if none does.
+    """
+
+    predictions = {
+        engine: predict_seconds(
+            coefficients, triangles, pixels, samples if engine == "CYCLES" else 0
+        )
+        for engine, coefficients in load_cost_model(auto).items()
+        if engine not in exclude
+    }
+    within_limit = [
+        engine for engine, seconds in predictions.items() if seconds <= auto.max_seconds
+    ]
+    engine = (
+        within_limit[0]
+        if within_limit
+        else min(predictions, key=predictions.__getitem__)
+    )
+
+    log.info(
+        f"Selected {engine} for {triangles} triangles and {pixels} pixels "
+        f"(predicted {predictions[engine]:.3f} s)"
+    )
+    return engine
@@ -0,0 +1,55 @@
+"""Content hashes of input files for the on-disk caches."""
+
+import hashlib
+import os
+import tempfile
+
+
+def file_hash(file_path: str, chunk_size: int = 2**20) -> str:
+    """Compute the SHA-256 hash of a file's content.
+
+    Args:
+        file_path: Path to the file.
+        chunk_size: Number of bytes read at once.
+
+    Returns:
+        Hex digest of the hash.
+    """
+
+    sha = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        while chunk := file.read(chunk_size):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def indexed_file_hash(file_path: str, directory: str) -> str:
+    """Get the SHA-256 hash of a file's content, memoized in a directory
+    by the path, size and modification time of the file so unchanged
+    files are only read once.
+
+    Args:
+        file_path: Path to the file.
+        directory: Directory of the memoized hashes.
+
+    Returns:
+        Hex digest of the hash.
+    """
+
+    stat = os.stat(file_path)
+    file_id = f"{os.path.abspath(file_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    index_path = os.path.join(directory, hashlib.sha256(file_id.encode()).hexdigest())
+    try:
+        with open(index_path, "r") as file:
+            return file.read()
+    except FileNotFoundError:
+        pass
+
+    digest = file_hash(file_path)
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        "w", dir=directory, prefix=".tmp_", delete=False
+    ) as tmp_file:
+        tmp_file.write(digest)
+    os.replace(tmp_file.name, index_path)
+    return digest
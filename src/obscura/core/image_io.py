@@ -0,0 +1,418 @@
+"""Reading and writing of image files without Blender."""
+
+import contextlib
+import struct
+import zlib
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from types import TracebackType
+
+import numpy as np
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+PNG_COLOR_TYPES = {1: 0, 2: 4, 3: 2, 4: 6}  # channels -> PNG color type
+PNG_FILTER_TYPES = np.array([1, 2, 4], dtype=np.uint8)  # Sub, Up, Paeth
+PNG_FILTER_BLOCK_ROWS = 64  # Rows filtered at once to bound the memory
+TGA_HEADER_SIZE = 18
+
+# 3x5 pixel glyphs of the built-in font, rows from the top
+FONT_GLYPHS = {
+    "0": "111 101 101 101 111",
+    "1": "010 110 010 010 111",
+    "2": "111 001 111 100 111",
+    "3": "111 001 111 001 111",
+    "4": "101 101 111 001 001",
+    "5": "111 100 111 001 111",
+    "6": "111 100 111 101 111",
+    "7": "111 001 001 001 001",
+    "8": "111 101 111 101 111",
+    "9": "111 101 111 001 111",
+    "A": "010 101 111 101 101",
+    "B": "110 101 110 101 110",
+    "C": "011 100 100 100 011",
+    "D": "110 101 101 101 110",
+    "E": "111 100 110 100 111",
+    "F": "111 100 110 100 100",
+    "G": "011 100 101 101 011",
+    "H": "101 101 111 101 101",
+    "I": "111 010 010 010 111",
+    "J": "001 001 001 101 010",
+    "K": "101 101 110 101 101",
+    "L": "100 100 100 100 111",
+    "M": "101 111 111 101 101",
+    "N": "110 101 101 101 101",
+    "O": "010 101 101 101 010",
+    "P": "110 101 110 100 100",
+    "Q": "010 101 101 110 011",
+    "R": "110 101 110 101 101",
+    "S": "011 100 010 001 110",
+    "T": "111 010 010 010 010",
+    "U": "101 101 101 101 111",
+    "V": "101 101 101 101 010",
+    "W": "101 101 111 111 101",
+    "X": "101 101 010 101 101",
+    "Y": "101 101 010 010 010",
+    "Z": "111 001 010 100 111",
+    "-": "000 000 111 000 000",
+    "+": "000 010 111 010 000",
+    ".": "000 000 000 000 010",
+    ",": "000 000 000 010 100",
+    ":": "000 010 000 010 000",
+    "_": "000 000 000 000 111",
+    "/": "001 001 010 100 100",
+    "(": "010 100 100 100 010",
+    ")": "010 001 001 001 010",
+    " ": "000 000 000 000 000",
+    "?": "111 001 010 000 010",
+}
+FONT_SIZE = (5, 3)  # Height and width of a glyph in pixels
+
+
+class PngWriter:
+    """Write an 8 bit PNG image row by row.
+
+    Rows are compressed as they are written, so only the compressed
+    data of the current IDAT chunk is kept in memory instead of the full
+    image. Every row is filtered with the Sub, Up or Paeth filter of
+    the smallest sum of absolute differences (the heuristic of the PNG
+    specification), which compresses rendered images much better than
+    unfiltered rows. Text metadata is written as tEXt chunks.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        width: int,
+        height: int,
+        channels: int = 4,
+        compression: int = 6,
+        chunk_size: int = 2**20,
+        text: dict[str, str] | None = None,
+    ) -> None:
+        if channels not in PNG_COLOR_TYPES:
+            raise ValueError(f"PNG images with {channels} channels are not supported!")
+
+        self.width = width
+        self.height = height
+        self.channels = channels
+        self.chunk_size = chunk_size
+        self.num_rows = 0
+        self.compressor = zlib.compressobj(compression)
+        self.buffer = bytearray()
+        self.previous_row = np.zeros(width * channels, dtype=np.uint8)
+
+        # the file is closed if writing the header fails
+        with contextlib.ExitStack() as stack:
+            self.file = stack.enter_context(open(path, "wb"))
+            self.file.write(PNG_SIGNATURE)
+            self._write_chunk(
+                b"IHDR",
+                struct.pack(
+                    ">IIBBBBB", width, height, 8, PNG_COLOR_TYPES[channels], 0, 0, 0
+                ),
+            )
+            for keyword, value in (text or {}).items():
+                self._write_chunk(
+                    b"tEXt", keyword.encode("latin-1") + b"\0" + value.encode("latin-1")
+                )
+            self.exit_stack = stack.pop_all()
+
+    def __enter__(self) -> "PngWriter":
+        """Return the writer for use in a with statement."""
+
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Finish the image, or only close the file after an error."""
+
+        if exc_type is None:
+            self.close()
+        else:
+            self.exit_stack.close()
+
+    def _write_chunk(self, chunk_type: bytes, data: bytes) -> None:
+        """Write a PNG chunk.
+
+        Args:
+            chunk_type: Four letter type of the chunk.
+            data: Data of the chunk.
+        """
+
+        self.file.write(struct.pack(">I", len(data)))
+        self.file.write(chunk_type)
+        self.file.write(data)
+        self.file.write(struct.pack(">I", zlib.crc32(chunk_type + data)))
+
+    def _filter(self, rows: np.ndarray) -> np.ndarray:
+        """Filter rows with the best filter of each row.
+
+        Args:
+            rows: Pixel rows (n, width * channels) of type uint8 following
+            the previously written row.
+
+        Returns:
+            Scanlines (n, 1 + width * channels) with the filter type in
+            front of every row.
+        """
+
+        raw = rows.astype(np.int16)
+        up = np.concatenate([self.previous_row[None].astype(np.int16), raw[:-1]])
+        left = np.zeros_like(raw)
+        left[:, self.channels :] = raw[:, : -self.channels]
+        upper_left = np.zeros_like(raw)
+        upper_left[:, self.channels :] = up[:, : -self.channels]
+
+        # Paeth predicts the neighbour closest to left + up - upper left
+        estimate = left + up - upper_left
+        distance_left = np.abs(estimate - left)
+        distance_up = np.abs(estimate - up)
+        distance_upper_left = np.abs(estimate - upper_left)
+        paeth = np.where(
+            (distance_left <= distance_up) & (distance_left <= distance_upper_left),
+            left,
+            np.where(distance_up <= distance_upper_left, up, upper_left),
+        )
+
+        # differences modulo 256, the cost treats them as signed bytes
+        candidates = np.stack([raw - left, raw - up, raw - paeth]).astype(np.uint8)
+        costs = np.abs(candidates.view(np.int8).astype(np.int32)).sum(axis=2)
+        best = np.argmin(costs, axis=0)
+
+        scanlines = np.empty((len(rows), 1 + rows.shape[1]), dtype=np.uint8)
+        scanlines[:, 0] = PNG_FILTER_TYPES[best]
+        scanlines[:, 1:] = candidates[best, np.arange(len(rows))]
+        return scanlines
+
+    def write_rows(self, rows: np.ndarray) -> None:
+        """Append rows to the image.
+
+        Args:
+            rows: Pixel rows (n, width, channels) of type uint8 from top
+            to bottom.
+        """
+
+        if rows.shape[1:] != (self.width, self.channels):
+            raise ValueError(
+                f"Rows of shape {rows.shape[1:]} do not match the image "
+                f"({self.width}, {self.channels})!"
+            )
+
+        rows = rows.reshape(rows.shape[0], -1)
+        for start in range(0, len(rows), PNG_FILTER_BLOCK_ROWS):
+            block = rows[start : start + PNG_FILTER_BLOCK_ROWS]
+            scanlines = self._filter(block)
+            self.previous_row = block[-1].copy()
+            self.buffer += self.compressor.compress(scanlines.tobytes())
+        self.num_rows += rows.shape[0]
+
+        if len(self.buffer) >= self.chunk_size:
+            self._write_chunk(b"IDAT", bytes(self.buffer))
+            self.buffer.clear()
+
+    def close(self) -> None:
+        """Finish the image and close the file.
+
+        Raises:
+            ValueError: If not all rows of the image were written.
+        """
+
+        try:
+            if self.num_rows != self.height:
+                raise ValueError(
+                    f"Only {self.num_rows} of {self.height} rows were written!"
+                )
+            self.buffer += self.compressor.flush()
+            self._write_chunk(b"IDAT", bytes(self.buffer))
+            self._write_chunk(b"IEND", b"")
+        finally:
+            self.exit_stack.close()
+
+
+def png_compression_level(compression: int) -> int:
+    """Map the PNG compression of Blender onto a zlib compression level.
+
+    Args:
+        compression: PNG compression of Blender (0-100).
+
+    Returns:
+        zlib compression level (0-9).
+    """
+
+    return min(9, max(0, compression) * 9 // 100)
+
+
+def write_png(
+    path: str,
+    pixels: np.ndarray,
+    compression: int = 6,
+    text: dict[str, str] | None = None,
+) -> None:
+    """Write an 8 bit PNG image.
+
+    Args:
+        path: Path of the PNG image.
+        pixels: Pixels (height, width, channels) of type uint8 from top to
+        bottom.
+        compression: zlib compression level (0-9).
+        text: Metadata stored as tEXt chunks by keyword.
+    """
+
+    height, width, channels = pixels.shape
+    with PngWriter(path, width, height, channels, compression, text=text) as writer:
+        writer.write_rows(pixels)
+
+
+def text_mask(text: str, scale: int = 1) -> np.ndarray:
+    """Rasterize a single line of text with the built-in 3x5 pixel font.
+
+    Lowercase letters are drawn as uppercase and characters without a
+    glyph as "?". Glyphs are separated by one empty column.
+
+    Args:
+        text: Text to rasterize.
+        scale: Size of a font pixel in image pixels.
+
+    Returns:
+        Mask (5 * scale, width) of the text pixels.
+    """
+
+    height, width = FONT_SIZE
+    mask = np.zeros((height, max(len(text) * (width + 1) - 1, 0)), dtype=bool)
+    for index, char in enumerate(text.upper()):
+        glyph = FONT_GLYPHS.get(char, FONT_GLYPHS["?"])
+        mask[:, index * (width + 1) : index * (width + 1) + width] = [
+            [pixel == "1" for pixel in row] for row in glyph.split()
+        ]
+    return np.kron(mask, np.ones((scale, scale), dtype=bool))
+
+
+def read_tga(path: str) -> np.ndarray:
+    """Read an uncompressed true color or grayscale TGA image (as written
+    by Blender with file format TARGA_RAW).
+
+    Args:
+        path: Path of the TGA image.
+
+    Returns:
+        Pixels (height, width, channels) of type uint8 from top to bottom
+        in RGB(A) order.
+    """
+
+    with open(path, "rb") as file:
+        header = file.read(TGA_HEADER_SIZE)
+        id_length, color_map_type, image_type = header[0], header[1], header[2]
+        width, height = struct.unpack("<HH", header[12:16])
+        bits_per_pixel, descriptor = header[16], header[17]
+        if image_type not in (2, 3) or color_map_type != 0:
+            raise ValueError(f"TGA format of {path} is not supported!")
+
+        file.seek(TGA_HEADER_SIZE + id_length)
+        channels = bits_per_pixel // 8
+        pixels = np.fromfile(file, dtype=np.uint8, count=width * height * channels)
+
+    pixels = pixels.reshape(height, width, channels)
+    if channels >= 3:
+        # BGR(A) -> RGB(A)
+        pixels[:, :, :3] = pixels[:, :, 2::-1]
+    if not descriptor & 0x20:
+        # rows are stored from the bottom
+        pixels = pixels[::-1]
+    return np.ascontiguousarray(pixels)
+
+
+class AsyncImageWriter:
+    """Encode and write PNG images in background threads.
+
+    zlib releases the GIL while compressing, so the encoding of an image
+    overlaps with the scene setup and rendering of the next one. At most
+    two images per thread are held in memory.
+    """
+
+    def __init__(self, num_threads: int) -> None:
+        self.num_threads = num_threads
+        self.executor = ThreadPoolExecutor(
+            max_workers=num_threads, thread_name_prefix="obscura-writer"
+        )
+        self.max_pending = 2 * num_threads
+        self.futures: list[tuple[str, Future]] = []
+
+    def submit(self, path: str, pixels: np.ndarray, compression: int) -> None:
+        """Queue an image for writing.
+
+        Args:
+            path: Path of the PNG image.
+            pixels: Pixels (height, width, channels) of type uint8 from top
+            to bottom.
+            compression: zlib compression level (0-9).
+        """
+
+        pending = [future for _, future in self.futures if not future.done()]
+        while len(pending) >= self.max_pending:
+            wait(pending, return_when=FIRST_COMPLETED)
+            pending = [future for future in pending if not future.done()]
+
+        self.futures.append(
+            (path, self.executor.submit(write_png, path, pixels, compression))
+        )
+
+    def wait(self, paths: list[str] | None = None) -> None:
+        """Wait until the queued images are written.
+
+        Args:
+            paths: Paths of the images to wait for, all images if None.
+
+        Raises:
+            Exception: First error raised while writing an image.
+        """
+
+        if paths is None:
+            futures, self.futures = self.futures, []
+        else:
+            futures = [(path, future) for path, future in self.futures if path in paths]
+            self.futures = [
+                (path, future) for path, future in self.futures if path not in paths
+            ]
+        for _, future in futures:
+            future.result()
+
+
+_async_writer: AsyncImageWriter | None = None
+
+
+def async_writer(num_threads: int) -> AsyncImageWriter:
+    """Get the background image writer of the process, created on first
+    use and recreated if the number of threads changes.
+
+    The images queued by a replaced writer are still written and waited
+    for by the new writer.
+
+    Args:
+        num_threads: Number of writer threads.
+
+    Returns:
+        Background image writer.
+    """
+
+    global _async_writer
+    if _async_writer is None or _async_writer.num_threads != num_threads:
+        previous_writer = _async_writer
+        _async_writer = AsyncImageWriter(num_threads)
+        if previous_writer is not None:
+            _async_writer.futures = previous_writer.futures
+            previous_writer.executor.shutdown(wait=False)
+    return _async_writer
+
+
+def wait_for_writes(paths: list[str] | None = None) -> None:
+    """Wait until the images queued for background writing are written.
+
+    Args:
+        paths: Paths of the images to wait for, all images if None.
+    """
+
+    if _async_writer is not None:
+        _async_writer.wait(paths)
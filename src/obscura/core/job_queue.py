@@ -0,0 +1,492 @@
+"""Distributed rendering via a job queue in a shared directory.
+
+The queue only relies on atomic renames of a POSIX file system, so
+coordinator and workers may run on any number of machines sharing the
+queue directory. Every job is a YAML descriptor containing the job
+config which moves through the subdirectories
+
+    pending/ -> running/ -> done/ or failed/
+
+A worker claims a job by renaming it from `pending/` to `running/`,
+which succeeds for exactly one worker. While rendering, the worker
+refreshes the modification time of the running descriptor (its lease).
+Jobs whose lease expired, e.g. because the worker crashed, are moved
+back to `pending/` by any worker or the coordinator and retried until
+the maximum number of attempts is reached.
+"""
+
+import glob
+import json
+import logging
+import os
+import socket
+import tempfile
+import threading
+import time
+import uuid
+from typing import Any
+
+import yaml
+from munch import munchify
+
+from obscura.core.batch import expand_jobs
+from obscura.core.config import merge_config
+from obscura.core.profiling import StageProfiler
+from obscura.core.render_cache import RenderCache
+
+log = logging.getLogger("obscura")
+
+STATES = ["pending", "running", "done", "failed"]
+
+
+def _read_yaml(path: str) -> dict:
+    """Read a YAML file.
+
+    Args:
+        path: Path of the YAML file.
+
+    Returns:
+        Content of the file.
+    """
+
+    with open(path, "r") as file:
+        return yaml.safe_load(file)
+
+
+def _write_yaml_atomic(path: str, data: dict) -> None:
+    """Write a YAML file such that readers never see a partial file.
+
+    Args:
+        path: Path of the YAML file.
+        data: Content of the file.
+    """
+
+    file_descriptor, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path), prefix=".tmp_", suffix=".yaml"
+    )
+    with os.fdopen(file_descriptor, "w") as file:
+        yaml.safe_dump(data, file)
+    os.replace(tmp_path, path)
+
+
+class JobQueue:
+    """Job queue in a shared directory.
+
+    Args:
+        directory: Queue directory shared by coordinator and workers.
+        lease_seconds: Time after which a running job without heartbeat
+        is considered abandoned.
+        max_attempts: Maximum number of attempts of a job.
+    """
+
+    def __init__(self, directory: str, lease_seconds: float, max_attempts: int) -> None:
+        self.directory = directory
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        for state in STATES:
+            os.makedirs(os.path.join(directory, state), exist_ok=True)
+
+    @classmethod
+    def from_config(cls, config: Any) -> "JobQueue":
+        """Create the job queue of the config.
+
+        Args:
+            config: Munch type object containing all configs for current
+            run.
+
+        Returns:
+            Job queue.
+        """
+
+        return cls(
+            config.queue.directory,
+            config.queue.lease_seconds,
+            config.queue.max_attempts,
+        )
+
+    def path(self, state: str, job_id: str, worker_id: str | None = None) -> str:
+        """Path of a job descriptor.
+
+        Args:
+            state: State of the job.
+            job_id: Id of the job.
+            worker_id: Id of the worker for running jobs.
+
+        Returns:
+            Path of the descriptor.
+        """
+
+        name = job_id if worker_id is None else f"{job_id}@{worker_id}"
+        return os.path.join(self.directory, state, name + ".yaml")
+
+    def jobs(self, state: str) -> list[str]:
+        """Descriptors of all jobs in a state ordered by their id.
+
+        Args:
+            state: State of the jobs.
+
+        Returns:
+            Paths of the descriptors.
+        """
+
+        return sorted(glob.glob(os.path.join(self.directory, state, "*.yaml")))
+
+    def submit(self, job_id: str, job_config: Any) -> None:
+        """Add a job to the queue.
+
+        Args:
+            job_id: Id of the job.
+            job_config: Munch type object containing the config of the
+            job.
+        """
+
+        _write_yaml_atomic(
+            self.path("pending", job_id),
+            {"id": job_id, "attempts": 0, "error": None, "config": job_config.toDict()},
+        )
+
+    def claim(self, worker_id: str) -> tuple[str, dict] | None:
+        """Claim the next pending job.
+
+        Args:
+            worker_id: Id of the claiming worker.
+
+        Returns:
+            Path of the running descriptor and the descriptor, None if no
+            job is pending.
+        """
+
+        for pending_path in self.jobs("pending"):
+            job_id = os.path.splitext(os.path.basename(pending_path))[0]
+            running_path = self.path("running", job_id, worker_id)
+            try:
+                # start the lease before the descriptor becomes visible as
+                # running (rename keeps the modification time)
+                os.utime(pending_path)
+                os.rename(pending_path, running_path)
+            except FileNotFoundError:
+                continue  # claimed by another worker
+
+            job = _read_yaml(running_path)
+            job["attempts"] += 1
+            job["worker"] = worker_id
+            _write_yaml_atomic(running_path, job)
+            return running_path, job
+
+        return None
+
+    def heartbeat(self, running_path: str) -> bool:
+        """Renew the lease of a running job.
+
+        Args:
+            running_path: Path of the running descriptor.
+
+        Returns:
+            False if the lease was lost.
+        """
+
+        try:
+            os.utime(running_path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def complete(self, running_path: str, job: dict, result: dict) -> None:
+        """Mark a running job as done.
+
+        Args:
+            running_path: Path of the running descriptor.
+            job: Descriptor of the job.
+            result: Result of the job.
+        """
+
+        _write_yaml_atomic(self.path("done", job["id"]), {**job, "result": result})
+        self._remove(running_path)
+
+    def fail(self, running_path: str, job: dict, error: str) -> None:
+        """Retry a running job or mark it as failed after its last attempt.
+
+        Args:
+            running_path: Path of the running descriptor.
+            job: Descriptor of the job.
+            error: Error message of the attempt.
+        """
+
+        job = {**job, "error": error}
+        if job["attempts"] >= self.max_attempts:
+            _write_yaml_atomic(self.path("failed", job["id"]), job)
+        else:
+            _write_yaml_atomic(self.path("pending", job["id"]), job)
+        self._remove(running_path)
+
+    def reap_expired(self) -> int:
+        """Move running jobs with an expired lease back to the queue.
+
+        Returns:
+            Number of reaped jobs.
+        """
+
+        num_reaped = 0
+        for running_path in self.jobs("running"):
+            try:
+                if time.time() - os.path.getmtime(running_path) < self.lease_seconds:
+                    continue
+                job = _read_yaml(running_path)
+            except FileNotFoundError:
+                continue  # finished in the meantime
+
+            # only one process succeeds in renaming the expired descriptor
+            state = "failed" if job["attempts"] >= self.max_attempts else "pending"
+            try:
+                os.rename(running_path, self.path(state, job["id"]))
+            except FileNotFoundError:
+                continue
+            if state == "failed":
+                job["error"] = "lease expired"
+                _write_yaml_atomic(self.path(state, job["id"]), job)
+
+            log.warning(
+                f"Lease of job {job['id']} on worker {job.get('worker')} expired, "
+                f"job moved to {state}."
+            )
+            num_reaped += 1
+        return num_reaped
+
+    def is_idle(self) -> bool:
+        """Whether no job is pending or running.
+
+        Returns:
+            True if the queue is idle.
+        """
+
+        return not self.jobs("pending") and not self.jobs("running")
+
+    def _remove(self, running_path: str) -> None:
+        """Remove a running descriptor.
+
+        Args:
+            running_path: Path of the running descriptor.
+        """
+
+        try:
+            os.remove(running_path)
+        except FileNotFoundError:
+            log.warning(f"Lease of {os.path.basename(running_path)} was lost.")
+
+
+def submit_jobs(config: Any) -> list[str]:
+    """Submit the jobs of the config to the queue.
+
+    Args:
+        config: Munch type object containing all configs for current
+        run.
+
+    Returns:
+        Ids of the submitted jobs.
+    """
+
+    queue = JobQueue.from_config(config)
+    if config.get("batch", {}).get("mode", False):
+        jobs = expand_jobs(config)
+    else:
+        jobs = [config]
+
+    # unique per submission so results of earlier submissions are ignored
+    token = uuid.uuid4().hex[:8]
+    job_ids = []
+    for index, job_config in enumerate(jobs):
+        job_id = f"{config.general.sim_name}_{token}_{index:04d}"
+        job_config = merge_config(job_config, {"batch": {"mode": False}})
+        job_config.pop("queue", None)
+        queue.submit(job_id, job_config)
+        job_ids.append(job_id)
+
+    log.info(f"Submitted {len(job_ids)} jobs to {config.queue.directory}")
+    return job_ids
+
+
+def run_coordinator(config: Any) -> list[dict]:
+    """Submit the jobs of the config and wait until workers finished them.
+
+    Workers are started separately (`obscura ... --worker`) on any
+    machine sharing the queue directory. A summary of all jobs is
+    written to the output directory.
+
+    Args:
+        config: Munch type object containing all configs for current
+        run.
+
+    Returns:
+        Summary entry for each job.
+    """
+
+    queue = JobQueue.from_config(config)
+    job_ids = submit_jobs(config)
+    if not config.queue.get("wait", True):
+        return []
+
+    start_time = time.time()
+    finished: dict[str, str] = {}
+    while len(finished) < len(job_ids):
+        queue.reap_expired()  # retry jobs of crashed workers
+        for job_id in job_ids:
+            for state in ["done", "failed"]:
+                if job_id not in finished and os.path.isfile(queue.path(state, job_id)):
+                    finished[job_id] = state
+                    log.info(f"Job {job_id} {state} ({len(finished)}/{len(job_ids)})")
+        if len(finished) < len(job_ids):
+            time.sleep(config.queue.poll_seconds)
+
+    results = []
+    for index, job_id in enumerate(job_ids):
+        job = _read_yaml(queue.path(finished[job_id], job_id))
+        results.append(
+            {
+                "index": index,
+                "id": job_id,
+                "input_file_path": job["config"]["general"]["input_file_path"],
+                "status": job.get("result", {}).get("status", "failed"),
+                "worker": job.get("worker"),
+                "attempts": job["attempts"],
+                "error": job["error"],
+                **job.get("result", {}),
+            }
+        )
+
+    seconds = time.time() - start_time
+    summary = {
+        "num_jobs": len(results),
+        "num_failed": sum(result["status"] == "failed" for result in results),
+        "seconds": seconds,
+        "jobs": results,
+    }
+    summary_path = os.path.join(
+        config.general.output_directory, config.general.sim_name, "queue_summary.json"
+    )
+    os.makedirs(os.path.dirname(summary_path), exist_ok=True)
+    with open(summary_path, "w") as file:
+        json.dump(summary, file, indent=2)
+
+    log.info(
+        f"Queue finished: {summary['num_jobs'] - summary['num_failed']}/"
+        f"{summary['num_jobs']} jobs done in {seconds:.3f} s."
+    )
+    log.info(f"Queue summary written to {summary_path}")
+
+    return results
+
+
+def _keep_alive(queue: JobQueue, running_path: str, interval: float) -> threading.Event:
+    """Renew the lease of a running job in a background thread.
+
+    Blender releases the GIL while rendering, so the lease is renewed
+    during long renders as well.
+
+    Args:
+        queue: Job queue.
+        running_path: Path of the running descriptor.
+        interval: Time between two heartbeats.
+
+    Returns:
+        Event stopping the heartbeat once set.
+    """
+
+    stop = threading.Event()
+
+    def _beat() -> None:
+        """Renew the lease until stopped or the lease is lost."""
+
+        while not stop.wait(interval):
+            if not queue.heartbeat(running_path):
+                return
+
+    threading.Thread(target=_beat, daemon=True).start()
+    return stop
+
+
+def run_worker(config: Any, profiler: StageProfiler | None = None) -> int:
+    """Claim and render jobs of the queue until it is idle.
+
+    Args:
+        config: Munch type object containing all configs for current
+        run (only the queue section is used, the jobs bring their own
+        configs).
+        profiler: Profiler recording the stage timings of all jobs.
+
+    Returns:
+        Number of processed jobs.
+    """
+
+    from obscura.core.image_io import wait_for_writes
+
+    profiler = profiler or StageProfiler()
+    queue = JobQueue.from_config(config)
+    worker_id = f"{socket.gethostname()}-{os.getpid()}"
+    log.info(f"Worker {worker_id} polling {config.queue.directory} ...")
+
+    num_jobs = 0
+    num_rendered = 0
+    while True:
+        queue.reap_expired()
+        claimed = queue.claim(worker_id)
+        if claimed is None:
+            if queue.is_idle() and config.queue.get("exit_when_idle", True):
+                break
+            time.sleep(config.queue.poll_seconds)
+            continue
+
+        running_path, job = claimed
+        job_config = munchify(job["config"])
+        log.info(
+            f"Worker {worker_id} claimed job {job['id']} (attempt {job['attempts']})"
+        )
+
+        stop = _keep_alive(queue, running_path, config.queue.heartbeat_seconds)
+        start_time = time.time()
+        profiler.label = job["id"]
+        num_records = len(profiler.records)
+        try:
+            render_cache = RenderCache.from_config(job_config)
+            output_files = None
+            if render_cache is not None:
+                cache_key = render_cache.key(job_config)
+                output_files = render_cache.lookup(job_config, cache_key)
+            status = "cached"
+            if not output_files:
+                # Blender is only imported once a job has to be rendered
+                from obscura.core.rendering.rendering_pipeline import (
+                    rendering_pipeline,
+                )
+
+                output_files = rendering_pipeline(
+                    job_config, clear_only=num_rendered > 0, profiler=profiler
+                )
+                num_rendered += 1
+                status = "done"
+                wait_for_writes()  # Images may still be encoded in the background
+                if render_cache is not None:
+                    render_cache.store(job_config, cache_key, output_files)
+        except Exception as error:
+            stop.set()
+            log.exception(f"Job {job['id']} failed!")
+            queue.fail(running_path, job, str(error))
+        else:
+            stop.set()
+            queue.complete(
+                running_path,
+                job,
+                {
+                    "status": status,
+                    "output_files": output_files,
+                    "seconds": time.time() - start_time,
+                    "stages": {
+                        record["stage"]: record["wall_time"]
+                        for record in profiler.records[num_records:]
+                    },
+                },
+            )
+        profiler.label = None
+        num_jobs += 1
+
+    log.info(f"Worker {worker_id} finished after {num_jobs} jobs.")
+    return num_jobs
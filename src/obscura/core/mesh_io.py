@@ -0,0 +1,661 @@
+"""Read meshes into NumPy arrays using VTK."""
+
+import logging
+import os
+import re
+import xml.etree.ElementTree as ET  # nosec B405
+
+import numpy as np
+import vtk
+from vtk.util.numpy_support import numpy_to_vtk, vtk_to_numpy
+
+from obscura.core.profiling import peak_rss_mb
+
+log = logging.getLogger("obscura")
+
+READERS = {
+    ".vtu": vtk.vtkXMLUnstructuredGridReader,
+    ".pvtu": vtk.vtkXMLPUnstructuredGridReader,
+    ".vtp": vtk.vtkXMLPolyDataReader,
+    ".vtk": vtk.vtkDataSetReader,
+    ".stl": vtk.vtkSTLReader,
+}
+
+
+def _read_dataset(file_path: str) -> vtk.vtkDataSet:
+    """Read a dataset with the VTK reader matching the file extension.
+
+    Args:
+        file_path: Path to the mesh file.
+
+    Returns:
+        VTK dataset.
+    """
+
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension not in READERS:
+        raise ValueError(f"Mesh file type {extension} is not supported!")
+    if not os.path.isfile(file_path):
+        raise FileNotFoundError(f"Mesh file {file_path} not found!")
+
+    reader = READERS[extension]()
+    reader.SetFileName(file_path)
+    reader.Update()
+    return reader.GetOutput()
+
+
+def _merge_pieces(dataset: vtk.vtkUnstructuredGrid) -> vtk.vtkUnstructuredGrid:
+    """Merge the coincident points of the pieces of a parallel dataset.
+
+    The pieces of a PVTU file duplicate the points on their borders, so
+    the faces between pieces would appear as boundary faces. The ids of
+    the points in the dataset are kept in the point array
+    "vtkOriginalPointIds".
+
+    Args:
+        dataset: VTK dataset appended from pieces.
+
+    Returns:
+        Dataset with merged points.
+    """
+
+    point_ids = numpy_to_vtk(np.arange(dataset.GetNumberOfPoints()), deep=True)
+    point_ids.SetName("vtkOriginalPointIds")
+    pieces = vtk.vtkUnstructuredGrid()
+    pieces.ShallowCopy(dataset)
+    pieces.GetPointData().AddArray(point_ids)
+
+    clean = vtk.vtkStaticCleanUnstructuredGrid()
+    clean.SetInputData(pieces)
+    clean.Update()
+    return clean.GetOutput()
+
+
+def _is_parallel(file_path: str) -> bool:
+    """Check if a mesh file is a parallel dataset stored in pieces.
+
+    Args:
+        file_path: Path to the mesh file.
+
+    Returns:
+        True for PVTU files.
+    """
+
+    return os.path.splitext(file_path)[1].lower() == ".pvtu"
+
+
+def _extract_surface(
+    dataset: vtk.vtkDataSet,
+    cell_array_name: str | None = None,
+    merge_pieces: bool = False,
+) -> vtk.vtkPolyData:
+    """Extract the triangulated boundary surface of a dataset.
+
+    Args:
+        dataset: VTK dataset.
+        cell_array_name: Name of a cell array which is averaged to the
+        points of the surface.
+        merge_pieces: Merge the points of the pieces of a parallel
+        dataset first, so that faces between pieces are removed.
+
+    Returns:
+        Triangulated surface.
+    """
+
+    surface = dataset
+    if not isinstance(dataset, vtk.vtkPolyData):
+        geometry = vtk.vtkGeometryFilter()
+        if merge_pieces:
+            # the point ids of the dataset are passed as point array
+            geometry.SetInputData(_merge_pieces(dataset))
+        else:
+            geometry.SetInputData(dataset)
+            geometry.PassThroughPointIdsOn()
+        geometry.Update()
+        surface = geometry.GetOutput()
+
+    if cell_array_name is not None:
+        # averaging on the surface only touches the boundary cells
+        to_points = vtk.vtkCellDataToPointData()
+        to_points.SetInputData(surface)
+        to_points.ProcessAllArraysOff()
+        to_points.AddCellDataArray(cell_array_name)
+        to_points.PassCellDataOff()
+        to_points.Update()
+        surface = to_points.GetOutput()
+
+    triangulate = vtk.vtkTriangleFilter()
+    triangulate.SetInputData(surface)
+    triangulate.PassVertsOff()
+    triangulate.PassLinesOff()
+    triangulate.Update()
+    return triangulate.GetOutput()
+
+
+def _surface_arrays(surface: vtk.vtkPolyData) -> tuple[np.ndarray, np.ndarray]:
+    """Get the points and triangles of a triangulated surface.
+
+    Args:
+        surface: Triangulated surface.
+
+    Returns:
+        Points (n, 3) and triangles (m, 3) as indices into the points.
+    """
+
+    points = vtk_to_numpy(surface.GetPoints().GetData()).astype(np.float32, copy=False)
+    triangles = vtk_to_numpy(surface.GetPolys().GetConnectivityArray()).reshape(-1, 3)
+    return points, triangles
+
+
+def read_surface(file_path: str) -> tuple[np.ndarray, np.ndarray, np.ndarray | None]:
+    """Extract the triangulated boundary surface of a mesh file.
+
+    Args:
+        file_path: Path to the mesh file (VTU, PVTU, VTP, VTK or STL).
+
+    Returns:
+        Surface points (n, 3), triangles (m, 3) as indices into the
+        points and the ids of the surface points in the original
+        dataset (None if the dataset already is a surface).
+    """
+
+    surface = _extract_surface(
+        _read_dataset(file_path), merge_pieces=_is_parallel(file_path)
+    )
+    points, triangles = _surface_arrays(surface)
+
+    point_ids = surface.GetPointData().GetArray("vtkOriginalPointIds")
+    if point_ids is not None:
+        point_ids = vtk_to_numpy(point_ids)
+
+    return points, triangles, point_ids
+
+
+def read_surface_field(
+    file_path: str, array_name: str, association: str = "point"
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Extract the triangulated boundary surface of a mesh file together
+    with the values of a data array at the surface points.
+
+    Args:
+        file_path: Path to the mesh file (VTU, PVTU, VTP or VTK).
+        array_name: Name of the data array.
+        association: "point" for point data, "cell" for cell data which
+        is averaged to the points.
+
+    Returns:
+        Surface points (n, 3), triangles (m, 3) as indices into the
+        points and the values (n,) of the array at the points (magnitude
+        for vector arrays).
+    """
+
+    if association not in ("point", "cell"):
+        raise ValueError(f"Array association {association} is not supported!")
+
+    dataset = _read_dataset(file_path)
+    data = dataset.GetPointData() if association == "point" else dataset.GetCellData()
+    if data.GetArray(array_name) is None:
+        raise ValueError(
+            f"{association.capitalize()} array {array_name} not found in {file_path}!"
+        )
+
+    surface = _extract_surface(
+        dataset,
+        array_name if association == "cell" else None,
+        merge_pieces=_is_parallel(file_path),
+    )
+    points, triangles = _surface_arrays(surface)
+
+    values = vtk_to_numpy(surface.GetPointData().GetArray(array_name))
+    if values.ndim > 1:
+        values = np.linalg.norm(values, axis=1)
+
+    return points, triangles, values
+
+
+class _ArrayBuffer:
+    """Preallocated array growing by doubling its capacity."""
+
+    def __init__(self, dtype: type, shape: tuple = (), capacity: int = 2**16) -> None:
+        self.data: np.ndarray = np.empty((capacity, *shape), dtype=dtype)
+        self.size = 0
+
+    def append(self, values: np.ndarray) -> None:
+        """Append values to the array.
+
+        Args:
+            values: Values (n, *shape).
+        """
+
+        if self.size + len(values) > len(self.data):
+            capacity = max(2 * len(self.data), self.size + len(values))
+            data = np.empty((capacity, *self.data.shape[1:]), dtype=self.data.dtype)
+            data[: self.size] = self.data[: self.size]
+            self.data = data
+        self.data[self.size : self.size + len(values)] = values
+        self.size += len(values)
+
+    def view(self) -> np.ndarray:
+        """Get the appended values.
+
+        Returns:
+            View (size, *shape) of the appended values.
+        """
+
+        return self.data[: self.size]
+
+
+def _fan_triangulate(connectivity: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+    """Triangulate convex polygons as fans around their first vertex.
+
+    Args:
+        connectivity: Concatenated vertex indices of all polygons.
+        sizes: Number of vertices of each polygon.
+
+    Returns:
+        Triangles (m, 3).
+    """
+
+    starts = np.cumsum(sizes) - sizes
+    counts = sizes - 2
+    first = np.repeat(starts, counts)
+    # index of the triangle within its polygon
+    corner = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.stack(
+        [
+            connectivity[first],
+            connectivity[first + corner + 1],
+            connectivity[first + corner + 2],
+        ],
+        axis=-1,
+    )
+
+
+def read_surface_streaming(
+    file_path: str, num_pieces: int = 0
+) -> tuple[np.ndarray, np.ndarray]:
+    """Extract the triangulated boundary surface of a large mesh file
+    piece by piece.
+
+    Only one piece of the volume mesh is held in memory at a time, the
+    surface polygons of the pieces are accumulated in preallocated
+    arrays. Faces between two pieces appear in the surface of both
+    pieces and are removed, points shared by pieces are merged by their
+    coordinates. A file can not be read in more pieces than it stores,
+    so files of a single piece are read whole and their memory use is
+    not bounded.
+
+    Args:
+        file_path: Path to the mesh file (VTU or PVTU, streamed by the
+        pieces stored in the file).
+        num_pieces: Number of pieces to read the file in, 0 or more than
+        the pieces of the file for the number of pieces of the file.
+
+    Returns:
+        Surface points (n, 3) and triangles (m, 3) as indices into the
+        points.
+
+    Raises:
+        ValueError: If the file can not be streamed or has no surface.
+    """
+
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension not in (".vtu", ".pvtu"):
+        raise ValueError(f"Mesh file type {extension} can not be streamed!")
+    if not os.path.isfile(file_path):
+        raise FileNotFoundError(f"Mesh file {file_path} not found!")
+
+    reader = READERS[extension]()
+    reader.SetFileName(file_path)
+    reader.UpdateInformation()
+    # a piece beyond the pieces of the file is the whole dataset, whose
+    # faces would all be removed as shared
+    file_pieces = max(reader.GetNumberOfPieces(), 1)
+    if num_pieces > file_pieces:
+        log.warning(
+            f"{file_path} has only {file_pieces} pieces, "
+            f"reading {file_pieces} instead of {num_pieces} pieces."
+        )
+    num_pieces = min(num_pieces, file_pieces) or file_pieces
+
+    points = _ArrayBuffer(np.float32, (3,))
+    connectivity = _ArrayBuffer(np.int64)
+    sizes = _ArrayBuffer(np.int64)
+    for piece in range(num_pieces):
+        reader.UpdatePiece(piece, num_pieces, 0)
+        geometry = vtk.vtkGeometryFilter()
+        geometry.SetInputData(reader.GetOutput())
+        geometry.Update()
+        surface = geometry.GetOutput()
+        if surface.GetNumberOfPolys() == 0:
+            continue
+
+        polys = surface.GetPolys()
+        connectivity.append(vtk_to_numpy(polys.GetConnectivityArray()) + points.size)
+        sizes.append(np.diff(vtk_to_numpy(polys.GetOffsetsArray())))
+        points.append(vtk_to_numpy(surface.GetPoints().GetData()))
+
+    # merge points shared by pieces
+    unique_points, point_ids = np.unique(
+        points.view().view(np.dtype((np.void, 12))).ravel(), return_inverse=True
+    )
+    connectivity_ids = point_ids.ravel()[connectivity.view()]
+    polygon_sizes = sizes.view()
+
+    # faces between pieces occur twice (with any vertex order)
+    rows = np.repeat(np.arange(len(polygon_sizes)), polygon_sizes)
+    columns = np.arange(len(connectivity_ids)) - np.repeat(
+        np.cumsum(polygon_sizes) - polygon_sizes, polygon_sizes
+    )
+    keys = np.full((len(polygon_sizes), polygon_sizes.max(initial=3)), -1)
+    keys[rows, columns] = connectivity_ids
+    keys.sort(axis=1)
+    _, key_ids, key_counts = np.unique(
+        keys, axis=0, return_inverse=True, return_counts=True
+    )
+    outer = key_counts[key_ids.ravel()] == 1
+
+    triangles = _fan_triangulate(connectivity_ids[outer[rows]], polygon_sizes[outer])
+    if len(triangles) == 0:
+        raise ValueError(f"No surface extracted from {file_path}!")
+
+    # keep only the points of the outer surface
+    used, triangle_ids = np.unique(triangles, return_inverse=True)
+    triangles = triangle_ids.reshape(-1, 3)
+    surface_points = unique_points.view(np.float32).reshape(-1, 3)[used]
+
+    log.info(
+        f"Streamed {num_pieces} pieces of {file_path}: {len(surface_points)} "
+        f"points, {len(triangles)} triangles, peak memory {peak_rss_mb():.0f} MB"
+    )
+    return surface_points, triangles
+
+
+def read_points(file_path: str) -> np.ndarray:
+    """Read all points of a mesh file without extracting the surface.
+
+    Args:
+        file_path: Path to the mesh file.
+
+    Returns:
+        Points (n, 3).
+    """
+
+    dataset = _read_dataset(file_path)
+    return vtk_to_numpy(dataset.GetPoints().GetData()).astype(np.float32, copy=False)
+
+
+def read_point_cloud(
+    file_path: str, array_names: list[str]
+) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    """Read the points of a point cloud together with point arrays.
+
+    NumPy files contain the points (n, 3) (.npy) or the points under the
+    key "points" and the arrays under their names (.npz), all other
+    files are read with VTK and the arrays are taken from the point
+    data.
+
+    Args:
+        file_path: Path to the point cloud file (NPY, NPZ, VTU, PVTU, VTP
+        or VTK).
+        array_names: Names of the point arrays to read.
+
+    Returns:
+        Points (n, 3) and the arrays (n,) by name (magnitude for vector
+        arrays).
+    """
+
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in (".npy", ".npz"):
+        if not os.path.isfile(file_path):
+            raise FileNotFoundError(f"Point cloud file {file_path} not found!")
+        data = np.load(file_path)
+        arrays = {"points": data} if extension == ".npy" else dict(data)
+        points = arrays.pop("points")
+    else:
+        dataset = _read_dataset(file_path)
+        points = vtk_to_numpy(dataset.GetPoints().GetData())
+        point_data = dataset.GetPointData()
+        arrays = {
+            point_data.GetArrayName(i): vtk_to_numpy(point_data.GetArray(i))
+            for i in range(point_data.GetNumberOfArrays())
+        }
+
+    values = {}
+    for array_name in array_names:
+        if array_name not in arrays:
+            raise ValueError(f"Point array {array_name} not found in {file_path}!")
+        array = np.asarray(arrays[array_name])
+        if array.ndim > 1:
+            array = np.linalg.norm(array, axis=1)
+        if len(array) != len(points):
+            raise ValueError(
+                f"Point array {array_name} has {len(array)} values for "
+                f"{len(points)} points!"
+            )
+        values[array_name] = array
+
+    return np.asarray(points, dtype=np.float32).reshape(-1, 3), values
+
+
+def natural_sort_key(file_path: str) -> list:
+    """Get the sort key ordering the numbers in file paths numerically,
+    e.g. step_2.vtu before step_10.vtu.
+
+    Args:
+        file_path: Path to the file.
+
+    Returns:
+        Alternating text and number parts of the path.
+    """
+
+    return [
+        int(part) if part.isdigit() else part for part in re.split(r"(\d+)", file_path)
+    ]
+
+
+def read_pvd(file_path: str) -> list[str]:
+    """Get the dataset files of a ParaView collection ordered by time.
+
+    Args:
+        file_path: Path to the .pvd file.
+
+    Returns:
+        Paths of the dataset files.
+    """
+
+    root = ET.parse(file_path).getroot()  # nosec B314
+    datasets = sorted(
+        root.iter("DataSet"), key=lambda dataset: float(dataset.get("timestep", 0))
+    )
+    directory = os.path.dirname(file_path)
+    file_paths = []
+    for dataset in datasets:
+        dataset_file = dataset.get("file")
+        if dataset_file is None:
+            raise ValueError(f"DataSet without file attribute in {file_path}!")
+        file_paths.append(os.path.join(directory, dataset_file))
+    return file_paths
+
+
+def read_pvtu(file_path: str) -> list[str]:
+    """Get the piece files of a parallel VTU file.
+
+    Args:
+        file_path: Path to the .pvtu file.
+
+    Returns:
+        Paths of the piece files.
+    """
+
+    root = ET.parse(file_path).getroot()  # nosec B314
+    directory = os.path.dirname(file_path)
+    file_paths = []
+    for piece in root.iter("Piece"):
+        source = piece.get("Source")
+        if source is None:
+            raise ValueError(f"Piece without Source attribute in {file_path}!")
+        file_paths.append(os.path.join(directory, source))
+    return file_paths
+
+
+# Binary STL: 80 byte header, uint32 triangle count, 50 bytes per triangle
+STL_HEADER_SIZE = 84
+STL_DTYPE = np.dtype(
+    [
+        ("normal", "<f4", (3,)),
+        ("vertices", "<f4", (3, 3)),
+        ("attribute", "<u2"),
+    ]
+)
+
+
+def write_binary_stl(file_path: str, points: np.ndarray, triangles: np.ndarray) -> None:
+    """Write a triangle mesh to a binary STL file.
+
+    Args:
+        file_path: Path to the STL file.
+        points: Points (n, 3).
+        triangles: Vertex indices of the triangles (m, 3).
+    """
+
+    corners = np.asarray(points, dtype=np.float32)[triangles]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    normals /= np.where(lengths > 0, lengths, 1)
+
+    data = np.zeros(len(triangles), dtype=STL_DTYPE)
+    data["normal"] = normals
+    data["vertices"] = corners
+
+    with open(file_path, "wb") as file:
+        file.write(b"Obscura binary STL".ljust(80, b"\0"))
+        file.write(np.uint32(len(triangles)).tobytes())
+        data.tofile(file)
+
+
+def read_binary_stl(file_path: str) -> np.ndarray:
+    """Memory-map the triangles of a binary STL file.
+
+    Args:
+        file_path: Path to the STL file.
+
+    Returns:
+        Read-only structured array of the triangles (STL_DTYPE), the data
+        is only read from disk when accessed.
+    """
+
+    if not os.path.isfile(file_path):
+        raise FileNotFoundError(f"Mesh file {file_path} not found!")
+
+    with open(file_path, "rb") as file:
+        header = file.read(STL_HEADER_SIZE)
+    num_triangles = (
+        int(np.frombuffer(header, dtype="<u4", offset=80)[0])
+        if len(header) == STL_HEADER_SIZE
+        else -1
+    )
+    file_size = STL_HEADER_SIZE + num_triangles * STL_DTYPE.itemsize
+    if os.path.getsize(file_path) != file_size:
+        raise ValueError(f"Mesh file {file_path} is no binary STL file!")
+
+    return np.memmap(
+        file_path,
+        dtype=STL_DTYPE,
+        mode="r",
+        offset=STL_HEADER_SIZE,
+        shape=(num_triangles,),
+    )
+
+
+def weld_vertices(
+    corners: np.ndarray, tolerance: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """Merge coincident vertices.
+
+    The vertices are snapped to a grid with the tolerance as spacing and
+    vertices in the same grid cell are merged. Vertices closer than the
+    spacing may still fall into neighbouring cells and stay separate,
+    which is rare for the rounding errors of coincident vertices far
+    below the spacing. If the cell indices fit into 21 bits per axis
+    they are packed into a single integer, which is much faster to
+    deduplicate than rows of coordinates.
+
+    Args:
+        corners: Vertices (n, 3), e.g. the corners of all triangles.
+        tolerance: Grid spacing relative to the largest extent of the
+        vertices, 0 merges exactly equal vertices only.
+
+    Returns:
+        Unique vertices (m, 3) and the index (n,) of every input vertex
+        into them.
+    """
+
+    if len(corners) == 0:
+        return corners.reshape(0, 3), np.empty(0, dtype=np.int64)
+
+    # column-wise reductions are much faster than along axis 0 of (n, 3)
+    lower = np.array([corners[:, axis].min() for axis in range(3)])
+    extent = float(max(corners[:, axis].max() - lower[axis] for axis in range(3)))
+    spacing = tolerance * extent
+
+    if spacing > 0 and extent / spacing < 2**21 - 1:
+        keys = np.zeros(len(corners), dtype=np.int64)
+        for axis in range(3):
+            cells = np.floor((corners[:, axis] - lower[axis]) / spacing + 0.5)
+            keys <<= 21
+            keys |= cells.astype(np.int64)
+        unique_keys, indices = np.unique(keys, return_inverse=True)
+    else:
+        if spacing > 0:
+            cells = np.floor((corners - lower) / spacing + 0.5).astype(np.int64)
+        else:
+            cells = corners + np.float32(0.0)  # -0.0 equals 0.0
+        unique_keys, indices = np.unique(cells, axis=0, return_inverse=True)
+    indices = indices.reshape(-1)
+
+    # any vertex of a cell represents it
+    points = np.empty((len(unique_keys), 3), dtype=corners.dtype)
+    points[indices] = corners
+    return points, indices
+
+
+def read_stl_welded(
+    file_path: str, tolerance: float = 1e-6
+) -> tuple[np.ndarray, np.ndarray]:
+    """Read a binary STL file into an indexed mesh with merged vertices.
+
+    STL stores three separate vertices per triangle, welding them
+    shrinks the mesh passed to Blender and connects the triangles (e.g.
+    for smooth shading). Triangles collapsed by welding are removed.
+
+    Args:
+        file_path: Path to the binary STL file.
+        tolerance: Spacing of the grid the vertices are snapped to,
+        relative to the largest extent of the mesh.
+
+    Returns:
+        Points (n, 3) and triangles (m, 3) as indices into the points.
+    """
+
+    corners = np.ascontiguousarray(read_binary_stl(file_path)["vertices"]).reshape(
+        -1, 3
+    )
+    points, indices = weld_vertices(corners, tolerance)
+    triangles = indices.reshape(-1, 3).astype(np.int32)
+
+    valid = (
+        (triangles[:, 0] != triangles[:, 1])
+        & (triangles[:, 1] != triangles[:, 2])
+        & (triangles[:, 2] != triangles[:, 0])
+    )
+    triangles = triangles[valid]
+
+    log.info(
+        f"Welded {len(corners)} STL vertices to {len(points)} vertices "
+        f"({corners.nbytes / 2**20:.1f} MB -> "
+        f"{(points.nbytes + triangles.nbytes) / 2**20:.1f} MB), removed "
+        f"{np.count_nonzero(~valid)} degenerate triangles, peak memory "
+        f"{peak_rss_mb():.0f} MB"
+    )
+    return points, triangles
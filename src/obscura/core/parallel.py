@@ -0,0 +1,159 @@
+"""Parallel rendering of batch jobs over multiple worker processes."""
+
+import json
+import logging
+import os
+import subprocess  # nosec B404
+import sys
+import time
+from typing import Any
+
+import yaml
+
+from obscura.core.batch import expand_jobs
+from obscura.core.config import merge_config
+
+log = logging.getLogger("obscura")
+
+
+def _worker_command(config_file_path: str) -> list[str]:
+    """Command to start an Obscura worker process for the given config.
+
+    Within Blender the worker is started via the Blender executable,
+    otherwise via the current Python interpreter using the bpy module.
+    Blender is not imported by the coordinating process.
+
+    Args:
+        config_file_path: Path to the config file of the worker.
+
+    Returns:
+        Command of the worker process.
+    """
+
+    bpy = sys.modules.get("bpy")  # always loaded within Blender
+    if bpy is not None and bpy.app.binary_path:
+        argv = ["obscura", "--config_file_path", config_file_path]
+        expression = (
+            f"import sys; from obscura.main import main; sys.argv = {argv!r}; main()"
+        )
+        return [bpy.app.binary_path, "--background", "--python-expr", expression]
+    return [
+        sys.executable,
+        "-m",
+        "obscura.main",
+        "--config_file_path",
+        config_file_path,
+    ]
+
+
+def run_parallel(config: Any) -> list[dict]:
+    """Shard the batch jobs over multiple worker processes.
+
+    Every worker is a separate Obscura run with its own Blender instance
+    and output directory (`<sim_name>_worker<i>`) which renders its
+    share of the jobs in batch mode. The render threads of each worker
+    are limited so the workers do not oversubscribe the CPU cores. The
+    results of all workers are merged into one summary file.
+
+    Args:
+        config: Munch type object containing all configs for current
+        run.
+
+    Returns:
+        Summary entry for each job.
+    """
+
+    jobs = expand_jobs(config)
+    num_cores = os.cpu_count() or 1
+    num_workers = max(1, min(config.parallel.num_workers or num_cores, len(jobs)))
+    threads_per_worker = config.parallel.threads_per_worker or max(
+        1, num_cores // num_workers
+    )
+
+    log.info(
+        f"Parallel rendering of {len(jobs)} jobs on {num_workers} workers with "
+        f"{threads_per_worker} threads each ..."
+    )
+    log.info("")
+
+    output_dir = os.path.join(config.general.output_directory, config.general.sim_name)
+    os.makedirs(output_dir, exist_ok=True)
+
+    start_time = time.time()
+    workers = []
+    for worker in range(num_workers):
+        sim_name = f"{config.general.sim_name}_worker{worker:02d}"
+        worker_config = merge_config(
+            config,
+            {
+                "general": {"sim_name": sim_name},
+                "batch": {
+                    "mode": True,
+                    "input_file_paths": [],
+                    "manifest_file_path": None,
+                    "jobs": [job.toDict() for job in jobs[worker::num_workers]],
+                },
+                "parallel": {"mode": False},
+                "render": {"threads": threads_per_worker},
+            },
+        )
+
+        config_file_path = os.path.join(output_dir, f"{sim_name}.yaml")
+        with open(config_file_path, "w") as file:
+            yaml.dump(worker_config.toDict(), file)
+
+        env = dict(os.environ, OMP_NUM_THREADS=str(threads_per_worker))
+        process = subprocess.Popen(  # nosec B603
+            _worker_command(config_file_path), env=env
+        )
+        workers.append((worker, sim_name, process))
+
+    results = []
+    for worker, sim_name, process in workers:
+        return_code = process.wait()
+        summary_path = os.path.join(
+            config.general.output_directory, sim_name, "batch_summary.json"
+        )
+        if return_code != 0 or not os.path.isfile(summary_path):
+            log.error(f"Worker {worker} failed with return code {return_code}!")
+            worker_results = [
+                {
+                    "input_file_path": job.general.input_file_path,
+                    "output_files": [],
+                    "status": "failed",
+                    "error": f"worker exited with return code {return_code}",
+                    "seconds": None,
+                }
+                for job in jobs[worker::num_workers]
+            ]
+        else:
+            with open(summary_path, "r") as file:
+                worker_results = json.load(file)["jobs"]
+
+        for local_index, result in enumerate(worker_results):
+            result["index"] = worker + local_index * num_workers
+            result["worker"] = worker
+            results.append(result)
+
+    results.sort(key=lambda result: result["index"])
+    seconds = time.time() - start_time
+
+    summary = {
+        "num_workers": num_workers,
+        "threads_per_worker": threads_per_worker,
+        "num_jobs": len(results),
+        "num_failed": sum(result["status"] == "failed" for result in results),
+        "seconds": seconds,
+        "jobs": results,
+    }
+    summary_path = os.path.join(output_dir, "parallel_summary.json")
+    with open(summary_path, "w") as file:
+        json.dump(summary, file, indent=2)
+
+    log.info(
+        f"Parallel run finished: {summary['num_jobs'] - summary['num_failed']}/"
+        f"{summary['num_jobs']} jobs done in {seconds:.3f} s."
+    )
+    log.info(f"Parallel summary written to {summary_path}")
+
+    return results
@@ -0,0 +1,141 @@
+"""Profiling of the stages of an Obscura run."""
+
+import cProfile
+import csv
+import json
+import logging
+import os
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+log = logging.getLogger("obscura")
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of the current process since its start
+    in MB.
+
+    Returns:
+        Peak memory usage in MB.
+    """
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is given in bytes on macOS and in kilobytes on Linux
+    return peak_rss / 2**20 if sys.platform == "darwin" else peak_rss / 2**10
+
+
+class StageProfiler:
+    """Record wall time, CPU time and peak memory of pipeline stages.
+
+    The peak memory of a process can only be read since its start, so
+    every record holds this cumulative peak and the increase of it
+    during the stage, i.e. the memory a stage needed beyond all previous
+    stages.
+    """
+
+    FIELDS = [
+        "label",
+        "stage",
+        "wall_time",
+        "cpu_time",
+        "process_peak_rss_mb",
+        "peak_rss_increase_mb",
+    ]
+
+    def __init__(self, use_cprofile: bool = False) -> None:
+        self.records: list[dict] = []
+        self.label: str | None = None
+        self.cprofile = cProfile.Profile() if use_cprofile else None
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Measure the stage executed within the context.
+
+        Args:
+            name: Name of the stage.
+        """
+
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        peak_rss_start = peak_rss_mb()
+        try:
+            yield
+        finally:
+            process_peak_rss = peak_rss_mb()
+            record: dict[str, Any] = {
+                "label": self.label,
+                "stage": name,
+                "wall_time": time.perf_counter() - wall_start,
+                "cpu_time": time.process_time() - cpu_start,
+                "process_peak_rss_mb": process_peak_rss,
+                "peak_rss_increase_mb": process_peak_rss - peak_rss_start,
+            }
+            self.records.append(record)
+            log.info(
+                f"Stage {name} took {record['wall_time']:.3f} s "
+                f"(CPU {record['cpu_time']:.3f} s, "
+                f"process peak RSS {record['process_peak_rss_mb']:.1f} MB, "
+                f"+{record['peak_rss_increase_mb']:.1f} MB)"
+            )
+
+    @contextmanager
+    def profile(self) -> Iterator[None]:
+        """Run cProfile within the context if enabled."""
+
+        if self.cprofile is None:
+            yield
+            return
+
+        self.cprofile.enable()
+        try:
+            yield
+        finally:
+            self.cprofile.disable()
+
+    def totals(self) -> dict[str, float]:
+        """Sum up the wall time of all records per stage.
+
+        Returns:
+            Wall time per stage.
+        """
+
+        totals: dict[str, float] = {}
+        for record in self.records:
+            totals[record["stage"]] = (
+                totals.get(record["stage"], 0.0) + record["wall_time"]
+            )
+        return totals
+
+    def write(self, directory: str) -> None:
+        """Write the records to profile.json/.csv (and the cProfile
+        statistics to profile.prof) in the given directory.
+
+        Args:
+            directory: Output directory.
+        """
+
+        os.makedirs(directory, exist_ok=True)
+
+        with open(os.path.join(directory, "profile.json"), "w") as file:
+            json.dump(
+                {
+                    "totals": self.totals(),
+                    "process_peak_rss_mb": peak_rss_mb(),
+                    "stages": self.records,
+                },
+                file,
+                indent=2,
+            )
+
+        with open(os.path.join(directory, "profile.csv"), "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=self.FIELDS)
+            writer.writeheader()
+            writer.writerows(self.records)
+
+        if self.cprofile is not None:
+            self.cprofile.dump_stats(os.path.join(directory, "profile.prof"))
+
+        for stage, wall_time in self.totals().items():
+            log.info(f"{stage:>12}: {wall_time:.3f} s")
@@ -0,0 +1,261 @@
+"""Cache of rendered images to skip rendering unchanged jobs."""
+
+import glob
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from typing import Any
+
+from obscura.core.hashing import indexed_file_hash
+
+log = logging.getLogger("obscura")
+
+# Config entries which do not change the rendered images
+IGNORED_KEYS = [
+    "general.output_directory",
+    "general.sim_name",
+    "general.log_file",
+    "general.log_to_console",
+    "general.input_file_path",
+    "general.output_file_path",
+    "time_series.input_file_paths",
+    "render.output.async_write",
+    "render.output.num_threads",
+    "batch",
+    "parallel",
+    "server",
+    "queue",
+    "profiling",
+    "mesh_cache",
+    "render_cache",
+]
+
+# Temporary entries of crashed processes are removed after this age
+TMP_MAX_AGE_SECONDS = 3600
+
+
+def evict_entries(directory: str, max_size: float, cache_name: str) -> None:
+    """Remove the least recently used entries of a cache directory until
+    its size is below the maximum and the temporary entries of crashed
+    processes.
+
+    Args:
+        directory: Cache directory with one directory per entry.
+        max_size: Maximum size of the cache in bytes.
+        cache_name: Name of the cache for log messages.
+    """
+
+    entries = []
+    for name in os.listdir(directory):
+        entry = os.path.join(directory, name)
+        try:
+            if name.startswith(".tmp_"):
+                if time.time() - os.path.getmtime(entry) > TMP_MAX_AGE_SECONDS:
+                    shutil.rmtree(entry, ignore_errors=True)
+                continue
+            if name.startswith(".") or not os.path.isdir(entry):
+                continue
+            size = sum(
+                os.path.getsize(os.path.join(entry, file_name))
+                for file_name in os.listdir(entry)
+            )
+            entries.append((os.path.getmtime(entry), size, entry))
+        except FileNotFoundError:  # evicted concurrently
+            continue
+
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, entry in sorted(entries):
+        if total_size <= max_size:
+            break
+        shutil.rmtree(entry, ignore_errors=True)
+        total_size -= size
+        log.info(f"Evicted {os.path.basename(entry)} from {cache_name}.")
+
+
+def input_files(config: Any) -> list[str]:
+    """Get all input files a job reads including the pieces of .pvtu
+    files.
+
+    Args:
+        config: Munch type object containing all configs for current
+        run.
+
+    Returns:
+        Paths of the input files.
+    """
+
+    from obscura.core.mesh_io import natural_sort_key, read_pvd, read_pvtu
+
+    if not config.get("time_series", {}).get("mode", False):
+        file_paths = [config.general.input_file_path]
+    else:
+        file_paths = []
+        for pattern in config.time_series.input_file_paths:
+            if pattern.lower().endswith(".pvd"):
+                file_paths += [pattern, *read_pvd(pattern)]
+            else:
+                file_paths += sorted(glob.glob(pattern), key=natural_sort_key) or [
+                    pattern
+                ]
+
+    # the pieces of parallel files are read as well
+    expanded_paths = []
+    for file_path in file_paths:
+        expanded_paths.append(file_path)
+        if file_path.lower().endswith(".pvtu"):
+            expanded_paths += read_pvtu(file_path)
+    return expanded_paths
+
+
+def normalized_config(config: Any) -> dict:
+    """Get the config without the entries which do not change the
+    rendered images.
+
+    Args:
+        config: Munch type object containing all configs for current
+        run.
+
+    Returns:
+        Normalized config.
+    """
+
+    normalized = json.loads(json.dumps(config))
+    for path in IGNORED_KEYS:
+        *sections, key = path.split(".")
+        section = normalized
+        for name in sections:
+            section = section.get(name) if isinstance(section, dict) else None
+        if isinstance(section, dict):
+            section.pop(key, None)
+    return normalized
+
+
+class RenderCache:
+    """On-disk cache of rendered images.
+
+    Every entry is a directory named by the hash of the input file
+    contents and the normalized config. It contains the images of a job
+    named by their suffix to the root of the output file path, so they
+    can be restored for any output file path. The least recently used
+    entries are evicted once the cache exceeds its maximum size. The
+    hashes of the input files are memoized in `.hashes`.
+    """
+
+    def __init__(self, directory: str, max_size_mb: float, force: bool = False) -> None:
+        self.directory = directory
+        self.max_size = max_size_mb * 2**20
+        self.force = force
+
+    @classmethod
+    def from_config(cls, config: Any) -> "RenderCache | None":
+        """Create the render cache of the config.
+
+        Args:
+            config: Munch type object containing all configs for current
+            run.
+
+        Returns:
+            Render cache or None if the cache is disabled.
+        """
+
+        render_cache = config.get("render_cache", {})
+        if not render_cache.get("mode", False):
+            return None
+        return cls(
+            render_cache["directory"],
+            render_cache["max_size_mb"],
+            render_cache.get("force", False),
+        )
+
+    def key(self, config: Any) -> str:
+        """Key of the rendered images of a job.
+
+        Args:
+            config: Munch type object containing all configs for current
+            run.
+
+        Returns:
+            Cache key.
+        """
+
+        settings = {
+            "input_file_hashes": [
+                indexed_file_hash(file_path, os.path.join(self.directory, ".hashes"))
+                for file_path in input_files(config)
+            ],
+            "config": normalized_config(config),
+        }
+        return hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()
+
+    def lookup(self, config: Any, key: str) -> list[str] | None:
+        """Restore the cached images of a job to its output file path.
+
+        Args:
+            config: Munch type object containing all configs for current
+            run.
+            key: Cache key of the job.
+
+        Returns:
+            Paths of the restored images or None if the job has to be
+            rendered.
+        """
+
+        if self.force:
+            return None
+
+        entry = os.path.join(self.directory, key)
+        root = os.path.splitext(config.general.output_file_path)[0]
+        output_files = []
+        try:
+            os.utime(entry)  # mark as recently used
+            os.makedirs(os.path.dirname(os.path.abspath(root)), exist_ok=True)
+            for suffix in sorted(os.listdir(entry)):
+                shutil.copyfile(os.path.join(entry, suffix), root + suffix)
+                output_files.append(root + suffix)
+        except FileNotFoundError:  # not cached or evicted concurrently
+            log.info(f"Render cache miss for {config.general.input_file_path}")
+            return None
+
+        log.info(f"Render cache hit {key[:12]} for {config.general.input_file_path}")
+        for output_file in output_files:
+            log.info("Render restored to " + output_file)
+        return output_files
+
+    def store(self, config: Any, key: str, output_files: list[str]) -> None:
+        """Store the rendered images of a job in the cache and evict old
+        entries.
+
+        Args:
+            config: Munch type object containing all configs for current
+            run.
+            key: Cache key of the job.
+            output_files: Paths of the rendered images.
+        """
+
+        root = os.path.abspath(os.path.splitext(config.general.output_file_path)[0])
+        output_files = [os.path.abspath(path) for path in output_files]
+        if not output_files or not all(path.startswith(root) for path in output_files):
+            log.warning("Rendered images are not named by the output file path.")
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+        entry = os.path.join(self.directory, key)
+
+        # write to a temporary directory first so entries are complete
+        tmp_entry = tempfile.mkdtemp(dir=self.directory, prefix=".tmp_")
+        for output_file in output_files:
+            shutil.copyfile(
+                output_file, os.path.join(tmp_entry, output_file[len(root) :])
+            )
+
+        shutil.rmtree(entry, ignore_errors=True)  # outdated entry (forced render)
+        try:
+            os.rename(tmp_entry, entry)
+        except OSError:  # stored concurrently by another process
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+
+        evict_entries(self.directory, self.max_size, "render cache")
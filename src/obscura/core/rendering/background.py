@@ -13,3 +13,5 @@ def define_background(config: Any) -> None:
     bg_node = bpy.context.scene.world.node_tree.nodes.get("Background")
     if bg_node:
         bg_node.inputs["Color"].default_value = config.background_color
+    # Background of the Workbench engine
+    bpy.context.scene.world.color = config.background_color[:3]
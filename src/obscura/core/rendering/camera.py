@@ -5,20 +5,55 @@ from typing import Any
 import bpy
 import numpy as np
 
+# Default view: camera placed at (0, -2, 1) * max_extent from the center
+DEFAULT_AZIMUTH = -90.0
+DEFAULT_ELEVATION = float(np.rad2deg(np.arctan2(1.0, 2.0)))
+DEFAULT_DISTANCE_FACTOR = float(np.sqrt(5.0))
+
+
+def orbit_location(
+    center: np.ndarray, distance: float, azimuth: float, elevation: float
+) -> np.ndarray:
+    """Compute a camera location on a sphere around the center.
+
+    Args:
+        center: Center of the orbit.
+        distance: Distance of the camera to the center.
+        azimuth: Angle around the z-axis in degrees (0 = +x axis).
+        elevation: Angle above the xy-plane in degrees.
+
+    Returns:
+        Location of the camera.
+    """
+
+    azimuth, elevation = np.deg2rad(azimuth), np.deg2rad(elevation)
+    direction = np.array(
+        [
+            np.cos(elevation) * np.cos(azimuth),
+            np.cos(elevation) * np.sin(azimuth),
+            np.sin(elevation),
+        ]
+    )
+    return np.asarray(center) + distance * direction
+
 
 def setup_camera(
     config: Any,
     mesh_obj: bpy.types.Object,
     center: np.ndarray,
     max_extent: float,
-) -> None:
-    """Create and configure camera settings."""
+    cam_obj: bpy.types.Object | None = None,
+) -> bpy.types.Object:
+    """Create (or reuse) and configure camera settings."""
 
-    bpy.ops.object.camera_add(  # Automatic camera setup
-        location=(center + [0, -2 * max_extent, max_extent]).tolist()
-    )
+    location = (center + [0, -2 * max_extent, max_extent]).tolist()
+    if cam_obj is None:
+        bpy.ops.object.camera_add(location=location)  # Automatic camera setup
+        cam_obj = bpy.context.active_object
+    else:
+        cam_obj.location = location
+        cam_obj.constraints.clear()
 
-    cam_obj = bpy.context.active_object
     cam_obj.data.lens = config.camera.lens
     cam_obj.data.type = config.camera.type
     cam_obj.data.clip_end = max_extent * 10  # Ensure large/slender objects are visible
@@ -29,3 +64,5 @@ def setup_camera(
     track.track_axis = "TRACK_NEGATIVE_Z"
     track.up_axis = "UP_Y"
     bpy.context.scene.camera = cam_obj
+
+    return cam_obj
@@ -0,0 +1,152 @@
+"""Automatic camera framing from the vertices of a mesh in Blender."""
+
+from typing import Any
+
+import bpy
+import numpy as np
+from mathutils import Matrix
+
+from obscura.core.rendering.camera import orbit_location
+from obscura.core.rendering.object_settings import get_vertices
+from obscura.core.rendering.render_settings import active_settings
+
+
+def view_basis(azimuth: float, elevation: float) -> np.ndarray:
+    """Compute the camera axes for a view on an orbit.
+
+    Args:
+        azimuth: Angle of the camera around the z-axis in degrees.
+        elevation: Angle of the camera above the xy-plane in degrees.
+
+    Returns:
+        Rotation matrix with the camera axes right, up and backward
+        (Blender cameras look along their negative z-axis) as columns.
+    """
+
+    forward = -orbit_location(np.zeros(3), 1.0, azimuth, elevation)
+    # views from straight above/below use the y-axis as up reference
+    up_reference = [0.0, 0.0, 1.0] if abs(forward[2]) < 0.999 else [0.0, 1.0, 0.0]
+    right = np.cross(forward, up_reference)
+    right /= np.linalg.norm(right)
+    up = np.cross(right, forward)
+    return np.stack([right, up, -forward], axis=-1)
+
+
+def frame_points(
+    points: np.ndarray,
+    basis: np.ndarray,
+    tan_x: float,
+    tan_y: float,
+    orthographic: bool,
+) -> tuple[np.ndarray, float]:
+    """Fit the view frustum tightly around points.
+
+    For perspective cameras the distance and the sideways shift of the
+    camera are chosen such that every point lies within the frustum
+    with half opening angles atan(tan_x) and atan(tan_y). For
+    orthographic cameras the frame is centered on the projected bounds.
+
+    Args:
+        points: Points (n, 3) to frame.
+        basis: Camera axes as returned by `view_basis`.
+        tan_x: Tangent of the horizontal half opening angle (perspective)
+        or half width of the frame per unit ortho scale (orthographic).
+        tan_y: Same as tan_x for the vertical direction.
+        orthographic: Whether the camera is orthographic.
+
+    Returns:
+        Camera location and ortho scale (perspective: 0).
+    """
+
+    center = 0.5 * (points.min(axis=0) + points.max(axis=0))
+    local = (points - center) @ basis
+    x, y, depth = local[:, 0], local[:, 1], -local[:, 2]
+    extent = float(np.ptp(local, axis=0).max()) or 1.0
+
+    if orthographic:
+        shift_x = 0.5 * (x.min() + x.max())
+        shift_y = 0.5 * (y.min() + y.max())
+        ortho_scale = 0.5 * max(np.ptp(x) / tan_x, np.ptp(y) / tan_y) or extent
+        distance = -depth.min() + 0.1 * extent
+    else:
+        # |x - shift_x| <= tan_x * (depth + distance) for all points
+        a_x, b_x = np.max(x - tan_x * depth), np.max(-x - tan_x * depth)
+        a_y, b_y = np.max(y - tan_y * depth), np.max(-y - tan_y * depth)
+        shift_x, shift_y = 0.5 * (a_x - b_x), 0.5 * (a_y - b_y)
+        distance = max((a_x + b_x) / (2 * tan_x), (a_y + b_y) / (2 * tan_y))
+        ortho_scale = 0.0
+
+    location = center + basis @ np.array([shift_x, shift_y, distance])
+    return location, float(ortho_scale)
+
+
+class FramingEngine:
+    """Place the camera such that the mesh fills a fraction of the frame.
+
+    The world space vertices are extracted once, so framing further
+    views (e.g. for multi-view renders) only requires a projection of
+    the vertices.
+    """
+
+    def __init__(self, points: np.ndarray, fill_fraction: float, aspect: float) -> None:
+        self.points = points
+        self.fill_fraction = fill_fraction
+        self.aspect = aspect
+
+    @classmethod
+    def from_object(cls, mesh_obj: bpy.types.Object, config: Any) -> "FramingEngine":
+        """Create the framing engine for a mesh object.
+
+        Args:
+            mesh_obj: Mesh object to frame.
+            config: Munch type object containing all configs for current
+            run.
+
+        Returns:
+            Framing engine.
+        """
+
+        bpy.context.view_layer.update()  # Ensure an up to date world matrix
+        matrix = np.asarray(mesh_obj.matrix_world, dtype=np.float64)
+        points = get_vertices(mesh_obj) @ matrix[:3, :3].T + matrix[:3, 3]
+
+        settings = active_settings(config)
+        return cls(
+            points,
+            config.camera.framing.fill_fraction,
+            settings.resolution_x / settings.resolution_y,
+        )
+
+    def apply(
+        self, cam_obj: bpy.types.Object, azimuth: float, elevation: float
+    ) -> None:
+        """Frame the mesh from the given view.
+
+        Args:
+            cam_obj: Camera to place (a tracking constraint is removed).
+            azimuth: Angle of the camera around the z-axis in degrees.
+            elevation: Angle of the camera above the xy-plane in degrees.
+        """
+
+        camera = cam_obj.data
+        orthographic = camera.type == "ORTHO"
+        # the sensor (or ortho scale) spans the larger side of the frame
+        half_size = 0.5 if orthographic else 0.5 * camera.sensor_width / camera.lens
+        tan_x = half_size * min(1.0, self.aspect) * self.fill_fraction
+        tan_y = half_size * min(1.0, 1.0 / self.aspect) * self.fill_fraction
+
+        basis = view_basis(azimuth, elevation)
+        location, ortho_scale = frame_points(
+            self.points, basis, tan_x, tan_y, orthographic
+        )
+
+        cam_obj.constraints.clear()
+        cam_obj.location = location.tolist()
+        cam_obj.rotation_euler = Matrix(basis.tolist()).to_euler()
+        if orthographic:
+            camera.ortho_scale = ortho_scale
+
+        # clip range covering all vertices
+        depth = (location - self.points) @ basis[:, 2]
+        camera.clip_start = min(camera.clip_start, 0.5 * max(depth.min(), 1e-6))
+        camera.clip_end = max(camera.clip_end, 1.1 * depth.max())
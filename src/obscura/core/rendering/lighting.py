@@ -5,45 +5,62 @@ from typing import Any
 import bpy
 import numpy as np
 
+# Name, offset from the center (times max extent) and rotation in degrees
+LIGHTS = [
+    ("KeyLight", [1.0, -1.0, 1.0], [-60, 0, 45]),
+    ("FillLight", [-1.0, 1.0, 1.0], [-60, 0, -45]),
+    ("BackLight", [0.0, 0.0, 1.5], [-30, 0, 180]),
+]
 
-def setup_lighting(center: np.ndarray, max_extent: float, config: Any) -> None:
-    """Set up three-point lighting using SUN lights."""
-
-    # Key light
-    bpy.ops.object.light_add(
-        type="SUN",
-        location=(center + [max_extent, -max_extent, max_extent]).tolist(),
-    )
-    key_light = bpy.context.active_object
-    key_light.data.energy = config.light.key_light_intensity
-    key_light.rotation_euler = tuple(np.deg2rad([-60, 0, 45]))
-
-    # Fill light
-    bpy.ops.object.light_add(
-        type="SUN",
-        location=(center + [-max_extent, max_extent, max_extent]).tolist(),
-    )
-
-    fill_light = bpy.context.active_object
-    fill_light.data.energy = config.light.fill_light_intensity
-    fill_light.rotation_euler = tuple(np.deg2rad([-60, 0, -45]))
-    # Back light
-    bpy.ops.object.light_add(
-        type="SUN", location=(center + [0, 0, 1.5 * max_extent]).tolist()
-    )
-    back_light = bpy.context.active_object
-    back_light.data.energy = (
-        config.light.fill_light_intensity * 0.5
-    )  # intentionally set weaker than the fill light (classic 3‑point lighting ratio)
-    back_light.rotation_euler = tuple(np.deg2rad([-30, 0, 180]))
-
-
-def ambient_lighting(config: Any) -> None:
-    """Configure ambient world lighting."""
-    if bpy.context.scene.world is None:
-        bpy.context.scene.world = bpy.data.worlds.new("World")
-
-    bpy.context.scene.world.use_nodes = True
-    bg_node = bpy.context.scene.world.node_tree.nodes.get("Background")
-    if bg_node:
-        bg_node.inputs["Color"].default_value = config.background_color
+
+def create_lights() -> list[bpy.types.Object]:
+    """Create the SUN lights of the three-point lighting.
+
+    Returns:
+        Key, fill and back light.
+    """
+
+    lights = []
+    for name, _, _ in LIGHTS:
+        light_obj = bpy.data.objects.new(name, bpy.data.lights.new(name, type="SUN"))
+        bpy.context.scene.collection.objects.link(light_obj)
+        lights.append(light_obj)
+    return lights
+
+
+def setup_lighting(
+    center: np.ndarray,
+    max_extent: float,
+    config: Any,
+    lights: list[bpy.types.Object] | None = None,
+) -> list[bpy.types.Object]:
+    """Set up three-point lighting using SUN lights.
+
+    Args:
+        center: Center of the mesh.
+        max_extent: Maximum extent of the mesh.
+        config: Munch type object containing all configs for current
+        run.
+        lights: Existing key, fill and back light to reuse, new lights
+        are created if None.
+
+    Returns:
+        Key, fill and back light.
+    """
+
+    if lights is None:
+        lights = create_lights()
+
+    # back light intentionally set weaker than the fill light (classic
+    # 3‑point lighting ratio)
+    energies = [
+        config.light.key_light_intensity,
+        config.light.fill_light_intensity,
+        config.light.fill_light_intensity * 0.5,
+    ]
+    for light_obj, (_, offset, rotation), energy in zip(lights, LIGHTS, energies):
+        light_obj.location = (center + np.multiply(offset, max_extent)).tolist()
+        light_obj.rotation_euler = tuple(np.deg2rad(rotation))
+        light_obj.data.energy = energy
+
+    return lights
@@ -0,0 +1,87 @@
+"""Level of detail reduction of meshes in Blender."""
+
+import logging
+from typing import Any
+
+import bpy
+import numpy as np
+
+from obscura.core.rendering.render_settings import active_settings
+
+log = logging.getLogger("obscura")
+
+
+def target_triangles(config: Any) -> int:
+    """Get the triangle budget of the mesh.
+
+    Either the explicitly configured number of triangles or a budget
+    derived from the number of output pixels (thumbnail, preview or
+    final resolution).
+
+    Args:
+        config: Munch type object containing all configs for current
+        run.
+
+    Returns:
+        Maximum number of triangles.
+    """
+
+    if config.lod.target_triangles > 0:
+        return int(config.lod.target_triangles)
+
+    settings = active_settings(config)
+    num_pixels = settings.resolution_x * settings.resolution_y
+    return int(num_pixels * config.lod.triangles_per_pixel)
+
+
+def count_triangles(mesh: bpy.types.Mesh) -> int:
+    """Count the triangles of the (triangulated) polygons of a mesh.
+
+    Args:
+        mesh: Blender mesh.
+
+    Returns:
+        Number of triangles.
+    """
+
+    loop_totals = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+    return int(loop_totals.sum() - 2 * len(loop_totals))
+
+
+def decimate_mesh(mesh_obj: bpy.types.Object, config: Any) -> None:
+    """Decimate the mesh to the triangle budget.
+
+    The decimation is applied to the mesh data so the full resolution
+    mesh is freed and the reduced mesh is reused for all following
+    renders of the scene.
+
+    Args:
+        mesh_obj: Mesh object to decimate.
+        config: Munch type object containing all configs for current
+        run.
+    """
+
+    target = target_triangles(config)
+    num_triangles = count_triangles(mesh_obj.data)
+    if num_triangles <= target:
+        log.info(f"Mesh with {num_triangles} triangles is within LOD budget.")
+        return
+
+    modifier = mesh_obj.modifiers.new(name="LOD", type="DECIMATE")
+    modifier.decimate_type = "COLLAPSE"
+    modifier.ratio = target / num_triangles
+    modifier.use_collapse_triangulate = True
+
+    # bake the modifier into new mesh data and free the original mesh
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    decimated_mesh = bpy.data.meshes.new_from_object(mesh_obj.evaluated_get(depsgraph))
+    original_mesh = mesh_obj.data
+    mesh_obj.modifiers.remove(modifier)
+    mesh_obj.data = decimated_mesh
+    bpy.data.meshes.remove(original_mesh)
+
+    log.info(
+        f"Decimated mesh from {num_triangles} to "
+        f"{count_triangles(decimated_mesh)} triangles."
+    )
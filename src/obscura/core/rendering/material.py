@@ -1,18 +1,109 @@
 """Material utilities for Blender."""
 
+import hashlib
+import json
+import time
 from typing import Any
 
 import bpy
 
+# Custom properties of materials in the library, the key of the material
+# parameters and the time of the last use
+LIBRARY_PROPERTY = "obscura_material"
+LAST_USED_PROPERTY = "obscura_material_last_used"
 
-def apply_material(mesh_obj: bpy.types.Object, config: Any) -> None:
-    """Create and apply a material to the mesh."""
-    mat = bpy.data.materials.new(name="MeshMaterial")
+
+def set_material_parameters(mat: bpy.types.Material, config: Any) -> None:
+    """Set the parameters of the Principled BSDF of a material."""
     mat.use_nodes = True
     bsdf = mat.node_tree.nodes.get("Principled BSDF")
     if bsdf:
         bsdf.inputs["Base Color"].default_value = config.material.material_color
         bsdf.inputs["Roughness"].default_value = config.material.material_roughness
         bsdf.inputs["Metallic"].default_value = config.material.material_metallic
+    # Viewport settings used by the Workbench engine
+    mat.diffuse_color = config.material.material_color
+    mat.roughness = config.material.material_roughness
+    mat.metallic = config.material.material_metallic
+
+
+def apply_material(
+    mesh_obj: bpy.types.Object,
+    config: Any,
+    material: bpy.types.Material | None = None,
+) -> bpy.types.Material:
+    """Create (or reuse) and apply a material to the mesh."""
+    mat = material or bpy.data.materials.new(name="MeshMaterial")
+    set_material_parameters(mat, config)
 
     mesh_obj.data.materials.append(mat)
+    return mat
+
+
+def material_key(config: Any) -> str:
+    """Compute the library key of the material settings.
+
+    Args:
+        config: Munch type object containing all configs for current
+        run.
+
+    Returns:
+        Hash of all entries of the material section.
+    """
+
+    settings = json.dumps(config.material, sort_keys=True)
+    return hashlib.sha256(settings.encode()).hexdigest()[:16]
+
+
+def purge_materials(max_materials: int, keep: bpy.types.Material | None = None) -> None:
+    """Remove unused materials.
+
+    Materials outside of the library are removed as soon as they are
+    unused, unused library materials only if the library holds more than
+    max_materials materials (least recently used first).
+
+    Args:
+        max_materials: Maximum number of materials in the library.
+        keep: Material which is kept although it is not used yet.
+    """
+
+    library = [mat for mat in bpy.data.materials if LIBRARY_PROPERTY in mat]
+    unused = sorted(
+        (mat for mat in library if mat.users == 0 and mat != keep),
+        key=lambda mat: mat[LAST_USED_PROPERTY],
+    )
+    orphans = [
+        mat
+        for mat in bpy.data.materials
+        if mat.users == 0 and LIBRARY_PROPERTY not in mat
+    ]
+    bpy.data.batch_remove(orphans + unused[: max(0, len(library) - max_materials)])
+
+
+def library_material(config: Any) -> bpy.types.Material:
+    """Get the material of the settings from the material library.
+
+    Materials are reused between jobs with equal material settings, so
+    their node tree is built (and their shader compiled) only once.
+
+    Args:
+        config: Munch type object containing all configs for current
+        run.
+
+    Returns:
+        Material of the library.
+    """
+
+    key = material_key(config)
+    mat = next(
+        (mat for mat in bpy.data.materials if mat.get(LIBRARY_PROPERTY) == key), None
+    )
+    if mat is None:
+        mat = bpy.data.materials.new(name=f"MeshMaterial_{key}")
+        set_material_parameters(mat, config)
+        mat[LIBRARY_PROPERTY] = key
+    mat[LAST_USED_PROPERTY] = time.time()
+
+    # the material is only used once it is assigned to the mesh
+    purge_materials(config.material_library.max_materials, keep=mat)
+    return mat
@@ -0,0 +1,195 @@
+"""Cache of prepared surface meshes to skip loading and transforming
+meshes in Blender."""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from typing import Any
+
+import bpy
+import numpy as np
+
+from obscura.core.hashing import indexed_file_hash
+from obscura.core.mesh_io import read_pvtu
+from obscura.core.render_cache import evict_entries
+from obscura.core.rendering.lod import decimate_mesh, target_triangles
+from obscura.core.rendering.object_settings import (
+    apply_transforms,
+    create_mesh_object,
+    get_vertices,
+    load_mesh,
+)
+
+log = logging.getLogger("obscura")
+
+# Config sections with the settings of a loader
+LOADER_SECTIONS = {"vtk_streaming": "streaming", "stl_welded": "stl_welding"}
+
+
+class MeshCache:
+    """On-disk cache of prepared surface meshes.
+
+    Every entry is a directory named by its key containing the vertices
+    and triangles as `.npy` files (loaded memory-mapped) and the object
+    location. The least recently used entries are evicted once the
+    cache exceeds its maximum size. The hashes of the input files are
+    memoized in `.hashes`.
+    """
+
+    def __init__(self, directory: str, max_size_mb: float) -> None:
+        self.directory = directory
+        self.max_size = max_size_mb * 2**20
+
+    def key(self, config: Any) -> str:
+        """Key of the prepared mesh for the input file (and its pieces),
+        loader, object settings and level of detail.
+
+        Args:
+            config: Munch type object containing all configs for current
+            run.
+
+        Returns:
+            Cache key.
+        """
+
+        loader = config.general.get("loader", "stl")
+        file_paths = [config.general.input_file_path]
+        if file_paths[0].lower().endswith(".pvtu"):
+            file_paths += read_pvtu(file_paths[0])
+        settings = {
+            "input_file_hashes": [
+                indexed_file_hash(file_path, os.path.join(self.directory, ".hashes"))
+                for file_path in file_paths
+            ],
+            "loader": loader,
+            "loader_settings": config.get(LOADER_SECTIONS.get(loader, ""), {}),
+            "mesh_scale": list(config.object_settings.mesh_scale),
+            "mesh_location": list(config.object_settings.mesh_location),
+            "rotation": list(config.object_settings.rotation),
+            "lod_target_triangles": (
+                target_triangles(config)
+                if config.get("lod", {}).get("mode", False)
+                else None
+            ),
+        }
+        return hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()
+
+    def load(self, key: str) -> dict | None:
+        """Load a prepared mesh from the cache.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            Dictionary with vertices, triangles and location or None if
+            the mesh is not cached.
+        """
+
+        entry = os.path.join(self.directory, key)
+        try:
+            os.utime(entry)  # mark as recently used
+            with open(os.path.join(entry, "meta.json"), "r") as file:
+                mesh = json.load(file)
+            mesh["vertices"] = np.load(
+                os.path.join(entry, "vertices.npy"), mmap_mode="r"
+            )
+            mesh["triangles"] = np.load(
+                os.path.join(entry, "triangles.npy"), mmap_mode="r"
+            )
+        except FileNotFoundError:  # not cached or evicted concurrently
+            return None
+        return mesh
+
+    def store(
+        self,
+        key: str,
+        vertices: np.ndarray,
+        triangles: np.ndarray,
+        location: list[float],
+    ) -> None:
+        """Store a prepared mesh in the cache and evict old entries.
+
+        Args:
+            key: Cache key.
+            vertices: Local vertex coordinates (n, 3).
+            triangles: Vertex indices of the triangles (m, 3).
+            location: Location of the object.
+        """
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        # write to a temporary directory first so entries are complete
+        tmp_entry = tempfile.mkdtemp(dir=self.directory, prefix=".tmp_")
+        np.save(os.path.join(tmp_entry, "vertices.npy"), vertices.astype(np.float32))
+        np.save(os.path.join(tmp_entry, "triangles.npy"), triangles.astype(np.int32))
+        with open(os.path.join(tmp_entry, "meta.json"), "w") as file:
+            json.dump({"location": list(location)}, file)
+
+        try:
+            os.rename(tmp_entry, os.path.join(self.directory, key))
+        except OSError:  # stored concurrently by another process
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the cache size
+        is below its maximum and the temporary entries of crashed
+        processes."""
+
+        evict_entries(self.directory, self.max_size, "mesh cache")
+
+
+def load_cached_mesh(config: Any) -> bpy.types.Object:
+    """Load the transformed mesh from the cache or prepare and cache it.
+
+    On a cache hit the mesh is created directly from the cached arrays
+    and neither the mesh import nor the origin computation is executed.
+
+    Args:
+        config: Munch type object containing all configs for current
+        run.
+
+    Returns:
+        Blender mesh object.
+    """
+
+    cache = MeshCache(config.mesh_cache.directory, config.mesh_cache.max_size_mb)
+    key = cache.key(config)
+    name = os.path.splitext(os.path.basename(config.general.input_file_path))[0]
+
+    mesh = cache.load(key)
+    if mesh is not None:
+        log.info(f"Mesh cache hit for {config.general.input_file_path}")
+        mesh_obj = create_mesh_object(name, mesh["vertices"], mesh["triangles"])
+        mesh_obj.scale = config.object_settings.mesh_scale
+        mesh_obj.location = mesh["location"]
+        mesh_obj.rotation_euler = tuple(np.deg2rad(config.object_settings.rotation))
+        return mesh_obj
+
+    log.info(f"Mesh cache miss for {config.general.input_file_path}")
+    mesh_obj = load_mesh(config)
+    apply_transforms(mesh_obj, config)
+    if config.get("lod", {}).get("mode", False):
+        decimate_mesh(mesh_obj, config)
+
+    polygons = mesh_obj.data.polygons
+    loop_totals = np.empty(len(polygons), dtype=np.int32)
+    polygons.foreach_get("loop_total", loop_totals)
+    if not np.all(loop_totals == 3):
+        log.warning("Mesh is not triangulated and can not be cached.")
+        return mesh_obj
+
+    triangles = np.empty(len(mesh_obj.data.loops), dtype=np.int32)
+    mesh_obj.data.loops.foreach_get("vertex_index", triangles)
+    cache.store(
+        key,
+        get_vertices(mesh_obj),
+        triangles.reshape(-1, 3),
+        list(mesh_obj.location),
+    )
+
+    return mesh_obj
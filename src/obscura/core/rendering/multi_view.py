@@ -0,0 +1,141 @@
+"""Multi-view (orbit/turntable) rendering of one loaded scene in Blender."""
+
+import logging
+import os
+from typing import Any
+
+import bpy
+import numpy as np
+
+from obscura.core.rendering.camera import DEFAULT_DISTANCE_FACTOR, orbit_location
+from obscura.core.rendering.framing import FramingEngine
+from obscura.core.rendering.render_settings import configure_render
+
+log = logging.getLogger("obscura")
+
+
+def camera_views(config: Any) -> list[tuple[float, float]]:
+    """Get the camera views (azimuth, elevation) to render.
+
+    With `turntable_count` > 0 the views are equally spaced around the
+    object at the first configured elevation, otherwise one view per
+    configured azimuth is rendered.
+
+    Args:
+        config: Munch type object containing all configs for current
+        run.
+
+    Returns:
+        List of (azimuth, elevation) tuples in degrees.
+    """
+
+    multi_view = config.camera.multi_view
+    elevations = list(multi_view.elevations)
+
+    if multi_view.turntable_count > 0:
+        azimuths = (
+            multi_view.azimuths[0]
+            + np.arange(multi_view.turntable_count) * 360.0 / multi_view.turntable_count
+        ).tolist()
+        elevations = elevations[:1]
+    else:
+        azimuths = list(multi_view.azimuths)
+
+    if len(elevations) == 1:
+        elevations *= len(azimuths)
+    if len(elevations) != len(azimuths):
+        raise ValueError("Number of elevations must be one or match the azimuths!")
+
+    return list(zip(azimuths, elevations))
+
+
+def render_views(
+    scene: bpy.types.Scene,
+    config: Any,
+    cam_obj: bpy.types.Object,
+    center: np.ndarray,
+    max_extent: float,
+    framing: FramingEngine | None = None,
+) -> list[str]:
+    """Render the loaded scene from multiple views by only moving the
+    camera.
+
+    Args:
+        scene: Scene to render.
+        config: Munch type object containing all configs for current
+        run.
+        cam_obj: Camera tracking the mesh.
+        center: Center of the mesh.
+        max_extent: Maximum extent of the mesh.
+        framing: Framing engine fitting the camera to the mesh for every
+        view, if None the camera orbits at a fixed distance.
+
+    Returns:
+        Paths of the written images.
+    """
+
+    views = camera_views(config)
+    distance = DEFAULT_DISTANCE_FACTOR * max_extent
+
+    configure_render(scene, config)
+    base, ext = os.path.splitext(scene.render.filepath)
+
+    log.info(f"Rendering {len(views)} views ...")
+
+    if config.camera.multi_view.use_animation:
+        # one keyframe per view so all views render in one call
+        for frame, (azimuth, elevation) in enumerate(views, start=1):
+            _place_camera(cam_obj, center, distance, azimuth, elevation, framing)
+            cam_obj.keyframe_insert(data_path="location", frame=frame)
+            if framing is not None:
+                cam_obj.keyframe_insert(data_path="rotation_euler", frame=frame)
+                cam_obj.data.keyframe_insert(data_path="ortho_scale", frame=frame)
+
+        scene.frame_start = 1
+        scene.frame_end = len(views)
+        scene.render.filepath = f"{base}_view####{ext}"
+        # the extension is part of the path, restored for later renders
+        use_file_extension = scene.render.use_file_extension
+        scene.render.use_file_extension = False
+        try:
+            bpy.ops.render.render(animation=True)
+            return [
+                scene.render.frame_path(frame=frame)
+                for frame in range(1, len(views) + 1)
+            ]
+        finally:
+            scene.render.use_file_extension = use_file_extension
+
+    output_files = []
+    for index, (azimuth, elevation) in enumerate(views):
+        _place_camera(cam_obj, center, distance, azimuth, elevation, framing)
+        scene.render.filepath = f"{base}_view{index + 1:04d}{ext}"
+        bpy.ops.render.render(write_still=True)
+        output_files.append(scene.render.filepath)
+
+    return output_files
+
+
+def _place_camera(
+    cam_obj: bpy.types.Object,
+    center: np.ndarray,
+    distance: float,
+    azimuth: float,
+    elevation: float,
+    framing: FramingEngine | None,
+) -> None:
+    """Place the camera for one view.
+
+    Args:
+        cam_obj: Camera to place.
+        center: Center of the mesh.
+        distance: Distance of the orbit without framing engine.
+        azimuth: Angle around the z-axis in degrees.
+        elevation: Angle above the xy-plane in degrees.
+        framing: Framing engine fitting the camera to the mesh.
+    """
+
+    if framing is not None:
+        framing.apply(cam_obj, azimuth, elevation)
+    else:
+        cam_obj.location = orbit_location(center, distance, azimuth, elevation).tolist()
@@ -1,27 +1,114 @@
 """Object loading, applying transforms, and computing object geometry in
 Blender."""
 
+import os
 from typing import Any
 
 import bpy
 import numpy as np
 
+from obscura.core.mesh_io import read_stl_welded, read_surface, read_surface_streaming
+
 
 def load_mesh(config: Any) -> bpy.types.Object:
-    """Import the STL mesh and return the Blender object."""
-    stl_path = config.general.input_file_path
-    bpy.ops.wm.stl_import(filepath=stl_path)
+    """Import the mesh with the configured loader and return the Blender
+    object.
+
+    The "stl" loader uses Blender's STL importer, the "vtk" loader
+    extracts the surface of any VTK readable file (e.g. VTU) and
+    passes it to Blender in memory without an intermediate file. The
+    "vtk_streaming" loader does the same for VTU/PVTU files piece by
+    piece to bound the memory for meshes larger than RAM. The
+    "stl_welded" loader memory-maps binary STL files and merges the
+    duplicated vertices of the triangles.
+    """
+    file_path = config.general.input_file_path
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    loader = config.general.get("loader", "stl")
+
+    if loader == "vtk_streaming":
+        points, triangles = read_surface_streaming(
+            file_path, config.get("streaming", {}).get("num_pieces", 0)
+        )
+        return create_mesh_object(name, points, triangles)
+
+    if loader == "stl_welded":
+        points, triangles = read_stl_welded(
+            file_path, config.get("stl_welding", {}).get("tolerance", 1e-6)
+        )
+        return create_mesh_object(name, points, triangles)
+
+    if loader == "vtk":
+        points, triangles, _ = read_surface(file_path)
+        return create_mesh_object(name, points, triangles)
+
+    if loader != "stl":
+        raise ValueError(f"Mesh loader {loader} is not supported!")
+
+    bpy.ops.wm.stl_import(filepath=file_path)
     return bpy.context.selected_objects[0]
 
 
+def create_mesh_object(
+    name: str, points: np.ndarray, triangles: np.ndarray
+) -> bpy.types.Object:
+    """Create a mesh object from point and triangle arrays.
+
+    The arrays are passed to Blender in bulk via `foreach_set` so no
+    Python loop over vertices or faces is necessary. The new object is
+    selected and set active.
+    """
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(points))
+    mesh.vertices.foreach_set("co", np.asarray(points, dtype=np.float32).ravel())
+    mesh.loops.add(triangles.size)
+    mesh.loops.foreach_set(
+        "vertex_index", np.asarray(triangles, dtype=np.int32).ravel()
+    )
+    mesh.polygons.add(len(triangles))
+    mesh.polygons.foreach_set(
+        "loop_start", np.arange(0, triangles.size, 3, dtype=np.int32)
+    )
+    mesh.update()
+
+    mesh_obj = bpy.data.objects.new(name, mesh)
+    bpy.context.scene.collection.objects.link(mesh_obj)
+    for obj in bpy.context.selected_objects:
+        obj.select_set(False)
+    mesh_obj.select_set(True)
+    bpy.context.view_layer.objects.active = mesh_obj
+    return mesh_obj
+
+
+def update_vertices(mesh_obj: bpy.types.Object, points: np.ndarray) -> None:
+    """Update the vertex coordinates of a mesh in place."""
+    mesh = mesh_obj.data
+    if len(points) != len(mesh.vertices):
+        raise ValueError(
+            f"Number of points ({len(points)}) does not match the mesh "
+            f"({len(mesh.vertices)})!"
+        )
+    mesh.vertices.foreach_set("co", np.asarray(points, dtype=np.float32).ravel())
+    mesh.update()
+
+
+def get_vertices(mesh_obj: bpy.types.Object) -> np.ndarray:
+    """Get the (local) vertex coordinates of a mesh as array."""
+    points = np.empty(len(mesh_obj.data.vertices) * 3, dtype=np.float32)
+    mesh_obj.data.vertices.foreach_get("co", points)
+    return points.reshape(-1, 3)
+
+
 def apply_transforms(mesh_obj: bpy.types.Object, config: Any) -> None:
     """Apply basic transforms from params (scale, location, and rotation)"""
     mesh_obj.scale = config.object_settings.mesh_scale
     mesh_obj.location = config.object_settings.mesh_location
 
-    bpy.ops.object.origin_set(
-        type="ORIGIN_CENTER_OF_MASS", center="BOUNDS"
-    )  # Center origin
+    # Center origin (point clouds have no faces to compute a mass center)
+    origin_type = (
+        "ORIGIN_CENTER_OF_MASS" if mesh_obj.data.polygons else "ORIGIN_GEOMETRY"
+    )
+    bpy.ops.object.origin_set(type=origin_type, center="BOUNDS")
 
     mesh_obj.rotation_euler = tuple(np.deg2rad(config.object_settings.rotation))
 
@@ -0,0 +1,117 @@
+"""Rendering of point clouds as instanced spheres in Blender."""
+
+import logging
+import os
+from typing import Any
+
+import bpy
+import numpy as np
+
+from obscura.core.mesh_io import read_point_cloud
+from obscura.core.rendering.object_settings import create_mesh_object
+from obscura.core.rendering.scalar_field import add_color_attribute
+
+log = logging.getLogger("obscura")
+
+RADIUS_ATTRIBUTE = "radius"
+NODE_GROUP_NAME = "PointSpheres"
+
+
+def load_point_cloud(config: Any) -> bpy.types.Object:
+    """Import a point cloud as vertex-only mesh rendered as spheres.
+
+    The points, radii and (optional) scalar field colors are passed to
+    Blender in bulk via `foreach_set`. A geometry nodes modifier
+    instances one sphere per point, so only a single sphere mesh is
+    stored no matter how many points are rendered.
+
+    Args:
+        config: Munch type object containing all configs for current
+        run.
+
+    Returns:
+        Mesh object of the points.
+    """
+
+    file_path = config.general.input_file_path
+    settings = config.points
+    scalar_field = config.get("scalar_field", {}).get("mode", False)
+    array_names = [settings.radius_array] if settings.radius_array else []
+    if scalar_field:
+        array_names.append(config.scalar_field.array_name)
+    points, arrays = read_point_cloud(file_path, array_names)
+
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    mesh_obj = create_mesh_object(name, points, np.empty((0, 3), dtype=np.int32))
+
+    # Radius array values are scaled by the configured radius
+    radii = np.full(len(points), settings.radius, dtype=np.float32)
+    if settings.radius_array:
+        radii *= arrays[settings.radius_array]
+    attribute = mesh_obj.data.attributes.new(RADIUS_ATTRIBUTE, "FLOAT", "POINT")
+    attribute.data.foreach_set("value", radii)
+
+    if scalar_field:
+        add_color_attribute(mesh_obj, arrays[config.scalar_field.array_name], config)
+
+    modifier = mesh_obj.modifiers.new("PointSpheres", "NODES")
+    modifier.node_group = sphere_node_group(settings.subdivisions)
+    log.info(f"Loaded {len(points)} points from {file_path}")
+
+    return mesh_obj
+
+
+def sphere_node_group(subdivisions: int) -> bpy.types.NodeTree:
+    """Create the geometry nodes instancing an ico sphere on every point.
+
+    The unit sphere is scaled by the "radius" attribute of the points.
+
+    Args:
+        subdivisions: Subdivisions of the ico sphere.
+
+    Returns:
+        Geometry node group.
+    """
+
+    node_group = bpy.data.node_groups.new(NODE_GROUP_NAME, "GeometryNodeTree")
+    node_group.interface.new_socket(
+        "Geometry", in_out="INPUT", socket_type="NodeSocketGeometry"
+    )
+    node_group.interface.new_socket(
+        "Geometry", in_out="OUTPUT", socket_type="NodeSocketGeometry"
+    )
+
+    nodes, links = node_group.nodes, node_group.links
+    group_input = nodes.new("NodeGroupInput")
+    group_output = nodes.new("NodeGroupOutput")
+    sphere = nodes.new("GeometryNodeMeshIcoSphere")
+    sphere.inputs["Radius"].default_value = 1.0
+    sphere.inputs["Subdivisions"].default_value = subdivisions
+    # Instances do not use the materials of the object
+    set_material = nodes.new("GeometryNodeSetMaterial")
+    radius = nodes.new("GeometryNodeInputNamedAttribute")
+    radius.data_type = "FLOAT"
+    radius.inputs["Name"].default_value = RADIUS_ATTRIBUTE
+    instance = nodes.new("GeometryNodeInstanceOnPoints")
+
+    links.new(group_input.outputs[0], instance.inputs["Points"])
+    links.new(sphere.outputs["Mesh"], set_material.inputs["Geometry"])
+    links.new(set_material.outputs["Geometry"], instance.inputs["Instance"])
+    links.new(radius.outputs["Attribute"], instance.inputs["Scale"])
+    links.new(instance.outputs["Instances"], group_output.inputs[0])
+
+    return node_group
+
+
+def set_sphere_material(
+    mesh_obj: bpy.types.Object, material: bpy.types.Material
+) -> None:
+    """Use a material for the spheres of a point cloud.
+
+    Args:
+        mesh_obj: Mesh object of the points.
+        material: Material of the spheres.
+    """
+
+    nodes = mesh_obj.modifiers["PointSpheres"].node_group.nodes
+    nodes["Set Material"].inputs["Material"].default_value = material
@@ -1,37 +1,482 @@
 """Rendering settings and final image generation in Blender."""
 
+import logging
 import os
+import tempfile
+import time
 from typing import Any
 
 import bpy
+import numpy as np
 
+from obscura.core.cost_model import AUTO_ENGINE, select_engine
+from obscura.core.image_io import (
+    PngWriter,
+    async_writer,
+    png_compression_level,
+    read_tga,
+)
 
-def render(scene: bpy.types.Scene, config: Any) -> None:
-    """Configure preview or full render settings."""
+log = logging.getLogger("obscura")
+
+
+def active_settings(config: Any) -> Any:
+    """Get the render settings of the current quality (thumbnail, preview
+    or final) with the output resolution."""
+    if config.render.get("thumbnail", {}).get("mode", False):
+        return config.render.thumbnail
+    if config.render.preview.mode:
+        return config.render.preview
+    return config.render
+
+
+def configure_render(scene: bpy.types.Scene, config: Any) -> None:
+    """Configure thumbnail, preview or full render settings."""
     output_path = config.general.output_file_path
-    scene.render.image_settings.file_format = "PNG"
+    configure_output(scene, config)
 
+    thumbnail = config.render.get("thumbnail", {}).get("mode", False)
     preview = config.render.preview.mode
 
-    if preview:
+    if thumbnail:
+        base, ext = os.path.splitext(output_path)
+        scene.render.filepath = f"{base}_thumbnail{ext}"
+        scene.render.resolution_x = config.render.thumbnail.resolution_x
+        scene.render.resolution_y = config.render.thumbnail.resolution_y
+        scene.render.engine = resolve_engine(
+            scene,
+            config,
+            config.render.thumbnail.engine,
+            config.render.thumbnail.samples,
+        )
+        if scene.render.engine == "CYCLES":
+            scene.cycles.samples = config.render.thumbnail.samples
+            scene.cycles.use_denoising = False
+            scene.cycles.time_limit = 0
+
+    elif preview:
         base, ext = os.path.splitext(output_path)
         scene.render.filepath = f"{base}_preview{ext}"
         scene.render.resolution_x = config.render.preview.resolution_x
         scene.render.resolution_y = config.render.preview.resolution_y
-        scene.render.engine = config.render.preview.engine
+        scene.render.engine = resolve_engine(
+            scene, config, config.render.preview.engine, config.render.preview.samples
+        )
         if scene.render.engine == "CYCLES":
             scene.cycles.samples = config.render.preview.samples
             scene.cycles.use_denoising = config.render.preview.use_denoising
+            apply_sample_budget(scene, config)
         # Eevee Next has no configurable preview effects
 
     else:
         scene.render.filepath = output_path
         scene.render.resolution_x = config.render.resolution_x
         scene.render.resolution_y = config.render.resolution_y
-        scene.render.engine = config.render.engine
+        scene.render.engine = resolve_engine(
+            scene, config, config.render.engine, config.render.samples
+        )
         if scene.render.engine == "CYCLES":
             scene.cycles.samples = config.render.samples
-            scene.cycles.use_denoising = True
+            scene.cycles.use_denoising = config.render.get("use_denoising", True)
+            apply_sample_budget(scene, config)
+
+    if scene.render.engine == "BLENDER_WORKBENCH":
+        configure_workbench(scene, config)
+
+    # Limit render threads, e.g. if multiple workers share the CPU cores
+    threads = config.render.get("threads", 0)
+    if threads:
+        scene.render.threads_mode = "FIXED"
+        scene.render.threads = threads
+
+
+def resolve_engine(
+    scene: bpy.types.Scene, config: Any, engine: str, samples: int
+) -> str:
+    """Resolve the engine "AUTO" with the cost model.
+
+    The scene size is estimated by the faces of all mesh objects and the
+    output resolution has to be set already.
+
+    Args:
+        scene: Scene to render.
+        config: Munch type object containing all configs for current
+        run.
+        engine: Configured engine.
+        samples: Configured Cycles samples.
+
+    Returns:
+        Render engine.
+    """
+
+    if engine != AUTO_ENGINE:
+        return engine
+
+    triangles = sum(
+        len(obj.data.polygons) for obj in scene.objects if obj.type == "MESH"
+    )
+    pixels = scene.render.resolution_x * scene.render.resolution_y
+    exclude: tuple[str, ...] = ()
+    if config.general.get("loader", "stl") == "points" and config.get(
+        "scalar_field", {}
+    ).get("mode", False):
+        # Workbench ignores the colors of the instanced spheres
+        exclude = ("BLENDER_WORKBENCH",)
+    return select_engine(config.render.auto, triangles, pixels, samples, exclude)
+
+
+def configure_workbench(scene: bpy.types.Scene, config: Any) -> None:
+    """Configure the flat, studio or matcap shading of the Workbench
+    engine.
+
+    Workbench ignores shader nodes, so the surface is colored by the
+    viewport color of the material (set from `config.material`) or by
+    the color attribute of the scalar field and the background by the
+    world color. The spheres of point clouds only have the material
+    color, so they can not be colored by a scalar field.
+    """
+
+    workbench = config.render.get("workbench", {})
+    shading = scene.display.shading
+    shading.light = workbench.get("lighting", "STUDIO")
+    if shading.light == "MATCAP":
+        shading.studio_light = workbench.get("matcap", "basic_grey.exr")
+    scalar_field = config.get("scalar_field", {}).get("mode", False)
+    shading.color_type = "VERTEX" if scalar_field else "MATERIAL"
+    scene.display.render_aa = workbench.get("antialiasing", "8")
+
+
+def configure_output(scene: bpy.types.Scene, config: Any) -> None:
+    """Configure the file format and encoding of the output image."""
+
+    output = config.render.get("output", {})
+    image_settings = scene.render.image_settings
+    image_settings.file_format = output.get("file_format", "PNG")
+
+    # the scene may be reused from a 16 or 32 bit OpenEXR job
+    if image_settings.file_format == "PNG":
+        image_settings.color_depth = "8"
+        image_settings.compression = output.get("compression", 15)
+    elif image_settings.file_format in ("JPEG", "WEBP"):
+        image_settings.color_depth = "8"
+        image_settings.quality = output.get("quality", 90)
+    elif image_settings.file_format == "OPEN_EXR":
+        image_settings.color_depth = "16" if output.get("exr_half", False) else "32"
+
+
+def apply_sample_budget(scene: bpy.types.Scene, config: Any) -> None:
+    """Map the noise threshold and time budget onto Cycles adaptive
+    sampling and time limit.
+
+    If a time limit and probe samples are given, a low-sample pass is
+    rendered to estimate the cost per sample and the sample count is
+    reduced to fit the time limit. The configured samples remain the
+    upper bound.
+    """
+
+    budget = config.render.get("budget", {})
+    if not budget.get("mode", False):
+        # Blender defaults, the scene may be reused from a budget job
+        scene.cycles.use_adaptive_sampling = True
+        scene.cycles.adaptive_threshold = 0.01
+        scene.cycles.adaptive_min_samples = 0
+        scene.cycles.time_limit = 0
+        return
+
+    scene.cycles.use_adaptive_sampling = True
+    scene.cycles.adaptive_threshold = budget.noise_threshold
+    scene.cycles.adaptive_min_samples = budget.min_samples
+    scene.cycles.time_limit = budget.time_limit
+
+    if budget.time_limit and budget.probe_samples:
+        scene.cycles.samples = estimate_samples(
+            scene, budget.time_limit, budget.probe_samples
+        )
+
+
+def estimate_samples(
+    scene: bpy.types.Scene, time_limit: float, probe_samples: int
+) -> int:
+    """Estimate the number of samples fitting into the time limit from a
+    low-sample probe render.
+
+    The probe time includes the scene synchronization, therefore the
+    estimate is conservative.
+
+    Args:
+        scene: Scene with configured render settings.
+        time_limit: Time limit per image in seconds.
+        probe_samples: Samples of the probe render.
+
+    Returns:
+        Number of samples, at least one and at most the configured
+        samples.
+    """
+
+    max_samples = scene.cycles.samples
+    use_denoising = scene.cycles.use_denoising
+    scene.cycles.samples = min(probe_samples, max_samples)
+    scene.cycles.use_denoising = False
+    scene.cycles.time_limit = 0
+
+    start_time = time.perf_counter()
+    bpy.ops.render.render()
+    seconds_per_sample = (time.perf_counter() - start_time) / scene.cycles.samples
+
+    scene.cycles.samples = max_samples
+    scene.cycles.use_denoising = use_denoising
+    scene.cycles.time_limit = time_limit
+
+    samples = max(1, min(max_samples, int(time_limit / seconds_per_sample)))
+    log.info(
+        f"Probe render took {seconds_per_sample:.4f} s per sample, using "
+        f"{samples} samples to fit {time_limit} s"
+    )
+    return samples
+
+
+def render(scene: bpy.types.Scene, config: Any) -> None:
+    """Configure render settings and render the image."""
+
+    configure_render(scene, config)
 
     # Render
-    bpy.ops.render.render(write_still=True)
+    bpy.ops.render.render()
+
+
+def tile_regions(width: int, height: int, tile_size: int, overlap: int) -> list[dict]:
+    """Split the frame into tiles.
+
+    Every tile is rendered with an overlap to its neighbours (clipped to
+    the frame) to avoid seams from denoising at the tile borders.
+
+    Args:
+        width: Width of the frame in pixels.
+        height: Height of the frame in pixels.
+        tile_size: Maximum width and height of a tile in pixels.
+        overlap: Overlap of the rendered regions in pixels.
+
+    Returns:
+        Pixel region of each tile (x, y, width, height) and the rendered
+        region around it (render_x, render_y, render_width,
+        render_height), both measured from the top left corner, ordered
+        row by row from the top.
+    """
+
+    tiles = []
+    for y in range(0, height, tile_size):
+        for x in range(0, width, tile_size):
+            tile_width = min(tile_size, width - x)
+            tile_height = min(tile_size, height - y)
+            render_x = max(0, x - overlap)
+            render_y = max(0, y - overlap)
+            tiles.append(
+                {
+                    "x": x,
+                    "y": y,
+                    "width": tile_width,
+                    "height": tile_height,
+                    "render_x": render_x,
+                    "render_y": render_y,
+                    "render_width": min(width, x + tile_width + overlap) - render_x,
+                    "render_height": min(height, y + tile_height + overlap) - render_y,
+                }
+            )
+    return tiles
+
+
+def render_tiled(scene: bpy.types.Scene, config: Any) -> None:
+    """Render the image tile by tile and stitch the tiles into the
+    output PNG.
+
+    Each tile is rendered as a cropped border region and kept on disk.
+    The output image is written row by row, so the peak memory is
+    bounded by the tile size instead of the full image size. The tiles
+    are rendered one after another in this session instead of by worker
+    processes, as every worker would rebuild the scene while Cycles
+    already renders each tile on all cores. The budget is not supported,
+    its probe render would cover the full frame and its time limit would
+    apply to every tile.
+    """
+
+    if config.render.get("budget", {}).get("mode", False):
+        raise ValueError("render.tiles does not support render.budget!")
+
+    configure_render(scene, config)
+    if scene.render.image_settings.file_format != "PNG":
+        raise ValueError("Tiled rendering only supports PNG output!")
+
+    scale = scene.render.resolution_percentage / 100
+    width = int(scene.render.resolution_x * scale)
+    height = int(scene.render.resolution_y * scale)
+    tiles = tile_regions(
+        width, height, config.render.tiles.tile_size, config.render.tiles.overlap
+    )
+    output_path = scene.render.filepath
+    output_directory = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(output_directory, exist_ok=True)
+    log.info(f"Rendering {width}x{height} image in {len(tiles)} tiles ...")
+
+    scene.render.use_border = True
+    scene.render.use_crop_to_border = True
+    try:
+        with tempfile.TemporaryDirectory(dir=output_directory) as tile_directory:
+            for index, tile in enumerate(tiles):
+                # border coordinates are relative and start at the bottom
+                # left, Blender truncates them to pixels, so they are placed
+                # at the pixel centers to be robust against rounding
+                scene.render.border_min_x = (tile["render_x"] + 0.5) / width
+                scene.render.border_max_x = (
+                    tile["render_x"] + tile["render_width"] + 0.5
+                ) / width
+                scene.render.border_min_y = (
+                    height - tile["render_y"] - tile["render_height"] + 0.5
+                ) / height
+                scene.render.border_max_y = (height - tile["render_y"] + 0.5) / height
+
+                bpy.ops.render.render()
+                tile["path"] = save_tile(
+                    scene, os.path.join(tile_directory, f"tile{index:04d}")
+                )
+                log.info(f"Tile {index + 1}/{len(tiles)} rendered.")
+
+            channels = {"BW": 1, "RGB": 3, "RGBA": 4}[
+                scene.render.image_settings.color_mode
+            ]
+            stitch_tiles(
+                output_path,
+                width,
+                height,
+                channels,
+                tiles,
+                compression=png_compression_level(
+                    scene.render.image_settings.compression
+                ),
+            )
+    finally:
+        scene.render.use_border = False
+        scene.render.use_crop_to_border = False
+
+
+def save_tile(scene: bpy.types.Scene, path: str) -> str:
+    """Save the current render result as 8 bit pixel array.
+
+    Args:
+        scene: Scene with configured render settings.
+        path: Path of the tile without extension.
+
+    Returns:
+        Path of the saved pixel array (height, width, channels) from top
+        to bottom.
+    """
+
+    np.save(path + ".npy", render_result_pixels(scene))
+    return path + ".npy"
+
+
+def render_result_pixels(scene: bpy.types.Scene) -> np.ndarray:
+    """Get the color managed 8 bit pixels of the current render result.
+
+    The render result is written as uncompressed TGA, which is fast
+    compared to PNG encoding, and read back into an array.
+
+    Args:
+        scene: Scene with configured render settings.
+
+    Returns:
+        Pixels (height, width, channels) from top to bottom.
+    """
+
+    image_settings = scene.render.image_settings
+    file_format = image_settings.file_format
+    file_descriptor, tga_path = tempfile.mkstemp(suffix=".tga")
+    os.close(file_descriptor)
+    try:
+        image_settings.file_format = "TARGA_RAW"
+        bpy.data.images["Render Result"].save_render(filepath=tga_path, scene=scene)
+        return read_tga(tga_path)
+    finally:
+        image_settings.file_format = file_format
+        os.remove(tga_path)
+
+
+def stitch_tiles(
+    path: str,
+    width: int,
+    height: int,
+    channels: int,
+    tiles: list[dict],
+    compression: int = 6,
+    rows_per_write: int = 64,
+) -> None:
+    """Stitch rendered tiles into a PNG image without loading the full
+    image into memory.
+
+    Args:
+        path: Path of the output PNG.
+        width: Width of the image in pixels.
+        height: Height of the image in pixels.
+        channels: Channels of the output image.
+        tiles: Tile regions including the path of their pixel arrays.
+        compression: zlib compression level (0-9).
+        rows_per_write: Number of rows assembled at once.
+    """
+
+    with PngWriter(path, width, height, channels, compression) as writer:
+        for y in sorted({tile["y"] for tile in tiles}):
+            band = sorted(
+                (tile for tile in tiles if tile["y"] == y), key=lambda t: t["x"]
+            )
+            # memory mapped views of the tile regions without overlap
+            regions = []
+            for tile in band:
+                pixels = np.load(tile["path"], mmap_mode="r")
+                if pixels.shape[:2] != (tile["render_height"], tile["render_width"]):
+                    raise ValueError(
+                        f"Tile at ({tile['x']}, {tile['y']}) has "
+                        f"{pixels.shape[1]}x{pixels.shape[0]} instead of "
+                        f"{tile['render_width']}x{tile['render_height']} pixels!"
+                    )
+                top = tile["y"] - tile["render_y"]
+                left = tile["x"] - tile["render_x"]
+                regions.append(
+                    pixels[
+                        top : top + tile["height"],
+                        left : left + tile["width"],
+                        :channels,
+                    ]
+                )
+
+            for row in range(0, band[0]["height"], rows_per_write):
+                writer.write_rows(
+                    np.concatenate(
+                        [region[row : row + rows_per_write] for region in regions],
+                        axis=1,
+                    )
+                )
+
+
+def write_render(scene: bpy.types.Scene, config: Any) -> None:
+    """Write the render result to the configured output file.
+
+    With asynchronous writing, 8 bit PNG images are encoded in a
+    background thread while the pipeline continues. Other formats are
+    always written by Blender directly.
+    """
+
+    output = config.render.get("output", {})
+    image_settings = scene.render.image_settings
+    if (
+        not output.get("async_write", False)
+        or image_settings.file_format != "PNG"
+        or image_settings.color_depth != "8"
+    ):
+        bpy.data.images["Render Result"].save_render(filepath=scene.render.filepath)
+        return
+
+    os.makedirs(os.path.dirname(os.path.abspath(scene.render.filepath)), exist_ok=True)
+    async_writer(output.get("num_threads", 2)).submit(
+        scene.render.filepath,
+        render_result_pixels(scene),
+        compression=png_compression_level(image_settings.compression),
+    )
@@ -10,46 +10,204 @@ from typing import Any
 
 import bpy
 
+from obscura.core.config import merge_config
+from obscura.core.profiling import StageProfiler
 from obscura.core.rendering.background import define_background
-from obscura.core.rendering.camera import setup_camera
-from obscura.core.rendering.lighting import ambient_lighting, setup_lighting
-from obscura.core.rendering.material import apply_material
+from obscura.core.rendering.camera import (
+    DEFAULT_AZIMUTH,
+    DEFAULT_ELEVATION,
+    setup_camera,
+)
+from obscura.core.rendering.framing import FramingEngine
+from obscura.core.rendering.lighting import setup_lighting
+from obscura.core.rendering.lod import decimate_mesh
+from obscura.core.rendering.material import apply_material, library_material
+from obscura.core.rendering.mesh_cache import load_cached_mesh
+from obscura.core.rendering.multi_view import render_views
 from obscura.core.rendering.object_settings import (
     apply_transforms,
     compute_geometry,
     load_mesh,
 )
-from obscura.core.rendering.render_settings import render
+from obscura.core.rendering.point_cloud import load_point_cloud, set_sphere_material
+from obscura.core.rendering.render_settings import (
+    render,
+    render_tiled,
+    write_render,
+)
+from obscura.core.rendering.scalar_field import (
+    RANGE_PROPERTY,
+    apply_scalar_field_material,
+    colorbar_path,
+    load_scalar_field_mesh,
+    write_colorbar,
+)
+from obscura.core.rendering.scene import clear_scene, prepare_scene_template
+from obscura.core.rendering.time_series import (
+    load_time_series_mesh,
+    render_time_series,
+    time_series_files,
+)
 
 log = logging.getLogger("obscura")
 
 
-def rendering_pipeline(config: Any) -> None:
-    """Rendering script for Obscura."""
+def rendering_pipeline(
+    config: Any,
+    clear_only: bool = False,
+    profiler: StageProfiler | None = None,
+) -> list[str]:
+    """Rendering script for Obscura.
+
+    Args:
+        config: Munch type object containing all configs for current
+        run.
+        clear_only: If True, only remove the objects of a previous job
+        instead of resetting Blender to factory settings.
+        profiler: Profiler recording the timings of all stages.
+
+    Returns:
+        Paths of the written images.
+    """
+
+    profiler = profiler or StageProfiler()
+
+    # Feature sections are optional to keep older configs valid
+    loader = config.general.get("loader", "stl")
+    time_series = config.get("time_series", {}).get("mode", False)
+    mesh_cache = config.get("mesh_cache", {}).get("mode", False)
+    scalar_field = config.get("scalar_field", {}).get("mode", False)
+    if scalar_field and (time_series or mesh_cache):
+        # both load the surface without the result field
+        raise ValueError("scalar_field supports neither time_series nor mesh_cache!")
+    if loader == "points" and (time_series or mesh_cache):
+        # both load surface meshes
+        raise ValueError("Point clouds support neither time_series nor mesh_cache!")
 
     # Start empty scene
-    bpy.ops.wm.read_factory_settings(use_empty=True)
+    with profiler.stage("reset"):
+        template: dict = {}
+        if config.get("scene_template", {}).get("mode", False):
+            # Static scene (world, camera, lights, material) is reused
+            template = prepare_scene_template(clear_only)
+        elif clear_only:
+            clear_scene()
+        else:
+            bpy.ops.wm.read_factory_settings(use_empty=True)
 
     # Object loading and transformation from object_settings.py
-    mesh_obj = load_mesh(config)  # Import STL mesh
-    apply_transforms(mesh_obj, config)
-    center, max_extent = compute_geometry(mesh_obj)
+    if time_series:
+        with profiler.stage("load"):
+            time_steps = time_series_files(config)
+            # Mesh of first step, its surface maps later steps onto it
+            mesh_obj, first_points, point_ids = load_time_series_mesh(time_steps[0])
+        with profiler.stage("transform"):
+            apply_transforms(mesh_obj, config)
+    elif mesh_cache:
+        with profiler.stage("load"):
+            mesh_obj = load_cached_mesh(config)  # Prepared (decimated) mesh from cache
+    else:
+        with profiler.stage("load"):
+            if loader == "points":
+                # Vertex-only mesh rendered as instanced spheres
+                mesh_obj = load_point_cloud(config)
+            elif scalar_field:
+                # Surface of the VTU colored by a result field
+                mesh_obj = load_scalar_field_mesh(config)
+            else:
+                mesh_obj = load_mesh(config)  # Import STL mesh
+        with profiler.stage("transform"):
+            apply_transforms(mesh_obj, config)
+        if config.get("lod", {}).get("mode", False):
+            with profiler.stage("lod"):
+                decimate_mesh(mesh_obj, config)  # Reduce to triangle budget
+
+    with profiler.stage("geometry"):
+        center, max_extent = compute_geometry(mesh_obj)
 
     # Camera set-up from camera.py
-    setup_camera(config, mesh_obj, center, max_extent)
+    with profiler.stage("camera"):
+        cam_obj = setup_camera(
+            config, mesh_obj, center, max_extent, template.get("camera")
+        )
+        framing = None
+        if config.camera.get("framing", {}).get("mode", False):
+            # Fit the camera to the vertices instead of the bounding box
+            framing = FramingEngine.from_object(mesh_obj, config)
+            framing.apply(cam_obj, DEFAULT_AZIMUTH, DEFAULT_ELEVATION)
 
-    # Ambient world from background.py and lighting.py
-    define_background(config)
-    ambient_lighting(config)
+    with profiler.stage("lighting"):
+        # Ambient world from background.py
+        define_background(config)
 
-    # Automatic lighting setup (simple SUNs) from lighting.py
-    setup_lighting(center, max_extent, config)
+        # Automatic lighting setup (simple SUNs) from lighting.py
+        setup_lighting(center, max_extent, config, template.get("lights"))
 
     # Apply defined material properties from material.py
-    apply_material(mesh_obj, config)
+    with profiler.stage("material"):
+        if scalar_field:
+            apply_scalar_field_material(mesh_obj, config)
+        elif config.get("material_library", {}).get("mode", False):
+            # Reuse the material (and its compiled shader) of equal settings
+            mesh_obj.data.materials.append(library_material(config))
+        else:
+            apply_material(mesh_obj, config, template.get("material"))
+        if loader == "points":
+            set_sphere_material(mesh_obj, mesh_obj.data.materials[-1])
+
+    if scalar_field and config.scalar_field.colorbar:
+        with profiler.stage("colorbar"):
+            lower, upper = mesh_obj[RANGE_PROPERTY]  # Range of the colors
+            write_colorbar(
+                colorbar_path(config),
+                config.scalar_field.colormap,
+                lower,
+                upper,
+                config.scalar_field.array_name,
+            )
+        log.info("Colorbar saved to " + colorbar_path(config))
 
     # Render settings & execution
     scene = bpy.context.scene
-    render(scene, config)
+    if time_series:
+        with profiler.stage("render"):
+            output_files = render_time_series(
+                scene, config, mesh_obj, time_steps, first_points, point_ids
+            )
+    elif config.camera.get("multi_view", {}).get("mode", False):
+        with profiler.stage("render"):
+            output_files = render_views(
+                scene, config, cam_obj, center, max_extent, framing
+            )
+    elif config.render.get("progressive", {}).get("mode", False):
+        # Preview first so it can be shown while the final image renders
+        output_files = []
+        for quality in ["preview", "final"]:
+            quality_config = merge_config(
+                config, {"render": {"preview": {"mode": quality == "preview"}}}
+            )
+            with profiler.stage(f"render_{quality}"):
+                render(scene, quality_config)
+            with profiler.stage(f"write_{quality}"):
+                write_render(scene, quality_config)
+            output_files.append(scene.render.filepath)
+            if quality == "preview":
+                log.info("Preview saved to " + str(scene.render.filepath))
+    elif config.render.get("tiles", {}).get("mode", False):
+        with profiler.stage("render"):
+            render_tiled(scene, config)  # Tiles are stitched into the output file
+        output_files = [scene.render.filepath]
+    else:
+        with profiler.stage("render"):
+            render(scene, config)
+        with profiler.stage("write"):
+            write_render(scene, config)
+        output_files = [scene.render.filepath]
+
+    for output_file in output_files:
+        log.info("Render saved to " + str(output_file))
+
+    if scalar_field and config.scalar_field.colorbar:
+        output_files.append(colorbar_path(config))  # Cached with the render
 
-    log.info("Render saved to " + str(scene.render.filepath))
+    return output_files
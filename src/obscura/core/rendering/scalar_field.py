@@ -0,0 +1,288 @@
+"""Coloring of meshes by a scalar field of simulation results in Blender."""
+
+import logging
+import os
+from typing import Any
+
+import bpy
+import numpy as np
+
+from obscura.core.image_io import text_mask, write_png
+from obscura.core.mesh_io import read_surface_field
+from obscura.core.rendering.material import set_material_parameters
+from obscura.core.rendering.object_settings import create_mesh_object
+
+log = logging.getLogger("obscura")
+
+ATTRIBUTE_NAME = "ScalarField"
+RANGE_PROPERTY = "scalar_field_range"  # Object property for the colorbar
+
+# Colormaps as evenly spaced sRGB control points
+COLORMAPS = {
+    "viridis": [
+        [0.267004, 0.004874, 0.329415],
+        [0.282623, 0.140926, 0.457517],
+        [0.229739, 0.322361, 0.545706],
+        [0.172719, 0.448791, 0.557885],
+        [0.127568, 0.566949, 0.550556],
+        [0.157851, 0.683765, 0.501686],
+        [0.369214, 0.788888, 0.382914],
+        [0.678489, 0.863742, 0.189503],
+        [0.993248, 0.906157, 0.143936],
+    ],
+    "coolwarm": [
+        [0.229806, 0.298718, 0.753683],
+        [0.552992, 0.690268, 0.995040],
+        [0.865395, 0.865396, 0.865397],
+        [0.957772, 0.603733, 0.486079],
+        [0.705673, 0.015556, 0.150233],
+    ],
+    "rainbow": [
+        [0.0, 0.0, 1.0],
+        [0.0, 1.0, 1.0],
+        [0.0, 1.0, 0.0],
+        [1.0, 1.0, 0.0],
+        [1.0, 0.0, 0.0],
+    ],
+    "grayscale": [[0.0, 0.0, 0.0], [1.0, 1.0, 1.0]],
+}
+
+
+def value_range(values: np.ndarray, config: Any) -> tuple[float, float]:
+    """Get the value range mapped onto the colormap.
+
+    Args:
+        values: Values of the scalar field.
+        config: Munch type object containing all configs for current
+        run.
+
+    Returns:
+        Lower and upper bound, the configured range or the range of the
+        values if no range is set.
+    """
+
+    if config.scalar_field.range:
+        lower, upper = config.scalar_field.range
+        return float(lower), float(upper)
+    return float(np.nanmin(values)), float(np.nanmax(values))
+
+
+def map_colors(
+    values: np.ndarray,
+    colormap: str,
+    lower: float,
+    upper: float,
+    linear: bool = False,
+    lut_size: int = 4096,
+) -> np.ndarray:
+    """Map values through a colormap.
+
+    The colormap is sampled into a lookup table once, so mapping the
+    values only requires a normalization and a gather.
+
+    Args:
+        values: Values (n,).
+        colormap: Name of the colormap.
+        lower: Value mapped to the first color of the colormap.
+        upper: Value mapped to the last color of the colormap.
+        linear: If True, return linear colors as used by Blender instead
+        of sRGB colors.
+        lut_size: Number of entries of the lookup table.
+
+    Returns:
+        Colors (n, 3) in [0, 1], values outside of the range are clamped.
+    """
+
+    if colormap not in COLORMAPS:
+        raise ValueError(f"Colormap {colormap} is not supported!")
+
+    control_points = np.asarray(COLORMAPS[colormap], dtype=np.float32)
+    samples = np.linspace(0.0, 1.0, lut_size)
+    positions = np.linspace(0.0, 1.0, len(control_points))
+    lut = np.stack(
+        [np.interp(samples, positions, control_points[:, c]) for c in range(3)],
+        axis=-1,
+    ).astype(np.float32)
+    if linear:
+        lut = srgb_to_linear(lut)
+
+    scale = (lut_size - 1) / (upper - lower) if upper > lower else 0.0
+    indices = (np.asarray(values, dtype=np.float32) - lower) * scale + 0.5
+    np.clip(np.nan_to_num(indices), 0, lut_size - 1, out=indices)
+    return lut[indices.astype(np.intp)]
+
+
+def srgb_to_linear(colors: np.ndarray) -> np.ndarray:
+    """Convert sRGB colors to linear colors as used by Blender.
+
+    Args:
+        colors: sRGB colors in [0, 1].
+
+    Returns:
+        Linear colors.
+    """
+
+    return np.where(
+        colors <= 0.04045, colors / 12.92, ((colors + 0.055) / 1.055) ** 2.4
+    ).astype(np.float32)
+
+
+def load_scalar_field_mesh(config: Any) -> bpy.types.Object:
+    """Import the surface of the input file colored by a scalar field.
+
+    The colors are stored in the color attribute "ScalarField" of the
+    mesh points and set in bulk via `foreach_set`.
+
+    Args:
+        config: Munch type object containing all configs for current
+        run.
+
+    Returns:
+        Mesh object.
+    """
+
+    file_path = config.general.input_file_path
+    points, triangles, values = read_surface_field(
+        file_path, config.scalar_field.array_name, config.scalar_field.association
+    )
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    mesh_obj = create_mesh_object(name, points, triangles)
+    add_color_attribute(mesh_obj, values, config)
+
+    return mesh_obj
+
+
+def add_color_attribute(
+    mesh_obj: bpy.types.Object, values: np.ndarray, config: Any
+) -> None:
+    """Store the colors of the scalar field values at the mesh points
+    and the value range in the object property "scalar_field_range".
+
+    Args:
+        mesh_obj: Mesh object with one point per value.
+        values: Values (n,) of the scalar field.
+        config: Munch type object containing all configs for current
+        run.
+    """
+
+    lower, upper = value_range(values, config)
+    colors = np.ones((len(values), 4), dtype=np.float32)
+    colors[:, :3] = map_colors(
+        values, config.scalar_field.colormap, lower, upper, linear=True
+    )
+    attribute = mesh_obj.data.color_attributes.new(
+        ATTRIBUTE_NAME, type="FLOAT_COLOR", domain="POINT"
+    )
+    attribute.data.foreach_set("color", colors.ravel())
+    mesh_obj.data.color_attributes.active_color = attribute  # Used by Workbench
+    mesh_obj[RANGE_PROPERTY] = (lower, upper)
+    log.info(
+        f"Colored {len(values)} vertices by {config.scalar_field.array_name} "
+        f"in [{lower:g}, {upper:g}]"
+    )
+
+
+def apply_scalar_field_material(
+    mesh_obj: bpy.types.Object, config: Any
+) -> bpy.types.Material:
+    """Create and apply a material taking its base color from the scalar
+    field color attribute."""
+    mat = bpy.data.materials.new(name="ScalarFieldMaterial")
+    set_material_parameters(mat, config)
+
+    nodes = mat.node_tree.nodes
+    bsdf = nodes.get("Principled BSDF")
+    attribute = nodes.new("ShaderNodeAttribute")
+    attribute.attribute_name = ATTRIBUTE_NAME
+    if config.general.get("loader") == "points":
+        # Instanced spheres read the colors of their point
+        attribute.attribute_type = "INSTANCER"
+    mat.node_tree.links.new(attribute.outputs["Color"], bsdf.inputs["Base Color"])
+
+    mesh_obj.data.materials.append(mat)
+    return mat
+
+
+def write_colorbar(
+    path: str,
+    colormap: str,
+    lower: float,
+    upper: float,
+    array_name: str = "",
+    width: int = 32,
+    height: int = 256,
+    text_scale: int = 2,
+) -> None:
+    """Write a vertical colorbar of a colormap (maximum on top).
+
+    The array name is drawn above the bar and the values of the top and
+    bottom row next to it, in black on a white background. The legend is
+    also stored in the tEXt chunks of the PNG: "Title" (array name),
+    "Minimum" and "Maximum" (values of the bottom and top row) and
+    "Colormap". The directory of the image is created if it does not
+    exist.
+
+    Args:
+        path: Path of the PNG image.
+        colormap: Name of the colormap.
+        lower: Value of the bottom row.
+        upper: Value of the top row.
+        array_name: Name of the scalar field.
+        width: Width of the bar in pixels.
+        height: Height of the bar in pixels.
+        text_scale: Size of a font pixel of the labels in image pixels.
+    """
+
+    title = text_mask(array_name, text_scale)
+    upper_label = text_mask(f"{upper:.4g}", text_scale)
+    lower_label = text_mask(f"{lower:.4g}", text_scale)
+    padding = 2 * text_scale
+    bar_y = padding + (title.shape[0] + padding if array_name else 0)
+    label_x = 2 * padding + width
+    # the labels of a short bar are kept apart
+    legend_height = max(height, 2 * upper_label.shape[0] + padding)
+    image_width = max(
+        padding + title.shape[1],
+        label_x + max(upper_label.shape[1], lower_label.shape[1]),
+    )
+
+    pixels = np.full(
+        (bar_y + legend_height + padding, image_width + padding, 3),
+        255,
+        dtype=np.uint8,
+    )
+    colors = map_colors(np.linspace(1.0, 0.0, height), colormap, 0.0, 1.0)
+    pixels[bar_y : bar_y + height, padding : padding + width] = np.round(
+        255 * colors[:, None]
+    )
+    for mask, x, y in [
+        (title, padding, padding),
+        (upper_label, label_x, bar_y),
+        (lower_label, label_x, bar_y + legend_height - lower_label.shape[0]),
+    ]:
+        pixels[y : y + mask.shape[0], x : x + mask.shape[1]][mask] = 0
+
+    text = {
+        "Title": array_name,
+        "Minimum": f"{lower:.9g}",
+        "Maximum": f"{upper:.9g}",
+        "Colormap": colormap,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    write_png(path, pixels, text=text)
+    log.info(f"Colorbar of {array_name} in [{lower:g}, {upper:g}]")
+
+
+def colorbar_path(config: Any) -> str:
+    """Get the path of the colorbar next to the output file.
+
+    Args:
+        config: Munch type object containing all configs for current
+        run.
+
+    Returns:
+        Path of the colorbar PNG.
+    """
+
+    root = os.path.splitext(config.general.output_file_path)[0]
+    return root + "_colorbar.png"
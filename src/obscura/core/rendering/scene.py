@@ -0,0 +1,145 @@
+"""Scene state handling in Blender."""
+
+import bpy
+
+from obscura.core.rendering.lighting import LIGHTS, create_lights
+from obscura.core.rendering.material import LIBRARY_PROPERTY
+
+# Custom property marking the data blocks of the scene template, its
+# value is the role of the data block within the template
+TEMPLATE_PROPERTY = "obscura_template"
+
+
+def clear_scene(keep_template: bool = False) -> None:
+    """Remove all objects and the data blocks they used from the scene.
+
+    In contrast to a factory reset this keeps the Blender session (and
+    e.g. the world) alive so consecutive jobs only pay for the data
+    they actually created.
+
+    Args:
+        keep_template: If True, the objects and data blocks of the scene
+        template are kept, otherwise the template is removed as well.
+    """
+
+    if not keep_template:
+        # the template material is otherwise kept unused forever
+        for material in bpy.data.materials:
+            if TEMPLATE_PROPERTY in material:
+                material.use_fake_user = False
+
+    bpy.data.batch_remove(
+        [
+            obj
+            for obj in bpy.data.objects
+            if not (keep_template and TEMPLATE_PROPERTY in obj)
+        ]
+    )
+
+    # remove data blocks which are no longer used by any object (meshes
+    # and node groups first as they hold the users of the materials),
+    # materials of the library are purged by the library itself
+    for collection in (
+        bpy.data.meshes,
+        bpy.data.node_groups,
+        bpy.data.materials,
+        bpy.data.lights,
+        bpy.data.cameras,
+    ):
+        bpy.data.batch_remove(
+            [
+                data_block
+                for data_block in collection
+                if data_block.users == 0
+                and LIBRARY_PROPERTY not in data_block
+                and not (keep_template and TEMPLATE_PROPERTY in data_block)
+            ]
+        )
+
+
+def build_scene_template() -> dict:
+    """Reset Blender and build the static part of the scene.
+
+    World, camera, lights and material are created with the low-level
+    data API instead of operators and tagged as template, so following
+    jobs only have to link their mesh and adjust the parameters.
+
+    Returns:
+        Template with the camera, the lights and the material.
+    """
+
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    scene = bpy.context.scene
+
+    scene.world = bpy.data.worlds.new("World")
+    scene.world.use_nodes = True
+
+    cam_obj = bpy.data.objects.new("Camera", bpy.data.cameras.new("Camera"))
+    scene.collection.objects.link(cam_obj)
+    scene.camera = cam_obj
+
+    material = bpy.data.materials.new(name="MeshMaterial")
+    material.use_nodes = True
+    material.use_fake_user = True  # Kept while unused (e.g. with a material library)
+
+    lights = create_lights()
+    for data_block, role in [
+        (cam_obj, "camera"),
+        (cam_obj.data, "camera"),
+        (material, "material"),
+        *[(light_obj, name) for light_obj, (name, _, _) in zip(lights, LIGHTS)],
+        *[(light_obj.data, name) for light_obj, (name, _, _) in zip(lights, LIGHTS)],
+    ]:
+        data_block[TEMPLATE_PROPERTY] = role
+
+    return {"camera": cam_obj, "lights": lights, "material": material}
+
+
+def scene_template() -> dict | None:
+    """Find the scene template in the current Blender session.
+
+    Returns:
+        Template with the camera, the lights and the material or None if
+        the template is not (completely) present.
+    """
+
+    roles = {
+        data_block[TEMPLATE_PROPERTY]: data_block
+        for data_block in [*bpy.data.objects, *bpy.data.materials]
+        if TEMPLATE_PROPERTY in data_block
+    }
+    try:
+        return {
+            "camera": roles["camera"],
+            "lights": [roles[name] for name, _, _ in LIGHTS],
+            "material": roles["material"],
+        }
+    except KeyError:
+        return None
+
+
+def prepare_scene_template(clear_only: bool) -> dict:
+    """Prepare the scene of a job based on the scene template.
+
+    Args:
+        clear_only: If True, only remove the objects of a previous job
+        and reuse its template instead of building a new one.
+
+    Returns:
+        Template with the camera, the lights and the material.
+    """
+
+    template = scene_template() if clear_only else None
+    if template is None:
+        return build_scene_template()
+
+    clear_scene(keep_template=True)
+
+    # undo the per-job changes of e.g. multi-view and framing
+    cam_obj = template["camera"]
+    cam_obj.animation_data_clear()
+    cam_obj.data.animation_data_clear()
+    for name in ["ortho_scale", "clip_start"]:
+        setattr(cam_obj.data, name, cam_obj.data.bl_rna.properties[name].default)
+
+    return template
@@ -0,0 +1,131 @@
+"""Time-series rendering of meshes with constant topology in Blender."""
+
+import glob
+import logging
+import os
+from typing import Any
+
+import bpy
+import numpy as np
+
+from obscura.core.mesh_io import (
+    natural_sort_key,
+    read_points,
+    read_pvd,
+    read_surface,
+)
+from obscura.core.rendering.object_settings import (
+    create_mesh_object,
+    get_vertices,
+    update_vertices,
+)
+from obscura.core.rendering.render_settings import configure_render
+
+log = logging.getLogger("obscura")
+
+
+def time_series_files(config: Any) -> list[str]:
+    """Get the ordered mesh files of the time series.
+
+    Args:
+        config: Munch type object containing all configs for current
+        run.
+
+    Returns:
+        Paths of the mesh files of all time steps.
+    """
+
+    file_paths = []
+    for pattern in config.time_series.input_file_paths:
+        if pattern.lower().endswith(".pvd"):
+            file_paths += read_pvd(pattern)
+        else:
+            file_paths += sorted(glob.glob(pattern), key=natural_sort_key) or [pattern]
+
+    if not file_paths:
+        raise ValueError("No input files for the time series provided!")
+
+    return file_paths
+
+
+def load_time_series_mesh(
+    file_path: str,
+) -> tuple[bpy.types.Object, np.ndarray, np.ndarray | None]:
+    """Load the surface mesh of the first time step.
+
+    Args:
+        file_path: Path to the mesh file of the first time step.
+
+    Returns:
+        Blender mesh object, surface points (n, 3) of the first step and
+        the ids of the surface points within the volume mesh (None if the
+        file already is a surface).
+    """
+
+    points, triangles, point_ids = read_surface(file_path)
+    mesh_obj = create_mesh_object("TimeSeriesMesh", points, triangles)
+    return mesh_obj, points, point_ids
+
+
+def _read_time_step(file_path: str, point_ids: np.ndarray | None) -> np.ndarray:
+    """Read the surface points of one time step.
+
+    Args:
+        file_path: Path to the mesh file of the time step.
+        point_ids: Ids of the surface points within the volume mesh.
+
+    Returns:
+        Surface points (n, 3).
+    """
+
+    if point_ids is None:
+        return read_surface(file_path)[0]
+    return read_points(file_path)[point_ids]
+
+
+def render_time_series(
+    scene: bpy.types.Scene,
+    config: Any,
+    mesh_obj: bpy.types.Object,
+    file_paths: list[str],
+    first_points: np.ndarray,
+    point_ids: np.ndarray | None,
+) -> list[str]:
+    """Render all time steps by only updating the vertex coordinates.
+
+    The scene (camera, lights, material) is set up once for the first
+    time step and kept for all following steps.
+
+    Args:
+        scene: Scene to render.
+        config: Munch type object containing all configs for current
+        run.
+        mesh_obj: Mesh object of the first time step.
+        file_paths: Paths of the mesh files of all time steps.
+        first_points: Surface points of the first step as loaded.
+        point_ids: Ids of the surface points within the volume mesh to
+        map later steps onto the loaded mesh.
+
+    Returns:
+        Paths of the written images.
+    """
+
+    # shift of the vertices due to centering the origin of the mesh
+    offset = (get_vertices(mesh_obj) - first_points).mean(axis=0)
+
+    configure_render(scene, config)
+    base, ext = os.path.splitext(scene.render.filepath)
+
+    log.info(f"Rendering {len(file_paths)} time steps ...")
+
+    output_files = []
+    for index, file_path in enumerate(file_paths):
+        if index > 0:
+            points = _read_time_step(file_path, point_ids)
+            update_vertices(mesh_obj, points + offset)
+
+        scene.render.filepath = f"{base}_{index:04d}{ext}"
+        bpy.ops.render.render(write_still=True)
+        output_files.append(scene.render.filepath)
+
+    return output_files
@@ -4,7 +4,9 @@ import logging
 import time
 from typing import Any
 
-from obscura.core.rendering.rendering_pipeline import rendering_pipeline
+from obscura.core.image_io import wait_for_writes
+from obscura.core.profiling import StageProfiler
+from obscura.core.render_cache import RenderCache
 from obscura.core.utilities import RunManager
 
 log = logging.getLogger("obscura")
@@ -25,8 +27,52 @@ def run_obscura(config: Any) -> None:
     run_manager = RunManager(config)
     run_manager.init_run()
 
-    # add overall execution here
-    rendering_pipeline(config)
+    # Profiler recording timings and memory of all stages
+    profiler = StageProfiler(
+        use_cprofile=config.get("profiling", {}).get("cprofile", False)
+    )
+
+    # add overall execution here, Blender is only imported if needed
+    with profiler.profile():
+        if config.get("queue", {}).get("worker", False):
+            from obscura.core.job_queue import run_worker
+
+            run_worker(config, profiler)
+        elif config.get("queue", {}).get("mode", False):
+            from obscura.core.job_queue import run_coordinator
+
+            run_coordinator(config)
+        elif config.get("server", {}).get("mode", False):
+            from obscura.core.server import run_server
+
+            run_server(config, profiler)
+        elif config.get("parallel", {}).get("mode", False):
+            from obscura.core.parallel import run_parallel
+
+            run_parallel(config)
+        elif config.get("batch", {}).get("mode", False):
+            from obscura.core.batch import run_batch
+
+            run_batch(config, profiler)
+        else:
+            render_cache = RenderCache.from_config(config)
+            cached_files = None
+            if render_cache is not None:
+                cache_key = render_cache.key(config)
+                cached_files = render_cache.lookup(config, cache_key)
+            if cached_files is None:
+                from obscura.core.rendering.rendering_pipeline import (
+                    rendering_pipeline,
+                )
+
+                output_files = rendering_pipeline(config, profiler=profiler)
+                if render_cache is not None:
+                    wait_for_writes()  # Cache the completely written images
+                    render_cache.store(config, cache_key, output_files)
+
+        # Images may still be encoded in the background
+        wait_for_writes()
 
     # finalize run
+    run_manager.write_profile(profiler)
     run_manager.finish_run(start_time)
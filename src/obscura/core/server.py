@@ -0,0 +1,357 @@
+"""Render server keeping Blender warm and accepting jobs over HTTP."""
+
+import glob
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from obscura.core.config import merge_config
+from obscura.core.image_io import wait_for_writes
+from obscura.core.profiling import StageProfiler
+from obscura.core.rendering.rendering_pipeline import rendering_pipeline
+
+log = logging.getLogger("obscura")
+
+CONTENT_TYPES = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".webp": "image/webp",
+    ".exr": "image/x-exr",
+}
+
+# Extensions of the output file formats
+EXTENSIONS = {"PNG": ".png", "JPEG": ".jpg", "WEBP": ".webp", "OPEN_EXR": ".exr"}
+
+# Config sections a job may override, all paths are set by the server
+JOB_SECTIONS = [
+    "object_settings",
+    "background_color",
+    "material",
+    "light",
+    "camera",
+    "render",
+    "lod",
+    "scalar_field",
+    "points",
+]
+PATH_KEY_SUFFIXES = ("path", "paths", "file", "directory")
+
+# Finished jobs and profiler records kept in memory
+MAX_FINISHED_JOBS = 1000
+MAX_PROFILER_RECORDS = 10000
+
+
+def _check_overrides(overrides: dict, config: Any, path: str = "") -> None:
+    """Check that job overrides contain no paths and replace sections of
+    the config only by sections.
+
+    Args:
+        overrides: Config overrides of a job (or a section of them).
+        config: Config (or the section) the overrides are merged into.
+        path: Dotted path of the section for error messages.
+
+    Raises:
+        ValueError: If the overrides contain a path.
+        TypeError: If a section is overridden by a value.
+    """
+
+    for key, value in overrides.items():
+        key_path = f"{path}.{key}" if path else key
+        if str(key).lower().endswith(PATH_KEY_SUFFIXES):
+            raise ValueError(f"{key_path} can not be set by jobs!")
+        section = config.get(key) if isinstance(config, dict) else None
+        if not isinstance(value, dict):
+            if not path or isinstance(section, dict):
+                raise TypeError(f"{key_path} must be a section!")
+            continue
+        _check_overrides(value, section, key_path)
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """HTTP interface of the render server.
+
+    POST /jobs with a JSON config override queues a job, GET /jobs/<id>
+    returns the job status and GET /jobs/<id>/image the rendered image.
+    """
+
+    server: Any
+
+    def _send_json(self, status: int, data: dict) -> None:
+        """Send a JSON response.
+
+        Args:
+            status: HTTP status code.
+            data: Response data.
+        """
+
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:
+        """Queue a new render job."""
+
+        if self.path.rstrip("/") != "/jobs":
+            self._send_json(404, {"error": "not found"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            overrides = json.loads(self.rfile.read(length) or b"{}")
+            job = self.server.render_server.submit(overrides)
+        except (ValueError, TypeError) as error:
+            self._send_json(400, {"error": str(error)})
+            return
+        except queue.Full:
+            self._send_json(503, {"error": "job queue is full"})
+            return
+
+        self._send_json(202, job)
+
+    def do_GET(self) -> None:
+        """Return the status or the image of a job."""
+
+        parts = self.path.strip("/").split("/")
+        job = None
+        if len(parts) in (2, 3) and parts[0] == "jobs":
+            job = self.server.render_server.status(parts[1])
+        if job is None or (len(parts) == 3 and parts[2] != "image"):
+            self._send_json(404, {"error": "not found"})
+            return
+
+        if len(parts) == 2:
+            self._send_json(200, job)
+            return
+
+        if job["status"] != "done":
+            self._send_json(409, {"error": f"job is {job['status']}"})
+            return
+
+        image_path = os.path.realpath(job["output_files"][0])
+        if os.path.dirname(image_path) != self.server.render_server.job_directory:
+            self._send_json(404, {"error": "not found"})
+            return
+        with open(image_path, "rb") as file:
+            body = file.read()
+        self.send_response(200)
+        self.send_header(
+            "Content-Type",
+            CONTENT_TYPES.get(
+                os.path.splitext(image_path)[1].lower(), "application/octet-stream"
+            ),
+        )
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Log requests to the Obscura logger.
+
+        Args:
+            format: Format string of the message.
+            *args: Arguments of the format string.
+        """
+
+        log.debug(format % args)
+
+
+class RenderServer:
+    """Long-running render server.
+
+    Requests are handled by an HTTP server on localhost while jobs are
+    rendered one after another in the thread calling `serve` (Blender
+    is not thread safe), keeping the Blender session alive between
+    jobs. The number of waiting jobs is bounded by the queue size and
+    only the latest finished jobs and their output files are kept.
+
+    Jobs may only override the sections in `JOB_SECTIONS` without any
+    paths, the images are written to `<output_directory>/<sim_name>/jobs`.
+    """
+
+    def __init__(self, config: Any, profiler: StageProfiler | None = None) -> None:
+        self.config = config
+        self.profiler = profiler or StageProfiler()
+        self.jobs: dict[str, dict] = {}
+        self.finished_jobs: deque[str] = deque()
+        self.job_directory = os.path.realpath(
+            os.path.join(
+                config.general.output_directory, config.general.sim_name, "jobs"
+            )
+        )
+        self.queue: queue.Queue = queue.Queue(maxsize=config.server.max_queue_size)
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+
+        self.http_server = ThreadingHTTPServer(
+            (config.server.host, config.server.port), _RequestHandler
+        )
+        self.http_server.render_server = self  # type: ignore[attr-defined]
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """Host and port the server is listening on."""
+        return self.http_server.server_address[:2]  # type: ignore[return-value]
+
+    def submit(self, overrides: dict) -> dict:
+        """Queue a render job.
+
+        Args:
+            overrides: Config overrides of the job (same structure as
+            the YAML config).
+
+        Returns:
+            Status of the queued job.
+        """
+
+        if not isinstance(overrides, dict):
+            raise TypeError("Job must be a JSON object of config overrides!")
+        for section in overrides:
+            if section not in JOB_SECTIONS:
+                raise ValueError(f"{section} can not be set by jobs!")
+        _check_overrides(overrides, self.config)
+
+        job_id = uuid.uuid4().hex
+        job_config = merge_config(self.config, overrides)
+        file_format = (
+            job_config.get("render", {}).get("output", {}).get("file_format", "PNG")
+        )
+        if file_format not in EXTENSIONS:
+            raise ValueError(
+                f"render.output.file_format must be one of {', '.join(EXTENSIONS)}!"
+            )
+        job_config.general.output_file_path = os.path.join(
+            self.job_directory, job_id + EXTENSIONS[file_format]
+        )
+
+        job: dict[str, Any] = {
+            "id": job_id,
+            "status": "queued",
+            "output_files": [],
+            "error": None,
+            "seconds": None,
+        }
+        with self.lock:
+            self.queue.put_nowait((job_id, job_config))
+            self.jobs[job_id] = job
+
+        return dict(job)
+
+    def status(self, job_id: str) -> dict | None:
+        """Get the status of a job.
+
+        Args:
+            job_id: Id of the job.
+
+        Returns:
+            Status of the job or None if the job is unknown.
+        """
+
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def _update(self, job_id: str, **values: Any) -> None:
+        """Update the status of a job.
+
+        Args:
+            job_id: Id of the job.
+            **values: Values to update.
+        """
+
+        with self.lock:
+            self.jobs[job_id].update(values)
+
+    def _finish(self, job_id: str, **values: Any) -> None:
+        """Update the status of a finished job and forget the oldest
+        finished jobs including their output files.
+
+        Args:
+            job_id: Id of the job.
+            **values: Values to update.
+        """
+
+        forgotten_jobs = []
+        with self.lock:
+            self.jobs[job_id].update(values)
+            self.finished_jobs.append(job_id)
+            while len(self.finished_jobs) > MAX_FINISHED_JOBS:
+                forgotten_jobs.append(self.finished_jobs.popleft())
+                del self.jobs[forgotten_jobs[-1]]
+        del self.profiler.records[:-MAX_PROFILER_RECORDS]
+
+        # All output files of a job start with its id (e.g. colorbars)
+        for forgotten_job in forgotten_jobs:
+            for file_path in glob.glob(
+                os.path.join(self.job_directory, f"{forgotten_job}*")
+            ):
+                os.remove(file_path)
+
+    def serve(self) -> None:
+        """Serve requests and render queued jobs until stopped."""
+
+        http_thread = threading.Thread(
+            target=self.http_server.serve_forever, daemon=True
+        )
+        http_thread.start()
+        host, port = self.address
+        log.info(f"Render server listening on http://{host}:{port}")
+
+        num_rendered = 0
+        try:
+            while not self.stopped.is_set():
+                try:
+                    job_id, job_config = self.queue.get(timeout=0.2)
+                except queue.Empty:
+                    continue
+
+                self._update(job_id, status="running")
+                start_time = time.time()
+                self.profiler.label = job_id
+                result: dict = {"status": "done"}
+                try:
+                    result["output_files"] = rendering_pipeline(
+                        job_config,
+                        clear_only=num_rendered > 0,
+                        profiler=self.profiler,
+                    )
+                    wait_for_writes()  # Image must exist before it is served
+                except Exception as error:
+                    log.exception(f"Job {job_id} failed!")
+                    result = {"status": "failed", "error": str(error)}
+                num_rendered += 1
+                self._finish(job_id, seconds=time.time() - start_time, **result)
+                log.info(f"Job {job_id} {result['status']}.")
+        finally:
+            self.http_server.shutdown()
+            self.http_server.server_close()
+
+    def stop(self) -> None:
+        """Stop serving after the current job."""
+        self.stopped.set()
+
+
+def run_server(config: Any, profiler: StageProfiler | None = None) -> None:
+    """Run the render server until interrupted.
+
+    Args:
+        config: Munch type object containing all configs for current
+        run.
+        profiler: Profiler recording the stage timings of all jobs.
+    """
+
+    server = RenderServer(config, profiler)
+    try:
+        server.serve()
+    except KeyboardInterrupt:
+        log.info("Render server stopped.")
@@ -7,6 +7,7 @@ from typing import Any
 
 import yaml
 
+from obscura.core.profiling import StageProfiler
 from pytoda.logger import log_full_width, print_header, setup_logging
 
 log = logging.getLogger("obscura")
@@ -74,6 +75,23 @@ class RunManager:
         log.info("     ... done.")
         log.info("")
 
+    def write_profile(self, profiler: StageProfiler) -> None:
+        """Write the stage timings of the run next to the config file.
+
+        Args:
+            profiler: Profiler containing the stage timings.
+        """
+
+        log.info("Writing stage profile to file ...")
+        profiler.write(
+            os.path.join(
+                self.config.general.output_directory,
+                self.config.general.sim_name,
+            )
+        )
+        log.info("     ... done.")
+        log.info("")
+
     def finish_run(self, start_time: float) -> None:
         """Finish run and close all loggers (Important if module is used within
         other modules including a Python Logger!)
@@ -0,0 +1,292 @@
+"""Validation of Obscura configs without Blender."""
+
+import glob
+from typing import Any
+
+from obscura.core.batch import expand_jobs
+
+NUMBER = (int, float)
+ENGINES = ["BLENDER_EEVEE", "BLENDER_EEVEE_NEXT", "BLENDER_WORKBENCH", "CYCLES", "AUTO"]
+WORKBENCH_LIGHTING = ["STUDIO", "MATCAP", "FLAT"]
+CAMERA_TYPES = ["PERSP", "ORTHO"]
+FILE_FORMATS = ["PNG", "JPEG", "WEBP", "OPEN_EXR"]
+LOADERS = ["stl", "stl_welded", "vtk", "vtk_streaming", "points"]
+ASSOCIATIONS = ["point", "cell"]
+COLORMAPS = ["viridis", "coolwarm", "rainbow", "grayscale"]
+
+# Required entries and their types, sections with a mode flag only
+# require their other entries if the mode is active
+SCHEMA: dict = {
+    "general": {
+        "output_directory": str,
+        "sim_name": str,
+        "log_file": str,
+        "log_to_console": bool,
+        "input_file_path": str,
+        "output_file_path": str,
+    },
+    "object_settings": {"mesh_scale": list, "mesh_location": list, "rotation": list},
+    "background_color": list,
+    "material": {
+        "material_color": list,
+        "material_roughness": NUMBER,
+        "material_metallic": NUMBER,
+    },
+    "light": {
+        "key_light_intensity": NUMBER,
+        "fill_light_intensity": NUMBER,
+        "ambient_light_strength": NUMBER,
+    },
+    "camera": {
+        "lens": NUMBER,
+        "type": str,
+    },
+    "render": {
+        "preview": {
+            "mode": bool,
+            "resolution_x": int,
+            "resolution_y": int,
+            "engine": str,
+            "samples": int,
+            "use_denoising": bool,
+        },
+        "resolution_x": int,
+        "resolution_y": int,
+        "engine": str,
+        "samples": int,
+    },
+}
+
+# Render settings which are only read if used
+THUMBNAIL_SCHEMA: dict = {
+    "resolution_x": int,
+    "resolution_y": int,
+    "engine": str,
+    "samples": int,
+}
+AUTO_SCHEMA: dict = {"max_seconds": NUMBER, "cost_model": dict}
+
+# Sections (dotted paths for nested ones) which are only read if present
+OPTIONAL_SCHEMA: dict = {
+    "time_series": {"mode": bool, "input_file_paths": list},
+    "mesh_cache": {"mode": bool, "directory": str, "max_size_mb": NUMBER},
+    "lod": {"mode": bool, "target_triangles": int, "triangles_per_pixel": NUMBER},
+    "scene_template": {"mode": bool},
+    "scalar_field": {
+        "mode": bool,
+        "array_name": str,
+        "association": str,
+        "colormap": str,
+        "colorbar": bool,
+    },
+    "material_library": {"mode": bool, "max_materials": int},
+    "camera.framing": {"mode": bool, "fill_fraction": NUMBER},
+    "camera.multi_view": {
+        "mode": bool,
+        "turntable_count": int,
+        "azimuths": list,
+        "elevations": list,
+        "use_animation": bool,
+    },
+    "render.progressive": {"mode": bool},
+    "render.tiles": {"mode": bool, "tile_size": int, "overlap": int},
+    "streaming": {"num_pieces": int},
+    "stl_welding": {"tolerance": NUMBER},
+    "points": {"radius": NUMBER, "radius_array": str, "subdivisions": int},
+    "batch": {"mode": bool, "input_file_paths": list, "jobs": list},
+    "parallel": {"mode": bool, "num_workers": int, "threads_per_worker": int},
+    "server": {"mode": bool, "host": str, "port": int, "max_queue_size": int},
+    "render_cache": {
+        "mode": bool,
+        "directory": str,
+        "max_size_mb": NUMBER,
+        "force": bool,
+    },
+    "queue": {
+        "mode": bool,
+        "directory": str,
+        "lease_seconds": NUMBER,
+        "heartbeat_seconds": NUMBER,
+        "max_attempts": int,
+        "poll_seconds": NUMBER,
+    },
+}
+
+
+def _check_type(value: Any, expected: type | tuple) -> bool:
+    """Check the type of a config value (booleans are no numbers).
+
+    Args:
+        value: Config value.
+        expected: Expected type(s).
+
+    Returns:
+        True if the value has the expected type.
+    """
+
+    if isinstance(value, bool):
+        return expected is bool
+    return isinstance(value, expected)
+
+
+def _validate_section(config: Any, schema: dict, path: str) -> list[str]:
+    """Validate the entries of a config section against the schema.
+
+    Args:
+        config: Config section.
+        schema: Schema of the section.
+        path: Dotted path of the section for error messages.
+
+    Returns:
+        Error messages.
+    """
+
+    if not isinstance(config, dict):
+        return [f"{path} must be a section!"]
+    if "mode" in schema and not config.get("mode", False):
+        schema = {"mode": bool}
+
+    errors = []
+    for key, expected in schema.items():
+        key_path = f"{path}.{key}" if path else key
+        if key not in config:
+            errors.append(f"{key_path} is missing!")
+        elif isinstance(expected, dict):
+            errors += _validate_section(config[key], expected, key_path)
+        elif not _check_type(config[key], expected):
+            errors.append(f"{key_path} has an invalid type!")
+    return errors
+
+
+def _lookup(config: Any, path: str) -> Any:
+    """Get a config value by its dotted path.
+
+    Args:
+        config: Config.
+        path: Dotted path of the value.
+
+    Returns:
+        Config value, None if it is missing.
+    """
+
+    value: Any = config
+    for key in path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def _check_choice(config: Any, path: str, choices: list[str]) -> list[str]:
+    """Check that a config value is one of the given choices.
+
+    Args:
+        config: Config.
+        path: Dotted path of the value.
+        choices: Valid values.
+
+    Returns:
+        Error messages.
+    """
+
+    value = _lookup(config, path)
+    if value is None:
+        return []  # missing entries are reported by the schema
+
+    if value not in choices:
+        return [f"{path} must be one of {', '.join(choices)}!"]
+    return []
+
+
+def validate_config(config: Any) -> list[str]:
+    """Validate the config and check that all input files exist.
+
+    Args:
+        config: Munch type object containing all configs for current
+        run.
+
+    Returns:
+        Error messages, empty if the config is valid.
+    """
+
+    errors = _validate_section(config, SCHEMA, "")
+    for section, schema in OPTIONAL_SCHEMA.items():
+        value = _lookup(config, section)
+        if value is not None:
+            errors += _validate_section(value, schema, section)
+    if errors:
+        return errors
+
+    time_series = config.get("time_series", {}).get("mode", False)
+    mesh_cache = config.get("mesh_cache", {}).get("mode", False)
+    scalar_field = config.get("scalar_field", {}).get("mode", False)
+
+    errors += _check_choice(config, "general.loader", LOADERS)
+    errors += _check_choice(config, "camera.type", CAMERA_TYPES)
+    errors += _check_choice(config, "render.engine", ENGINES)
+    if config.render.preview.mode:
+        errors += _check_choice(config, "render.preview.engine", ENGINES)
+    errors += _check_choice(config, "render.output.file_format", FILE_FORMATS)
+    errors += _check_choice(config, "render.workbench.lighting", WORKBENCH_LIGHTING)
+    thumbnail = config.render.get("thumbnail", {})
+    if thumbnail.get("mode", False):
+        errors += _validate_section(thumbnail, THUMBNAIL_SCHEMA, "render.thumbnail")
+        errors += _check_choice(config, "render.thumbnail.engine", ENGINES)
+        if config.render.get("progressive", {}).get("mode", False):
+            errors.append("render.thumbnail does not support render.progressive!")
+        engines = [thumbnail.get("engine")]
+    else:
+        engines = [config.render.engine, config.render.preview.get("engine")]
+    if (
+        scalar_field
+        and config.general.get("loader") == "points"
+        and "BLENDER_WORKBENCH" in engines
+    ):
+        errors.append("BLENDER_WORKBENCH can not color point clouds by scalar_field!")
+    if "AUTO" in engines:
+        errors += _validate_section(
+            config.render.get("auto"), AUTO_SCHEMA, "render.auto"
+        )
+    if scalar_field:
+        errors += _check_choice(config, "scalar_field.association", ASSOCIATIONS)
+        errors += _check_choice(config, "scalar_field.colormap", COLORMAPS)
+        if config.general.get("loader") not in ("vtk", "points"):
+            errors.append("scalar_field requires general.loader vtk or points!")
+        elif (
+            config.general.loader == "points"
+            and config.scalar_field.association != "point"
+        ):
+            errors.append("scalar_field of point clouds requires association point!")
+        elif time_series or mesh_cache:
+            # both load the surface without the result field
+            errors.append("scalar_field supports neither time_series nor mesh_cache!")
+    tiles = config.render.get("tiles", {}).get("mode", False)
+    if tiles and config.render.get("budget", {}).get("mode", False):
+        # the probe would render the full frame and the limit apply per tile
+        errors.append("render.tiles does not support render.budget!")
+    material_library = config.get("material_library", {})
+    if material_library.get("mode", False) and material_library.max_materials < 1:
+        errors.append("material_library.max_materials must be at least 1!")
+    if config.general.get("loader") == "points":
+        if "points" not in config:
+            errors.append("points is missing!")
+        if time_series or mesh_cache:
+            errors.append("Point clouds support neither time_series nor mesh_cache!")
+
+    # input files
+    if time_series:
+        input_file_paths = list(config.time_series.input_file_paths)
+    elif config.get("batch", {}).get("mode", False):
+        try:
+            jobs = expand_jobs(config)
+        except OSError as error:
+            return errors + [f"Batch manifest can not be read: {error}"]
+        input_file_paths = [job.general.input_file_path for job in jobs]
+    else:
+        input_file_paths = [config.general.input_file_path]
+
+    for input_file_path in input_file_paths:
+        if not glob.glob(input_file_path):
+            errors.append(f"Input file {input_file_path} not found!")
+
+    return errors
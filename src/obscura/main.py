@@ -6,14 +6,19 @@ import os
 import yaml
 from munch import munchify
 
-from obscura.core.run import run_obscura
+from obscura.core.config import merge_config
+from obscura.core.validation import validate_config
 
 
 def main() -> None:
     """Call Obscura runner with config.
 
+    Blender and VTK are only imported once a run is executed, so
+    validating a config is fast.
+
     Raises:
-        RuntimeError: If provided config is not a valid file.
+        RuntimeError: If provided config is not a valid file or does not
+        pass the validation.
     """
 
     parser = argparse.ArgumentParser(description="Execute Obscura")
@@ -24,6 +29,22 @@ def main() -> None:
         type=str,
         required=True,
     )
+    parser.add_argument(
+        "--validate",
+        "--dry-run",
+        help="Only validate the config and input files without rendering.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--force",
+        help="Render all jobs even if their images are in the render cache.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--worker",
+        help="Claim and render jobs of the queue directory of the config.",
+        action="store_true",
+    )
     args = parser.parse_args()
 
     if not os.path.isfile(args.config_file_path):
@@ -33,7 +54,23 @@ def main() -> None:
     with open(args.config_file_path, "r") as file:
         config = munchify(yaml.safe_load(file))
 
+    if args.validate:
+        errors = validate_config(config)
+        for error in errors:
+            print(error)
+        if errors:
+            raise RuntimeError(f"Config is invalid ({len(errors)} errors)!")
+        print("Config is valid.")
+        return
+
+    if args.force:
+        config = merge_config(config, {"render_cache": {"force": True}})
+    if args.worker:
+        config = merge_config(config, {"queue": {"worker": True}})
+
     # execute obscura
+    from obscura.core.run import run_obscura
+
     run_obscura(config)
 
 
@@ -0,0 +1,46 @@
+"""Shared fixtures of the core tests."""
+
+from pathlib import Path
+
+import pytest
+from munch import Munch, munchify
+
+
+@pytest.fixture
+def cache_config(tmp_path: Path) -> Munch:
+    """Create a minimal config with an input file and the settings of the
+    mesh and render cache.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+
+    Returns:
+        Munch type config.
+    """
+
+    input_file_path = tmp_path / "mesh.stl"
+    input_file_path.write_bytes(b"solid mesh")
+    return munchify(
+        {
+            "general": {
+                "log_file": "obscura.log",
+                "input_file_path": str(input_file_path),
+                "output_file_path": str(tmp_path / "out" / "render.png"),
+                "loader": "stl",
+            },
+            "object_settings": {
+                "mesh_scale": [1, 1, 1],
+                "mesh_location": [0, 0, 0],
+                "rotation": [0, 0, 90],
+            },
+            "time_series": {"mode": False},
+            "material": {"material_roughness": 0.5},
+            "mesh_cache": {"directory": str(tmp_path / "meshes"), "max_size_mb": 1},
+            "lod": {"mode": False},
+            "render_cache": {
+                "mode": True,
+                "directory": str(tmp_path / "renders"),
+                "max_size_mb": 1,
+            },
+        }
+    )
@@ -0,0 +1,98 @@
+"""Test automatic camera framing."""
+
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from obscura.core.rendering.camera import (
+    DEFAULT_AZIMUTH,
+    DEFAULT_ELEVATION,
+    orbit_location,
+)
+from obscura.core.rendering.framing import FramingEngine, frame_points, view_basis
+
+# slender, off-center bar
+POINTS = np.array(
+    [[x, y, z] for x in (2.0, 12.0) for y in (0.0, 0.5) for z in (0.0, 0.5)]
+)
+
+
+def _project(points: np.ndarray, location: np.ndarray, basis: np.ndarray) -> np.ndarray:
+    """Project points onto the image plane of a perspective camera.
+
+    Args:
+        points: Points (n, 3).
+        location: Camera location.
+        basis: Camera axes.
+
+    Returns:
+        Tangents (n, 2) of the points in x- and y-direction.
+    """
+
+    local = (points - location) @ basis
+    return local[:, :2] / -local[:, 2:]
+
+
+def test_view_basis() -> None:
+    """Test that the camera axes are orthonormal and look at the center."""
+
+    for azimuth, elevation in [(DEFAULT_AZIMUTH, DEFAULT_ELEVATION), (30, 90)]:
+        basis = view_basis(azimuth, elevation)
+
+        np.testing.assert_allclose(basis.T @ basis, np.eye(3), atol=1e-12)
+        assert np.isclose(np.linalg.det(basis), 1.0)
+        np.testing.assert_allclose(
+            basis[:, 2], orbit_location(np.zeros(3), 1.0, azimuth, elevation)
+        )
+
+
+def test_frame_points_perspective() -> None:
+    """Test that the points fill the frustum tightly."""
+
+    basis = view_basis(DEFAULT_AZIMUTH, DEFAULT_ELEVATION)
+
+    location, ortho_scale = frame_points(POINTS, basis, 0.4, 0.25, False)
+
+    tangents = _project(POINTS, location, basis)
+    assert ortho_scale == 0.0
+    assert np.all(np.abs(tangents[:, 0]) <= 0.4 + 1e-9)
+    assert np.all(np.abs(tangents[:, 1]) <= 0.25 + 1e-9)
+    # slender bar touches the left and right border
+    assert np.isclose(tangents[:, 0].max(), 0.4)
+    assert np.isclose(tangents[:, 0].min(), -0.4)
+
+
+def test_frame_points_orthographic() -> None:
+    """Test that the ortho scale fits the projected width."""
+
+    basis = view_basis(-90, 0)
+
+    location, ortho_scale = frame_points(POINTS, basis, 0.45, 0.3, True)
+
+    # 10 units wide bar filling 90 % of the frame width
+    assert np.isclose(ortho_scale, 10 / 0.9)
+    np.testing.assert_allclose(location[[0, 2]], [7.0, 0.25])
+    assert location[1] < POINTS[:, 1].min()
+
+
+def test_framing_engine_apply() -> None:
+    """Test camera placement for views of a multi-view render."""
+
+    engine = FramingEngine(POINTS, fill_fraction=0.8, aspect=2.0)
+    mock_cam = MagicMock()
+    mock_cam.data.type = "PERSP"
+    mock_cam.data.sensor_width = 36.0
+    mock_cam.data.lens = 50.0
+    mock_cam.data.clip_start = 0.1
+    mock_cam.data.clip_end = 1.0
+
+    for azimuth in [-90, 0]:
+        engine.apply(mock_cam, azimuth, 30)
+
+        location = np.array(mock_cam.location)
+        tangents = _project(POINTS, location, view_basis(azimuth, 30))
+        half_width = 0.5 * 36.0 / 50.0
+        assert np.all(np.abs(tangents[:, 0]) <= 0.8 * half_width + 1e-9)
+        assert np.all(np.abs(tangents[:, 1]) <= 0.8 * half_width / 2 + 1e-9)
+        mock_cam.constraints.clear.assert_called()
+        assert mock_cam.data.clip_end > np.linalg.norm(POINTS - location, axis=1).max()
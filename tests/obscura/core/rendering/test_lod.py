@@ -0,0 +1,65 @@
+"""Test level of detail reduction."""
+
+from unittest.mock import MagicMock, patch
+
+import bpy
+from munch import munchify
+
+from obscura.core.rendering.lod import count_triangles, decimate_mesh, target_triangles
+
+
+def _config(target: int, preview: bool) -> object:
+    """Create a config with LOD and render settings.
+
+    Args:
+        target: Explicit triangle budget.
+        preview: Whether preview mode is active.
+
+    Returns:
+        Munch type config.
+    """
+
+    return munchify(
+        {
+            "lod": {"mode": True, "target_triangles": target, "triangles_per_pixel": 2},
+            "render": {
+                "resolution_x": 200,
+                "resolution_y": 100,
+                "preview": {"mode": preview, "resolution_x": 20, "resolution_y": 10},
+            },
+        }
+    )
+
+
+def test_target_triangles() -> None:
+    """Test explicit and resolution derived triangle budgets."""
+
+    assert target_triangles(_config(1000, False)) == 1000
+    assert target_triangles(_config(0, False)) == 40000
+    assert target_triangles(_config(0, True)) == 400
+
+
+def test_decimate_mesh_within_budget() -> None:
+    """Test that meshes within the budget are not decimated."""
+
+    mock_mesh_obj = MagicMock()
+    with patch("obscura.core.rendering.lod.count_triangles", return_value=1000):
+        decimate_mesh(mock_mesh_obj, _config(1000, False))
+
+    mock_mesh_obj.modifiers.new.assert_not_called()
+
+
+def test_decimate_mesh() -> None:
+    """Test decimation of a subdivided sphere to the triangle budget."""
+
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    bpy.ops.mesh.primitive_ico_sphere_add(subdivisions=5)
+    mesh_obj = bpy.context.active_object
+    original_name = mesh_obj.data.name
+    assert count_triangles(mesh_obj.data) == 5120
+
+    decimate_mesh(mesh_obj, _config(1000, False))
+
+    assert 0 < count_triangles(mesh_obj.data) <= 1000
+    assert len(mesh_obj.modifiers) == 0
+    assert original_name not in bpy.data.meshes
@@ -0,0 +1,115 @@
+"""Test material library."""
+
+from unittest.mock import MagicMock, patch
+
+from munch import munchify
+
+from obscura.core.rendering.material import (
+    LAST_USED_PROPERTY,
+    LIBRARY_PROPERTY,
+    library_material,
+    material_key,
+)
+
+
+class _Material(dict):
+    """Material data block with custom properties."""
+
+    def __init__(self, name: str) -> None:
+        super().__init__()
+        self.name = name
+        self.users = 0
+        self.node_tree = MagicMock()
+
+
+def _config(roughness: float) -> object:
+    """Create a config with material settings.
+
+    Args:
+        roughness: Roughness of the material.
+
+    Returns:
+        Munch type config.
+    """
+
+    return munchify(
+        {
+            "material": {
+                "material_color": [0.1, 0.2, 0.3, 1],
+                "material_roughness": roughness,
+                "material_metallic": 0.0,
+            },
+            "material_library": {"mode": True, "max_materials": 2},
+        }
+    )
+
+
+def test_material_key() -> None:
+    """Test that equal settings share a key."""
+
+    assert material_key(_config(0.5)) == material_key(_config(0.5))
+    assert material_key(_config(0.5)) != material_key(_config(0.1))
+
+
+def test_library_material() -> None:
+    """Test reuse of library materials and purging of unused ones."""
+
+    materials: list = [_Material("MeshMaterial")]  # orphan from a previous job
+
+    with (
+        patch("obscura.core.rendering.material.bpy") as mock_bpy,
+        patch("obscura.core.rendering.material.time.time", side_effect=range(10)),
+    ):
+
+        def _new(name: str) -> _Material:
+            """Create a material data block.
+
+            Args:
+                name: Name of the material.
+
+            Returns:
+                New material.
+            """
+
+            materials.append(_Material(name))
+            return materials[-1]
+
+        def _batch_remove(data_blocks: list) -> None:
+            """Remove material data blocks.
+
+            Args:
+                data_blocks: Materials to remove.
+            """
+
+            for data_block in data_blocks:
+                materials.remove(data_block)
+
+        mock_bpy.data.batch_remove.side_effect = _batch_remove
+        mock_materials = MagicMock()
+        mock_materials.__iter__.side_effect = lambda: iter(list(materials))
+        mock_materials.new.side_effect = _new
+        mock_bpy.data.materials = mock_materials
+
+        first = library_material(_config(0.5))
+        assert library_material(_config(0.5)) is first
+        assert materials == [first]  # orphan purged
+        assert mock_materials.new.call_count == 1
+        assert first[LIBRARY_PROPERTY] == material_key(_config(0.5))
+        assert first[LAST_USED_PROPERTY] == 1
+
+        # least recently used materials are purged above the library size
+        second = library_material(_config(0.1))
+        third = library_material(_config(0.2))
+        assert materials == [second, third]
+
+        # materials in use are kept
+        second.users = 1
+        fourth = library_material(_config(0.3))
+        assert materials == [second, fourth]
+
+        # the returned material is kept even without library space
+        second.users = 0
+        config = _config(0.4)
+        config.material_library.max_materials = 0
+        fifth = library_material(config)
+        assert materials == [fifth]
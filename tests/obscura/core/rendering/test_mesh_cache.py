@@ -0,0 +1,151 @@
+"""Test mesh cache."""
+
+import os
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from munch import Munch, munchify
+
+from obscura.core.rendering.mesh_cache import MeshCache, load_cached_mesh
+
+
+def test_mesh_cache_store_load_evict(cache_config: Munch) -> None:
+    """Test storing, loading and LRU eviction of cached meshes.
+
+    Args:
+        cache_config (Munch): Config with an input file from the fixture.
+    """
+
+    config = cache_config
+    cache = MeshCache(config.mesh_cache.directory, 1)
+
+    key = cache.key(config)
+    config.object_settings.rotation = [0, 0, 0]
+    assert cache.key(config) != key
+    # settings of the loader change the mesh
+    config.general.loader = "stl_welded"
+    config.stl_welding = munchify({"tolerance": 1e-6})
+    welded_key = cache.key(config)
+    config.stl_welding.tolerance = 1e-3
+    assert cache.key(config) != welded_key
+    config.general.loader = "stl"
+    assert cache.load(key) is None
+
+    vertices = np.arange(9, dtype=np.float32).reshape(3, 3)
+    triangles = np.array([[0, 1, 2]])
+    cache.store(key, vertices, triangles, [1.0, 2.0, 3.0])
+
+    mesh = cache.load(key)
+    np.testing.assert_array_equal(mesh["vertices"], vertices)
+    np.testing.assert_array_equal(mesh["triangles"], triangles)
+    assert mesh["location"] == [1.0, 2.0, 3.0]
+
+    # entries above the maximum size evict the least recently used ones
+    large_vertices = np.zeros((2**16, 3), dtype=np.float32)
+    cache.store("old", large_vertices, triangles, [0, 0, 0])
+    os.utime(os.path.join(cache.directory, "old"), (0, 0))
+    cache.store("new", large_vertices, triangles, [0, 0, 0])
+
+    assert cache.load("old") is None
+    assert cache.load("new") is not None
+    assert cache.load(key) is not None
+
+
+def test_load_cached_mesh_hit(cache_config: Munch) -> None:
+    """Test that a cache hit skips loading and transforming the mesh.
+
+    Args:
+        cache_config (Munch): Config with an input file from the fixture.
+    """
+
+    config = cache_config
+    cache = MeshCache(config.mesh_cache.directory, 1)
+    vertices = np.zeros((3, 3), dtype=np.float32)
+    cache.store(cache.key(config), vertices, np.array([[0, 1, 2]]), [1, 2, 3])
+
+    mock_mesh_obj = MagicMock()
+    with (
+        patch(
+            "obscura.core.rendering.mesh_cache.create_mesh_object",
+            return_value=mock_mesh_obj,
+        ) as mock_create_mesh_object,
+        patch("obscura.core.rendering.mesh_cache.load_mesh") as mock_load_mesh,
+        patch(
+            "obscura.core.rendering.mesh_cache.apply_transforms"
+        ) as mock_apply_transforms,
+    ):
+        mesh_obj = load_cached_mesh(config)
+
+    assert mesh_obj == mock_mesh_obj
+    assert mock_create_mesh_object.call_args[0][0] == "mesh"
+    mock_load_mesh.assert_not_called()
+    mock_apply_transforms.assert_not_called()
+    assert mock_mesh_obj.location == [1, 2, 3]
+    np.testing.assert_allclose(mock_mesh_obj.rotation_euler, [0, 0, np.pi / 2])
+
+
+def test_mesh_cache_concurrent_eviction(tmp_path: Path) -> None:
+    """Test that partially evicted entries are misses and temporary
+    entries of crashed processes are removed.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    cache = MeshCache(str(tmp_path / "cache"), 1)
+    cache.store("key", np.zeros((3, 3)), np.array([[0, 1, 2]]), [0, 0, 0])
+    os.remove(os.path.join(cache.directory, "key", "vertices.npy"))
+    assert cache.load("key") is None
+
+    orphan = tmp_path / "cache" / ".tmp_orphan"
+    fresh = tmp_path / "cache" / ".tmp_fresh"
+    orphan.mkdir()
+    fresh.mkdir()
+    os.utime(orphan, (0, 0))
+    cache.evict()
+
+    assert not orphan.exists()
+    assert fresh.exists()
+
+
+def test_mesh_cache_key_hashes_once(cache_config: Munch) -> None:
+    """Test that the input file is only hashed again once it changes.
+
+    Args:
+        cache_config (Munch): Config with an input file from the fixture.
+    """
+
+    config = cache_config
+    cache = MeshCache(config.mesh_cache.directory, 1)
+
+    with patch("obscura.core.hashing.file_hash", return_value="hash") as mock_file_hash:
+        key = cache.key(config)
+        assert cache.key(config) == key
+        assert mock_file_hash.call_count == 1
+
+        os.utime(config.general.input_file_path, (0, 0))
+        cache.key(config)
+        assert mock_file_hash.call_count == 2
+
+
+def test_mesh_cache_key_pvtu_pieces(tmp_path: Path, cache_config: Munch) -> None:
+    """Test that changed pieces of a .pvtu file change the key.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+        cache_config (Munch): Config with an input file from the fixture.
+    """
+
+    config = cache_config
+    config.general.update(input_file_path=str(tmp_path / "mesh.pvtu"), loader="vtk")
+    (tmp_path / "mesh.pvtu").write_text(
+        '<VTKFile type="PUnstructuredGrid"><PUnstructuredGrid>'
+        '<Piece Source="mesh_0.vtu"/></PUnstructuredGrid></VTKFile>'
+    )
+    (tmp_path / "mesh_0.vtu").write_text("piece 0")
+    cache = MeshCache(config.mesh_cache.directory, 1)
+    key = cache.key(config)
+
+    (tmp_path / "mesh_0.vtu").write_text("changed piece 0")
+    assert cache.key(config) != key
@@ -0,0 +1,104 @@
+"""Test multi-view rendering."""
+
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from munch import munchify
+
+from obscura.core.rendering.camera import (
+    DEFAULT_AZIMUTH,
+    DEFAULT_DISTANCE_FACTOR,
+    DEFAULT_ELEVATION,
+    orbit_location,
+)
+from obscura.core.rendering.multi_view import camera_views, render_views
+
+
+def _config(**multi_view: object) -> object:
+    """Create a config with the given multi-view settings.
+
+    Args:
+        **multi_view: Settings of the multi-view section.
+
+    Returns:
+        Munch type config.
+    """
+
+    return munchify(
+        {
+            "camera": {
+                "multi_view": {
+                    "mode": True,
+                    "turntable_count": 0,
+                    "azimuths": [-90],
+                    "elevations": [30],
+                    **multi_view,
+                }
+            }
+        }
+    )
+
+
+def test_camera_views() -> None:
+    """Test views from azimuth/elevation lists and turntable count."""
+
+    assert camera_views(_config(azimuths=[0, 90], elevations=[10])) == [
+        (0, 10),
+        (90, 10),
+    ]
+    assert camera_views(_config(azimuths=[0, 90], elevations=[10, 20])) == [
+        (0, 10),
+        (90, 20),
+    ]
+    assert camera_views(_config(turntable_count=4, azimuths=[-90])) == [
+        (-90.0, 30),
+        (0.0, 30),
+        (90.0, 30),
+        (180.0, 30),
+    ]
+
+    with pytest.raises(ValueError, match="Number of elevations"):
+        camera_views(_config(azimuths=[0, 90, 180], elevations=[10, 20]))
+
+
+def test_orbit_location_default_view() -> None:
+    """Test that the default view matches the default camera offset."""
+
+    center = np.array([1.0, 2.0, 3.0])
+    max_extent = 2.0
+
+    location = orbit_location(
+        center, DEFAULT_DISTANCE_FACTOR * max_extent, DEFAULT_AZIMUTH, DEFAULT_ELEVATION
+    )
+
+    np.testing.assert_allclose(
+        location, center + [0, -2 * max_extent, max_extent], atol=1e-12
+    )
+
+
+def test_render_views_animation() -> None:
+    """Test that views rendered as animation restore the file extension
+    setting, also if the render fails."""
+
+    mock_scene = MagicMock()
+    mock_scene.render.filepath = "/fake/render.png"
+    mock_scene.render.use_file_extension = True
+    mock_scene.render.frame_path.side_effect = lambda frame: f"/fake/{frame}.png"
+    config = _config(azimuths=[0, 90], use_animation=True)
+
+    with (
+        patch("obscura.core.rendering.multi_view.bpy") as mock_bpy,
+        patch("obscura.core.rendering.multi_view.configure_render"),
+    ):
+        output_files = render_views(mock_scene, config, MagicMock(), np.zeros(3), 1.0)
+
+        assert output_files == ["/fake/1.png", "/fake/2.png"]
+        assert mock_scene.render.filepath == "/fake/render_view####.png"
+        mock_bpy.ops.render.render.assert_called_once_with(animation=True)
+        assert mock_scene.render.use_file_extension
+
+        mock_bpy.ops.render.render.side_effect = RuntimeError("render failed")
+        with pytest.raises(RuntimeError, match="render failed"):
+            render_views(mock_scene, config, MagicMock(), np.zeros(3), 1.0)
+        assert mock_scene.render.use_file_extension
@@ -0,0 +1,57 @@
+"""Test object settings."""
+
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from munch import munchify
+
+from obscura.core.rendering.object_settings import load_mesh
+
+
+def test_load_mesh_loaders() -> None:
+    """Test that the configured mesh loader is used."""
+
+    points = np.zeros((3, 3), dtype=np.float32)
+    triangles = np.array([[0, 1, 2]])
+    config = munchify(
+        {"general": {"input_file_path": "/fake/mesh.vtu", "loader": "vtk"}}
+    )
+
+    with (
+        patch("obscura.core.rendering.object_settings.bpy") as mock_bpy,
+        patch(
+            "obscura.core.rendering.object_settings.read_surface",
+            return_value=(points, triangles, None),
+        ) as mock_read_surface,
+        patch(
+            "obscura.core.rendering.object_settings.create_mesh_object"
+        ) as mock_create_mesh_object,
+    ):
+        mesh_obj = load_mesh(config)
+
+        mock_read_surface.assert_called_once_with("/fake/mesh.vtu")
+        mock_create_mesh_object.assert_called_once_with("mesh", points, triangles)
+        assert mesh_obj == mock_create_mesh_object.return_value
+        mock_bpy.ops.wm.stl_import.assert_not_called()
+
+        config.general.loader = "stl_welded"
+        with patch(
+            "obscura.core.rendering.object_settings.read_stl_welded",
+            return_value=(points, triangles),
+        ) as mock_read_stl_welded:
+            load_mesh(config)
+
+        mock_read_stl_welded.assert_called_once_with("/fake/mesh.vtu", 1e-6)
+        mock_create_mesh_object.assert_called_with("mesh", points, triangles)
+
+        config.general.loader = "stl"
+        mock_bpy.context.selected_objects = [MagicMock()]
+        mesh_obj = load_mesh(config)
+
+        mock_bpy.ops.wm.stl_import.assert_called_once_with(filepath="/fake/mesh.vtu")
+        assert mesh_obj == mock_bpy.context.selected_objects[0]
+
+        config.general.loader = "obj"
+        with pytest.raises(ValueError, match="Mesh loader obj is not supported!"):
+            load_mesh(config)
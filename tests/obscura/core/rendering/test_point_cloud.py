@@ -0,0 +1,117 @@
+"""Test point cloud rendering."""
+
+from pathlib import Path
+
+import bpy
+import numpy as np
+from munch import munchify
+
+from obscura.core.rendering.point_cloud import (
+    NODE_GROUP_NAME,
+    RADIUS_ATTRIBUTE,
+    load_point_cloud,
+    set_sphere_material,
+)
+from obscura.core.rendering.render_settings import render_result_pixels
+
+
+def _load_points(tmp_path: Path) -> bpy.types.Object:
+    """Load a point cloud of three points with a radius array into an
+    empty scene.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+
+    Returns:
+        Mesh object of the points.
+    """
+
+    file_path = tmp_path / "points.npz"
+    np.savez(
+        file_path,
+        points=np.array([[-1.0, 0.0, 0.0], [0.0, 0.0, 0.0], [1.0, 0.0, 0.0]]),
+        size=np.array([1.0, 2.0, 3.0]),
+    )
+    config = munchify(
+        {
+            "general": {"input_file_path": str(file_path)},
+            "points": {"radius": 0.1, "radius_array": "size", "subdivisions": 2},
+        }
+    )
+
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    return load_point_cloud(config)
+
+
+def test_load_point_cloud(tmp_path: Path) -> None:
+    """Test the points, radii, instancing node tree and sphere material.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    mesh_obj = _load_points(tmp_path)
+
+    assert len(mesh_obj.data.vertices) == 3
+    assert len(mesh_obj.data.polygons) == 0
+    radii = np.zeros(3, dtype=np.float32)
+    mesh_obj.data.attributes[RADIUS_ATTRIBUTE].data.foreach_get("value", radii)
+    np.testing.assert_allclose(radii, [0.1, 0.2, 0.3], rtol=1e-6)
+
+    node_group = mesh_obj.modifiers["PointSpheres"].node_group
+    assert node_group.name == NODE_GROUP_NAME
+    assert node_group.bl_idname == "GeometryNodeTree"
+    instance = next(
+        node
+        for node in node_group.nodes
+        if node.bl_idname == "GeometryNodeInstanceOnPoints"
+    )
+    assert instance.inputs["Points"].links[0].from_node.bl_idname == "NodeGroupInput"
+    assert (
+        instance.inputs["Scale"].links[0].from_node.inputs["Name"].default_value
+        == RADIUS_ATTRIBUTE
+    )
+    assert (
+        instance.inputs["Instance"].links[0].from_node.bl_idname
+        == "GeometryNodeSetMaterial"
+    )
+
+    material = bpy.data.materials.new("SphereMaterial")
+    set_sphere_material(mesh_obj, material)
+    assert node_group.nodes["Set Material"].inputs["Material"].default_value == material
+
+    # one ico sphere of 42 vertices is instanced on every point
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    evaluated = mesh_obj.evaluated_get(depsgraph)
+    sphere_vertices = [
+        len(instance.object.data.vertices)
+        for instance in depsgraph.object_instances
+        if instance.is_instance and instance.parent == evaluated
+    ]
+    assert sphere_vertices == [42, 42, 42]
+
+
+def test_render_point_cloud(tmp_path: Path) -> None:
+    """Test that the spheres of a point cloud are rendered.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    _load_points(tmp_path)
+    bpy.ops.object.camera_add(location=(0, -4, 0), rotation=(np.pi / 2, 0, 0))
+    scene = bpy.context.scene
+    scene.camera = bpy.data.objects["Camera"]
+    scene.render.engine = "BLENDER_WORKBENCH"
+    scene.render.film_transparent = True
+    scene.render.resolution_x = 32
+    scene.render.resolution_y = 24
+    scene.render.resolution_percentage = 100
+    scene.render.image_settings.color_mode = "RGBA"
+
+    bpy.ops.render.render()
+    pixels = render_result_pixels(scene)
+
+    assert pixels.shape == (24, 32, 4)
+    assert np.count_nonzero(pixels[:, :, 3]) > 0
+    assert np.count_nonzero(pixels[:, :, 3] == 0) > 0
@@ -0,0 +1,373 @@
+"""Test render settings."""
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import bpy
+import numpy as np
+import pytest
+from munch import munchify
+
+from obscura.core.image_io import async_writer
+from obscura.core.rendering.render_settings import (
+    configure_output,
+    configure_render,
+    render_result_pixels,
+    render_tiled,
+    stitch_tiles,
+    tile_regions,
+    write_render,
+)
+
+
+def _config(**budget: object) -> object:
+    """Create a config with final Cycles render settings.
+
+    Args:
+        **budget: Settings of the budget section.
+
+    Returns:
+        Munch type config.
+    """
+
+    return munchify(
+        {
+            "general": {"output_file_path": "render.png"},
+            "render": {
+                "preview": {"mode": False},
+                "resolution_x": 200,
+                "resolution_y": 100,
+                "engine": "CYCLES",
+                "samples": 128,
+                "use_denoising": False,
+                "budget": budget,
+            },
+        }
+    )
+
+
+def test_configure_render_without_budget() -> None:
+    """Test that samples and denoising are taken from the config."""
+
+    mock_scene = MagicMock()
+    with patch("obscura.core.rendering.render_settings.bpy") as mock_bpy:
+        configure_render(mock_scene, _config(mode=False))
+
+    assert mock_scene.cycles.samples == 128
+    assert mock_scene.cycles.use_denoising is False
+    assert mock_scene.cycles.time_limit == 0
+    mock_bpy.ops.render.render.assert_not_called()
+
+
+def test_configure_render_with_budget() -> None:
+    """Test that the probe render reduces the samples to the time limit."""
+
+    mock_scene = MagicMock()
+    config = _config(
+        mode=True, noise_threshold=0.05, min_samples=2, time_limit=2, probe_samples=4
+    )
+    with (
+        patch("obscura.core.rendering.render_settings.bpy") as mock_bpy,
+        # probe render of 4 samples takes 0.2 s -> 40 samples fit into 2 s
+        patch(
+            "obscura.core.rendering.render_settings.time.perf_counter",
+            side_effect=[0.0, 0.2],
+        ),
+    ):
+        configure_render(mock_scene, config)
+
+    mock_bpy.ops.render.render.assert_called_once()
+    assert mock_scene.cycles.samples == 40
+    assert mock_scene.cycles.adaptive_threshold == 0.05
+    assert mock_scene.cycles.adaptive_min_samples == 2
+    assert mock_scene.cycles.time_limit == 2
+    assert mock_scene.cycles.use_denoising is False
+
+    # configured samples remain the upper bound
+    with (
+        patch("obscura.core.rendering.render_settings.bpy"),
+        patch(
+            "obscura.core.rendering.render_settings.time.perf_counter",
+            side_effect=[0.0, 0.001],
+        ),
+    ):
+        configure_render(mock_scene, config)
+
+    assert mock_scene.cycles.samples == 128
+
+    # following jobs without budget use the Blender defaults again
+    with patch("obscura.core.rendering.render_settings.bpy"):
+        configure_render(mock_scene, _config(mode=False))
+
+    assert mock_scene.cycles.use_adaptive_sampling is True
+    assert mock_scene.cycles.adaptive_threshold == 0.01
+    assert mock_scene.cycles.adaptive_min_samples == 0
+    assert mock_scene.cycles.time_limit == 0
+
+
+def test_configure_render_thumbnail() -> None:
+    """Test the thumbnail settings with engine selection and Workbench
+    shading."""
+
+    config = _config(mode=False)
+    config.render.thumbnail = munchify(
+        {
+            "mode": True,
+            "resolution_x": 64,
+            "resolution_y": 40,
+            "engine": "AUTO",
+            "samples": 8,
+        }
+    )
+    config.render.workbench = {"lighting": "FLAT"}
+    config.render.auto = {"max_seconds": 1.0, "cost_model": {}}
+    mock_scene = MagicMock()
+    mock_scene.render.resolution_x = 64
+    mock_scene.render.resolution_y = 40
+    mock_scene.objects = [MagicMock(type="MESH"), MagicMock(type="CAMERA")]
+    mock_scene.objects[0].data.polygons = [None] * 100
+
+    with (
+        patch("obscura.core.rendering.render_settings.bpy"),
+        patch(
+            "obscura.core.rendering.render_settings.select_engine",
+            return_value="BLENDER_WORKBENCH",
+        ) as mock_select_engine,
+    ):
+        configure_render(mock_scene, config)
+
+    mock_select_engine.assert_called_once_with(config.render.auto, 100, 64 * 40, 8, ())
+    assert mock_scene.render.filepath == "render_thumbnail.png"
+    assert mock_scene.render.resolution_x == 64
+    assert mock_scene.render.engine == "BLENDER_WORKBENCH"
+    assert mock_scene.display.shading.light == "FLAT"
+    assert mock_scene.display.shading.color_type == "MATERIAL"
+
+    # Workbench does not color the spheres of point clouds
+    config.general.loader = "points"
+    config.scalar_field = {"mode": True}
+    with (
+        patch("obscura.core.rendering.render_settings.bpy"),
+        patch(
+            "obscura.core.rendering.render_settings.select_engine",
+            return_value="CYCLES",
+        ) as mock_select_engine,
+    ):
+        configure_render(mock_scene, config)
+
+    mock_select_engine.assert_called_once_with(
+        config.render.auto, 100, 64 * 40, 8, ("BLENDER_WORKBENCH",)
+    )
+
+
+def test_tile_regions() -> None:
+    """Test that tiles cover the frame and overlap within the frame."""
+
+    tiles = tile_regions(250, 120, 100, 10)
+
+    assert [(tile["x"], tile["y"]) for tile in tiles] == [
+        (0, 0),
+        (100, 0),
+        (200, 0),
+        (0, 100),
+        (100, 100),
+        (200, 100),
+    ]
+    assert sum(tile["width"] * tile["height"] for tile in tiles) == 250 * 120
+    assert tiles[0] == {
+        "x": 0,
+        "y": 0,
+        "width": 100,
+        "height": 100,
+        "render_x": 0,
+        "render_y": 0,
+        "render_width": 110,
+        "render_height": 110,
+    }
+    assert tiles[5]["width"] == 50
+    assert tiles[5]["height"] == 20
+    assert tiles[5]["render_x"] == 190
+    assert tiles[5]["render_width"] == 60
+    assert tiles[5]["render_height"] == 30
+
+
+def test_stitch_tiles(tmp_path: Path) -> None:
+    """Test that stitched tiles reproduce the full image.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    image = np.random.default_rng(0).integers(0, 256, (30, 50, 4), dtype=np.uint8)
+    tiles = tile_regions(50, 30, 16, 3)
+    for index, tile in enumerate(tiles):
+        tile["path"] = str(tmp_path / f"tile{index}.npy")
+        np.save(
+            tile["path"],
+            image[
+                tile["render_y"] : tile["render_y"] + tile["render_height"],
+                tile["render_x"] : tile["render_x"] + tile["render_width"],
+            ],
+        )
+
+    with patch("obscura.core.rendering.render_settings.PngWriter") as mock_writer:
+        stitch_tiles(str(tmp_path / "image.png"), 50, 30, 3, tiles, rows_per_write=5)
+
+    mock_writer.assert_called_once_with(str(tmp_path / "image.png"), 50, 30, 3, 6)
+    writer = mock_writer.return_value.__enter__.return_value
+    rows = np.concatenate([call.args[0] for call in writer.write_rows.call_args_list])
+    np.testing.assert_array_equal(rows, image[:, :, :3])
+
+    # tiles of a wrong size are not stitched
+    np.save(tiles[0]["path"], image[:10, :10])
+    with pytest.raises(ValueError, match="instead of 19x19 pixels"):
+        stitch_tiles(str(tmp_path / "image.png"), 50, 30, 3, tiles)
+
+
+def test_render_tiled(tmp_path: Path) -> None:
+    """Test that a tiled render equals the render of the full image.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    bpy.ops.mesh.primitive_monkey_add()
+    bpy.ops.object.camera_add(location=(0, -4, 0), rotation=(np.pi / 2, 0, 0))
+    bpy.ops.object.light_add(type="SUN")
+    scene = bpy.context.scene
+    scene.camera = bpy.data.objects["Camera"]
+    scene.render.engine = "CYCLES"
+    scene.cycles.device = "CPU"
+    scene.cycles.samples = 2
+    scene.cycles.use_denoising = False
+    # odd sizes whose tile borders are no exact binary fractions
+    scene.render.resolution_x = 303
+    scene.render.resolution_y = 333
+    scene.render.resolution_percentage = 100
+    scene.render.image_settings.file_format = "PNG"
+    scene.render.image_settings.color_mode = "RGB"
+    scene.render.image_settings.compression = 100
+
+    bpy.ops.render.render()
+    full_image = render_result_pixels(scene)[:, :, :3].astype(int)
+
+    scene.render.filepath = str(tmp_path / "tiled.png")
+    config = munchify({"render": {"tiles": {"tile_size": 46, "overlap": 5}}})
+    with patch("obscura.core.rendering.render_settings.configure_render"):
+        render_tiled(scene, config)
+
+    image = bpy.data.images.load(scene.render.filepath)
+    pixels = np.array(image.pixels[:]).reshape(333, 303, image.channels)[::-1]
+    tiled_image = np.round(pixels[:, :, :3] * 255).astype(int)
+
+    # only differences from rounding of the PNG and TGA encoding
+    assert np.abs(tiled_image - full_image).max() <= 2
+
+
+def test_render_tiled_budget() -> None:
+    """Test that tiles are not rendered with a budget, whose probe would
+    render the full frame."""
+
+    config = munchify({"render": {"budget": {"mode": True}, "tiles": {"mode": True}}})
+    with (
+        patch("obscura.core.rendering.render_settings.bpy") as mock_bpy,
+        patch(
+            "obscura.core.rendering.render_settings.configure_render"
+        ) as mock_configure,
+        pytest.raises(ValueError, match="does not support render.budget"),
+    ):
+        render_tiled(MagicMock(), config)
+
+    mock_configure.assert_not_called()
+    mock_bpy.ops.render.render.assert_not_called()
+
+
+def test_configure_output() -> None:
+    """Test the encoding settings of the output formats."""
+
+    mock_scene = MagicMock()
+    configure_output(mock_scene, munchify({"render": {}}))
+    assert mock_scene.render.image_settings.file_format == "PNG"
+    assert mock_scene.render.image_settings.compression == 15
+
+    configure_output(
+        mock_scene,
+        munchify({"render": {"output": {"file_format": "WEBP", "quality": 70}}}),
+    )
+    assert mock_scene.render.image_settings.quality == 70
+
+    configure_output(
+        mock_scene,
+        munchify({"render": {"output": {"file_format": "OPEN_EXR", "exr_half": True}}}),
+    )
+    assert mock_scene.render.image_settings.color_depth == "16"
+
+    # PNG files after an OpenEXR job are written with 8 bit again
+    configure_output(mock_scene, munchify({"render": {}}))
+    assert mock_scene.render.image_settings.color_depth == "8"
+
+
+def test_write_render_async_max_compression(tmp_path: Path) -> None:
+    """Test that PNG files of the maximum compression are written in the
+    background.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    bpy.ops.mesh.primitive_monkey_add()
+    bpy.ops.object.camera_add(location=(0, -4, 0), rotation=(np.pi / 2, 0, 0))
+    scene = bpy.context.scene
+    scene.camera = bpy.data.objects["Camera"]
+    scene.render.engine = "BLENDER_WORKBENCH"
+    scene.render.resolution_x = 32
+    scene.render.resolution_y = 24
+    scene.render.resolution_percentage = 100
+    scene.render.filepath = str(tmp_path / "render.png")
+    config = munchify({"render": {"output": {"compression": 100, "async_write": True}}})
+    configure_output(scene, config)
+
+    bpy.ops.render.render()
+    write_render(scene, config)
+    async_writer(2).wait()
+
+    image = bpy.data.images.load(scene.render.filepath)
+    assert tuple(image.size) == (32, 24)
+
+
+def test_write_render_async() -> None:
+    """Test that PNG files are handed to the background writer if enabled."""
+
+    mock_scene = MagicMock()
+    mock_scene.render.filepath = "render.png"
+    mock_scene.render.image_settings.file_format = "PNG"
+    mock_scene.render.image_settings.color_depth = "8"
+    mock_scene.render.image_settings.compression = 50
+    pixels = np.zeros((2, 2, 4), dtype=np.uint8)
+    config = munchify({"render": {"output": {"async_write": True, "num_threads": 3}}})
+
+    with (
+        patch("obscura.core.rendering.render_settings.bpy") as mock_bpy,
+        patch(
+            "obscura.core.rendering.render_settings.render_result_pixels",
+            return_value=pixels,
+        ),
+        patch("obscura.core.rendering.render_settings.async_writer") as mock_writer,
+    ):
+        write_render(mock_scene, config)
+
+        mock_writer.assert_called_once_with(3)
+        mock_writer.return_value.submit.assert_called_once_with(
+            "render.png", pixels, compression=4
+        )
+        mock_bpy.data.images["Render Result"].save_render.assert_not_called()
+
+        # other formats are written by Blender
+        mock_scene.render.image_settings.file_format = "JPEG"
+        write_render(mock_scene, config)
+
+        mock_bpy.data.images["Render Result"].save_render.assert_called_once_with(
+            filepath="render.png"
+        )
@@ -2,13 +2,18 @@
 
 from unittest.mock import MagicMock, patch
 
+import pytest
+from munch import munchify
+
+from obscura.core.profiling import StageProfiler
 from obscura.core.rendering.rendering_pipeline import rendering_pipeline
 
 
 def test_rendering_pipeline_calls_all_steps() -> None:
     """Test that rendering pipeline calls all steps in correct order."""
 
-    mock_config = MagicMock()
+    # config without the optional feature sections
+    config = munchify({"general": {}, "camera": {}, "render": {}})
     mock_mesh = MagicMock()
     mock_center = (0, 0, 0)
     mock_extent = 10.0
@@ -36,9 +41,6 @@ def test_rendering_pipeline_calls_all_steps() -> None:
         patch(
             "obscura.core.rendering.rendering_pipeline.define_background"
         ) as mock_define_background,
-        patch(
-            "obscura.core.rendering.rendering_pipeline.ambient_lighting"
-        ) as mock_ambient_lighting,
         patch(
             "obscura.core.rendering.rendering_pipeline.setup_lighting"
         ) as mock_setup_lighting,
@@ -46,35 +48,344 @@ def test_rendering_pipeline_calls_all_steps() -> None:
             "obscura.core.rendering.rendering_pipeline.apply_material"
         ) as mock_apply_material,
         patch("obscura.core.rendering.rendering_pipeline.render") as mock_render,
+        patch(
+            "obscura.core.rendering.rendering_pipeline.write_render"
+        ) as mock_write_render,
     ):
         # configure bpy scene
         mock_bpy.context.scene = mock_scene
 
         # run pipeline
-        rendering_pipeline(mock_config)
+        rendering_pipeline(config)
 
         # scene reset
         mock_bpy.ops.wm.read_factory_settings.assert_called_once_with(use_empty=True)
 
         # mesh handling
-        mock_load_mesh.assert_called_once_with(mock_config)
-        mock_apply_transforms.assert_called_once_with(mock_mesh, mock_config)
+        mock_load_mesh.assert_called_once_with(config)
+        mock_apply_transforms.assert_called_once_with(mock_mesh, config)
         mock_compute_geometry.assert_called_once_with(mock_mesh)
 
         # camera
         mock_setup_camera.assert_called_once_with(
-            mock_config, mock_mesh, mock_center, mock_extent
+            config, mock_mesh, mock_center, mock_extent, None
         )
 
         # background & lighting
-        mock_define_background.assert_called_once_with(mock_config)
-        mock_ambient_lighting.assert_called_once_with(mock_config)
+        mock_define_background.assert_called_once_with(config)
         mock_setup_lighting.assert_called_once_with(
-            mock_center, mock_extent, mock_config
+            mock_center, mock_extent, config, None
         )
 
         # material
-        mock_apply_material.assert_called_once_with(mock_mesh, mock_config)
+        mock_apply_material.assert_called_once_with(mock_mesh, config, None)
 
         # render
-        mock_render.assert_called_once_with(mock_scene, mock_config)
+        mock_render.assert_called_once_with(mock_scene, config)
+        mock_write_render.assert_called_once_with(mock_scene, config)
+
+
+def test_rendering_pipeline_clear_only() -> None:
+    """Test that consecutive jobs only clear the scene."""
+
+    config = munchify({"general": {}, "camera": {}, "render": {}})
+    mock_scene = MagicMock()
+    mock_scene.render.filepath = "/fake/output.png"
+
+    with (
+        patch("obscura.core.rendering.rendering_pipeline.bpy") as mock_bpy,
+        patch("obscura.core.rendering.rendering_pipeline.clear_scene") as mock_clear,
+        patch(
+            "obscura.core.rendering.rendering_pipeline.compute_geometry",
+            return_value=((0, 0, 0), 1.0),
+        ),
+        patch("obscura.core.rendering.rendering_pipeline.load_mesh"),
+        patch("obscura.core.rendering.rendering_pipeline.apply_transforms"),
+        patch("obscura.core.rendering.rendering_pipeline.setup_camera"),
+        patch("obscura.core.rendering.rendering_pipeline.define_background"),
+        patch("obscura.core.rendering.rendering_pipeline.setup_lighting"),
+        patch("obscura.core.rendering.rendering_pipeline.apply_material"),
+        patch("obscura.core.rendering.rendering_pipeline.render"),
+        patch("obscura.core.rendering.rendering_pipeline.write_render"),
+    ):
+        mock_bpy.context.scene = mock_scene
+
+        profiler = StageProfiler()
+        output_files = rendering_pipeline(config, clear_only=True, profiler=profiler)
+
+        mock_clear.assert_called_once()
+        mock_bpy.ops.wm.read_factory_settings.assert_not_called()
+        assert output_files == ["/fake/output.png"]
+
+        # all stages recorded by the profiler
+        assert [record["stage"] for record in profiler.records] == [
+            "reset",
+            "load",
+            "transform",
+            "geometry",
+            "camera",
+            "lighting",
+            "material",
+            "render",
+            "write",
+        ]
+
+
+def test_rendering_pipeline_multi_view() -> None:
+    """Test that multi-view mode renders all views of one scene."""
+
+    config = munchify(
+        {"general": {}, "camera": {"multi_view": {"mode": True}}, "render": {}}
+    )
+    mock_cam = MagicMock()
+
+    with (
+        patch("obscura.core.rendering.rendering_pipeline.bpy") as mock_bpy,
+        patch(
+            "obscura.core.rendering.rendering_pipeline.compute_geometry",
+            return_value=((0, 0, 0), 1.0),
+        ),
+        patch("obscura.core.rendering.rendering_pipeline.load_mesh") as mock_load,
+        patch("obscura.core.rendering.rendering_pipeline.apply_transforms"),
+        patch(
+            "obscura.core.rendering.rendering_pipeline.setup_camera",
+            return_value=mock_cam,
+        ),
+        patch("obscura.core.rendering.rendering_pipeline.define_background"),
+        patch("obscura.core.rendering.rendering_pipeline.setup_lighting"),
+        patch("obscura.core.rendering.rendering_pipeline.apply_material"),
+        patch("obscura.core.rendering.rendering_pipeline.render") as mock_render,
+        patch(
+            "obscura.core.rendering.rendering_pipeline.render_views",
+            return_value=["/fake/a.png", "/fake/b.png"],
+        ) as mock_render_views,
+    ):
+        output_files = rendering_pipeline(config)
+
+        mock_load.assert_called_once()
+        mock_render.assert_not_called()
+        mock_render_views.assert_called_once_with(
+            mock_bpy.context.scene, config, mock_cam, (0, 0, 0), 1.0, None
+        )
+        assert output_files == ["/fake/a.png", "/fake/b.png"]
+
+
+def test_rendering_pipeline_progressive() -> None:
+    """Test that progressive mode writes the preview before the final image."""
+
+    config = munchify(
+        {"general": {}, "camera": {}, "render": {"progressive": {"mode": True}}}
+    )
+    preview_config, final_config = MagicMock(), MagicMock()
+    mock_scene = MagicMock()
+    filepaths = iter(["/fake/output_preview.png", "/fake/output.png"])
+
+    def _render(scene: MagicMock, config: MagicMock) -> None:
+        """Set the output path of the next render (preview, then final).
+
+        Args:
+            scene: Mocked scene.
+            config: Mocked config.
+        """
+
+        scene.render.filepath = next(filepaths)
+
+    with (
+        patch("obscura.core.rendering.rendering_pipeline.bpy") as mock_bpy,
+        patch(
+            "obscura.core.rendering.rendering_pipeline.compute_geometry",
+            return_value=((0, 0, 0), 1.0),
+        ),
+        patch("obscura.core.rendering.rendering_pipeline.load_mesh") as mock_load,
+        patch("obscura.core.rendering.rendering_pipeline.apply_transforms"),
+        patch("obscura.core.rendering.rendering_pipeline.setup_camera"),
+        patch("obscura.core.rendering.rendering_pipeline.define_background"),
+        patch("obscura.core.rendering.rendering_pipeline.setup_lighting"),
+        patch("obscura.core.rendering.rendering_pipeline.apply_material"),
+        patch(
+            "obscura.core.rendering.rendering_pipeline.merge_config",
+            side_effect=[preview_config, final_config],
+        ) as mock_merge_config,
+        patch(
+            "obscura.core.rendering.rendering_pipeline.render", side_effect=_render
+        ) as mock_render,
+        patch(
+            "obscura.core.rendering.rendering_pipeline.write_render"
+        ) as mock_write_render,
+    ):
+        mock_bpy.context.scene = mock_scene
+
+        profiler = StageProfiler()
+        output_files = rendering_pipeline(config, profiler=profiler)
+
+        # scene is built once
+        mock_load.assert_called_once()
+        assert [call.args[1] for call in mock_merge_config.call_args_list] == [
+            {"render": {"preview": {"mode": True}}},
+            {"render": {"preview": {"mode": False}}},
+        ]
+        assert [call.args[1] for call in mock_render.call_args_list] == [
+            preview_config,
+            final_config,
+        ]
+        assert mock_write_render.call_count == 2
+        assert output_files == ["/fake/output_preview.png", "/fake/output.png"]
+        assert [record["stage"] for record in profiler.records][-4:] == [
+            "render_preview",
+            "write_preview",
+            "render_final",
+            "write_final",
+        ]
+
+
+def test_rendering_pipeline_scene_template() -> None:
+    """Test that the objects of the scene template are reused."""
+
+    config = munchify(
+        {"general": {}, "camera": {}, "render": {}, "scene_template": {"mode": True}}
+    )
+    mock_mesh = MagicMock()
+    template = {"camera": MagicMock(), "lights": [MagicMock()], "material": MagicMock()}
+
+    with (
+        patch("obscura.core.rendering.rendering_pipeline.bpy") as mock_bpy,
+        patch(
+            "obscura.core.rendering.rendering_pipeline.prepare_scene_template",
+            return_value=template,
+        ) as mock_prepare,
+        patch("obscura.core.rendering.rendering_pipeline.clear_scene") as mock_clear,
+        patch(
+            "obscura.core.rendering.rendering_pipeline.compute_geometry",
+            return_value=((0, 0, 0), 1.0),
+        ),
+        patch(
+            "obscura.core.rendering.rendering_pipeline.load_mesh",
+            return_value=mock_mesh,
+        ),
+        patch("obscura.core.rendering.rendering_pipeline.apply_transforms"),
+        patch(
+            "obscura.core.rendering.rendering_pipeline.setup_camera"
+        ) as mock_setup_camera,
+        patch("obscura.core.rendering.rendering_pipeline.define_background"),
+        patch(
+            "obscura.core.rendering.rendering_pipeline.setup_lighting"
+        ) as mock_setup_lighting,
+        patch(
+            "obscura.core.rendering.rendering_pipeline.apply_material"
+        ) as mock_apply_material,
+        patch("obscura.core.rendering.rendering_pipeline.render"),
+        patch("obscura.core.rendering.rendering_pipeline.write_render"),
+    ):
+        rendering_pipeline(config, clear_only=True)
+
+        mock_prepare.assert_called_once_with(True)
+        mock_clear.assert_not_called()
+        mock_bpy.ops.wm.read_factory_settings.assert_not_called()
+        mock_setup_camera.assert_called_once_with(
+            config, mock_mesh, (0, 0, 0), 1.0, template["camera"]
+        )
+        mock_setup_lighting.assert_called_once_with(
+            (0, 0, 0), 1.0, config, template["lights"]
+        )
+        mock_apply_material.assert_called_once_with(
+            mock_mesh, config, template["material"]
+        )
+
+
+def test_rendering_pipeline_scalar_field_unsupported() -> None:
+    """Test that scalar fields are not silently dropped by the mesh cache."""
+
+    config = munchify(
+        {
+            "general": {"loader": "vtk"},
+            "camera": {},
+            "render": {},
+            "mesh_cache": {"mode": True},
+            "scalar_field": {"mode": True},
+        }
+    )
+
+    with (
+        patch("obscura.core.rendering.rendering_pipeline.bpy") as mock_bpy,
+        patch(
+            "obscura.core.rendering.rendering_pipeline.load_cached_mesh"
+        ) as mock_load,
+        pytest.raises(ValueError, match="neither time_series nor mesh_cache"),
+    ):
+        rendering_pipeline(config)
+
+    mock_bpy.ops.wm.read_factory_settings.assert_not_called()
+    mock_load.assert_not_called()
+
+
+def test_rendering_pipeline_points_unsupported() -> None:
+    """Test that point clouds are rejected before loading from the mesh
+    cache."""
+
+    config = munchify(
+        {
+            "general": {"loader": "points"},
+            "camera": {},
+            "render": {},
+            "mesh_cache": {"mode": True},
+        }
+    )
+
+    with (
+        patch("obscura.core.rendering.rendering_pipeline.bpy") as mock_bpy,
+        patch(
+            "obscura.core.rendering.rendering_pipeline.load_cached_mesh"
+        ) as mock_load,
+        pytest.raises(ValueError, match="Point clouds support neither"),
+    ):
+        rendering_pipeline(config)
+
+    mock_bpy.ops.wm.read_factory_settings.assert_not_called()
+    mock_load.assert_not_called()
+
+
+def test_rendering_pipeline_colorbar() -> None:
+    """Test that the colorbar is returned with the render for caching."""
+
+    config = munchify(
+        {
+            "general": {"loader": "vtk", "output_file_path": "/fake/output.png"},
+            "camera": {},
+            "render": {},
+            "scalar_field": {
+                "mode": True,
+                "array_name": "pressure",
+                "colorbar": True,
+                "colormap": "viridis",
+            },
+        }
+    )
+
+    with (
+        patch("obscura.core.rendering.rendering_pipeline.bpy") as mock_bpy,
+        patch(
+            "obscura.core.rendering.rendering_pipeline.compute_geometry",
+            return_value=((0, 0, 0), 1.0),
+        ),
+        patch(
+            "obscura.core.rendering.rendering_pipeline.load_scalar_field_mesh"
+        ) as mock_load,
+        patch("obscura.core.rendering.rendering_pipeline.apply_transforms"),
+        patch("obscura.core.rendering.rendering_pipeline.setup_camera"),
+        patch("obscura.core.rendering.rendering_pipeline.define_background"),
+        patch("obscura.core.rendering.rendering_pipeline.setup_lighting"),
+        patch("obscura.core.rendering.rendering_pipeline.apply_scalar_field_material"),
+        patch(
+            "obscura.core.rendering.rendering_pipeline.write_colorbar"
+        ) as mock_write_colorbar,
+        patch("obscura.core.rendering.rendering_pipeline.render"),
+        patch("obscura.core.rendering.rendering_pipeline.write_render"),
+    ):
+        mock_bpy.context.scene.render.filepath = "/fake/output.png"
+        mock_load.return_value = {"scalar_field_range": (0.0, 2.0)}
+        output_files = rendering_pipeline(config)
+
+    mock_write_colorbar.assert_called_once_with(
+        "/fake/output_colorbar.png", "viridis", 0.0, 2.0, "pressure"
+    )
+    assert output_files == ["/fake/output.png", "/fake/output_colorbar.png"]
@@ -0,0 +1,104 @@
+"""Test scalar field coloring."""
+
+import struct
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+from munch import munchify
+
+from obscura.core.image_io import text_mask, write_png
+from obscura.core.rendering.scalar_field import (
+    COLORMAPS,
+    map_colors,
+    srgb_to_linear,
+    value_range,
+    write_colorbar,
+)
+
+
+def test_map_colors() -> None:
+    """Test interpolation and clamping of the colormap."""
+
+    colors = map_colors(
+        np.array([-1.0, 0.0, 5.0, 10.0, 20.0, np.nan]), "rainbow", 0, 10
+    )
+
+    np.testing.assert_allclose(
+        colors,
+        [[0, 0, 1], [0, 0, 1], [0, 1, 0], [1, 0, 0], [1, 0, 0], [0, 0, 1]],
+        atol=1e-3,
+    )
+    assert colors.dtype == np.float32
+    np.testing.assert_allclose(
+        map_colors(np.array([0.5]), "grayscale", 0, 1), [[0.5, 0.5, 0.5]], atol=1e-3
+    )
+    np.testing.assert_allclose(
+        map_colors(np.array([0.5]), "grayscale", 0, 1, linear=True),
+        srgb_to_linear(np.array([[0.5, 0.5, 0.5]])),
+        atol=1e-3,
+    )
+
+
+def test_value_range() -> None:
+    """Test configured and automatic value ranges."""
+
+    values = np.array([2.0, np.nan, -1.0])
+
+    config = munchify({"scalar_field": {"range": None}})
+    assert value_range(values, config) == (-1.0, 2.0)
+    config.scalar_field.range = [0, 1]
+    assert value_range(values, config) == (0.0, 1.0)
+
+
+def test_srgb_to_linear() -> None:
+    """Test the sRGB transfer function at the bounds and midpoint."""
+
+    np.testing.assert_allclose(
+        srgb_to_linear(np.array([0.0, 0.5, 1.0])), [0.0, 0.214041, 1.0], atol=1e-6
+    )
+
+
+def test_write_colorbar(tmp_path: Path) -> None:
+    """Test that the colorbar runs from the last to the first color, is
+    labeled and stores its legend as PNG text in a new directory.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    path = tmp_path / "output" / "colorbar.png"
+    with patch(
+        "obscura.core.rendering.scalar_field.write_png", wraps=write_png
+    ) as mock_write:
+        write_colorbar(
+            str(path), "viridis", -0.5, 2e5, "p", width=4, height=16, text_scale=1
+        )
+
+    # title (5 rows) above the bar, labels right of it, 2 pixels padding
+    pixels = mock_write.call_args.args[1]
+    assert pixels.shape == (2 + 5 + 2 + 16 + 2, 2 + 4 + 2 + 19 + 2, 3)
+    np.testing.assert_array_equal(
+        pixels[[9, 24], 2],
+        np.round(255 * np.array(COLORMAPS["viridis"])[[-1, 0]]),
+    )
+    np.testing.assert_array_equal(pixels[2:7, 2:5, 0] == 0, text_mask("p"))
+    np.testing.assert_array_equal(pixels[9:14, 8:27, 0] == 0, text_mask("2e+05"))
+    np.testing.assert_array_equal(pixels[20:25, 8:23, 0] == 0, text_mask("-0.5"))
+    assert np.all(pixels[14:20, 6:] == 255)
+
+    data = path.read_bytes()
+    text = {}
+    offset = 8
+    while offset < len(data):
+        (length,) = struct.unpack(">I", data[offset : offset + 4])
+        if data[offset + 4 : offset + 8] == b"tEXt":
+            keyword, value = data[offset + 8 : offset + 8 + length].split(b"\0")
+            text[keyword.decode()] = value.decode()
+        offset += length + 12
+    assert text == {
+        "Title": "p",
+        "Minimum": "-0.5",
+        "Maximum": "200000",
+        "Colormap": "viridis",
+    }
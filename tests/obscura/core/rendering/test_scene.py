@@ -0,0 +1,108 @@
+"""Test the scene state handling."""
+
+import bpy
+
+from obscura.core.rendering.scene import (
+    TEMPLATE_PROPERTY,
+    clear_scene,
+    prepare_scene_template,
+)
+
+
+def _add_job_mesh(material: bpy.types.Material | None = None) -> bpy.types.Object:
+    """Add the mesh object of a job.
+
+    Args:
+        material: Material of the mesh.
+
+    Returns:
+        Mesh object.
+    """
+
+    mesh = bpy.data.meshes.new("Mesh")
+    mesh.from_pydata([(0, 0, 0), (1, 0, 0), (0, 1, 0)], [], [(0, 1, 2)])
+    if material is not None:
+        mesh.materials.append(material)
+    mesh_obj = bpy.data.objects.new("Mesh", mesh)
+    bpy.context.scene.collection.objects.link(mesh_obj)
+    return mesh_obj
+
+
+def _data_blocks() -> dict[str, list[str]]:
+    """Get the names of the data blocks of the Blender session.
+
+    Returns:
+        Sorted names of the data blocks by type.
+    """
+
+    return {
+        name: sorted(data_block.name for data_block in getattr(bpy.data, name))
+        for name in [
+            "objects",
+            "meshes",
+            "materials",
+            "lights",
+            "cameras",
+            "worlds",
+            "node_groups",
+        ]
+    }
+
+
+def test_prepare_scene_template() -> None:
+    """Test that the template survives the reset between jobs and every
+    job starts from the same data blocks."""
+
+    template = prepare_scene_template(clear_only=False)
+    world = bpy.context.scene.world
+    state = _data_blocks()
+    assert state["objects"] == ["BackLight", "Camera", "FillLight", "KeyLight"]
+    assert state["materials"] == ["MeshMaterial"]
+
+    for _ in range(2):
+        _add_job_mesh(template["material"])
+        template["camera"].data.ortho_scale = 42.0
+        template["camera"].keyframe_insert(data_path="location", frame=1)
+
+        new_template = prepare_scene_template(clear_only=True)
+
+        assert new_template["camera"] == template["camera"]
+        assert new_template["lights"] == template["lights"]
+        assert new_template["material"] == template["material"]
+        assert bpy.context.scene.world == world
+        assert _data_blocks() == state
+        assert new_template["camera"].data.ortho_scale == 6.0
+        assert new_template["camera"].animation_data is None
+
+
+def test_clear_scene() -> None:
+    """Test that clearing removes all objects and orphan data blocks."""
+
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    _add_job_mesh()
+    bpy.data.meshes.new("Orphan")
+    camera_obj = bpy.data.objects.new("Camera", bpy.data.cameras.new("Camera"))
+    bpy.context.scene.collection.objects.link(camera_obj)
+
+    clear_scene()
+
+    assert len(bpy.data.objects) == 0
+    assert len(bpy.data.meshes) == 0
+    assert len(bpy.data.cameras) == 0
+
+
+def test_clear_scene_drops_template() -> None:
+    """Test that clearing without the template also removes the template
+    material kept by its fake user."""
+
+    template = prepare_scene_template(clear_only=False)
+    _add_job_mesh(template["material"])
+    assert template["material"].use_fake_user
+
+    clear_scene()
+
+    assert len(bpy.data.objects) == 0
+    assert len(bpy.data.meshes) == 0
+    assert not [
+        material for material in bpy.data.materials if TEMPLATE_PROPERTY in material
+    ]
@@ -0,0 +1,72 @@
+"""Test time-series rendering."""
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from munch import munchify
+
+from obscura.core.rendering.time_series import render_time_series, time_series_files
+
+
+def test_time_series_files(tmp_path: Path) -> None:
+    """Test numeric ordering of the time step files from glob patterns.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    for name in ["step_10.vtu", "step_2.vtu", "step_1.vtu"]:
+        (tmp_path / name).touch()
+    config = munchify(
+        {"time_series": {"input_file_paths": [str(tmp_path / "step_*.vtu")]}}
+    )
+
+    assert time_series_files(config) == [
+        str(tmp_path / "step_1.vtu"),
+        str(tmp_path / "step_2.vtu"),
+        str(tmp_path / "step_10.vtu"),
+    ]
+
+
+def test_render_time_series() -> None:
+    """Test that only the vertices are updated for every time step."""
+
+    first_points = np.zeros((2, 3), dtype=np.float32)
+    point_ids = np.array([1, 0])
+    volume_points = np.array([[1, 1, 1], [2, 2, 2]], dtype=np.float32)
+
+    mock_scene = MagicMock()
+    mock_scene.render.filepath = "/fake/output.png"
+
+    with (
+        patch("obscura.core.rendering.time_series.bpy") as mock_bpy,
+        patch("obscura.core.rendering.time_series.configure_render"),
+        patch(
+            "obscura.core.rendering.time_series.read_points",
+            return_value=volume_points,
+        ) as mock_read_points,
+        patch(
+            "obscura.core.rendering.time_series.get_vertices",
+            return_value=first_points - 1.0,
+        ),
+        patch("obscura.core.rendering.time_series.update_vertices") as mock_update,
+    ):
+        output_files = render_time_series(
+            mock_scene,
+            MagicMock(),
+            MagicMock(),
+            ["a.vtu", "b.vtu", "c.vtu"],
+            first_points,
+            point_ids,
+        )
+
+    assert output_files == [
+        "/fake/output_0000.png",
+        "/fake/output_0001.png",
+        "/fake/output_0002.png",
+    ]
+    assert mock_bpy.ops.render.render.call_count == 3
+    assert mock_read_points.call_count == 2
+    assert mock_update.call_count == 2
+    np.testing.assert_array_equal(mock_update.call_args[0][1], [[1, 1, 1], [0, 0, 0]])
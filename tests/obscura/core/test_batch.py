@@ -0,0 +1,239 @@
+"""Test batch rendering."""
+
+import json
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+import yaml
+from munch import munchify
+
+from obscura.core.batch import expand_jobs, run_batch
+
+
+def _batch_config(tmp_path: Path, **batch: object) -> object:
+    """Create a minimal batch config.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+        **batch: Settings of the batch section.
+
+    Returns:
+        Munch type config.
+    """
+
+    return munchify(
+        {
+            "general": {
+                "output_directory": str(tmp_path),
+                "sim_name": "batch",
+                "input_file_path": "base.stl",
+                "output_file_path": str(tmp_path / "render.png"),
+            },
+            "batch": {"mode": True, **batch},
+        }
+    )
+
+
+def test_expand_jobs(tmp_path: Path) -> None:
+    """Test expansion of input files, overrides and manifest into jobs.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    for name in ["b.stl", "a.stl"]:
+        (tmp_path / name).touch()
+    manifest_file_path = tmp_path / "manifest.yaml"
+    with open(manifest_file_path, "w") as file:
+        yaml.dump([{"material": {"material_roughness": 0.1}}], file)
+
+    config = _batch_config(
+        tmp_path,
+        input_file_paths=[str(tmp_path / "*.stl")],
+        jobs=[{"camera": {"lens": 50}}],
+        manifest_file_path=str(manifest_file_path),
+    )
+
+    jobs = expand_jobs(config)
+
+    assert [job.general.input_file_path for job in jobs] == [
+        str(tmp_path / "a.stl"),
+        str(tmp_path / "b.stl"),
+        "base.stl",
+        "base.stl",
+    ]
+    assert [job.general.output_file_path for job in jobs] == [
+        str(tmp_path / "a.png"),
+        str(tmp_path / "b.png"),
+        str(tmp_path / "render_0002.png"),
+        str(tmp_path / "render_0003.png"),
+    ]
+    assert jobs[2].camera.lens == 50
+    assert jobs[3].material.material_roughness == 0.1
+    assert jobs[0].general.sim_name == "batch"
+    # jobs do not repeat the job lists of the batch
+    assert jobs[2].batch.jobs == []
+    assert jobs[2].batch.input_file_paths == []
+    assert jobs[2].batch.manifest_file_path is None
+
+
+def test_expand_jobs_output_collisions(tmp_path: Path) -> None:
+    """Test that jobs of files with the same stem get distinct outputs.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    for name in ["a/mesh.stl", "b/c/mesh.stl", "b/c/mesh.vtu", "d/other.stl"]:
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).touch()
+
+    config = _batch_config(
+        tmp_path,
+        input_file_paths=[
+            str(tmp_path / "a" / "mesh.stl"),
+            str(tmp_path / "b" / "c" / "mesh.*"),
+            str(tmp_path / "d" / "other.stl"),
+        ],
+        jobs=[{"general": {"output_file_path": str(tmp_path / "other.png")}}],
+    )
+
+    jobs = expand_jobs(config)
+
+    assert [job.general.output_file_path for job in jobs] == [
+        str(tmp_path / "a_mesh.png"),
+        str(tmp_path / "b_c_mesh_0001.png"),
+        str(tmp_path / "b_c_mesh_0002.png"),
+        str(tmp_path / "other_0003.png"),
+        str(tmp_path / "other_0004.png"),
+    ]
+
+
+def test_run_batch(tmp_path: Path) -> None:
+    """Test that all jobs share one session and a summary is written.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    config = _batch_config(tmp_path, jobs=[{}, {}, {}])
+
+    def _pipeline(job_config: object, clear_only: bool, profiler: object) -> list[str]:
+        """Render a job, failing for the second job.
+
+        Args:
+            job_config: Munch type config of the job.
+            clear_only: Whether the scene is only cleared.
+            profiler: Profiler of the job.
+
+        Returns:
+            Paths of the output files.
+        """
+
+        if job_config.general.output_file_path.endswith("0001.png"):
+            raise RuntimeError("broken mesh")
+        return [job_config.general.output_file_path]
+
+    with patch(
+        "obscura.core.rendering.rendering_pipeline.rendering_pipeline",
+        side_effect=_pipeline,
+    ) as mock_pipeline:
+        results = run_batch(config)
+
+    # factory reset only for the first job
+    assert [call.kwargs["clear_only"] for call in mock_pipeline.call_args_list] == [
+        False,
+        True,
+        True,
+    ]
+    assert [result["status"] for result in results] == ["done", "failed", "done"]
+    assert results[1]["error"] == "broken mesh"
+
+    with open(os.path.join(tmp_path, "batch", "batch_summary.json"), "r") as file:
+        summary = json.load(file)
+    assert summary["num_jobs"] == 3
+    assert summary["num_failed"] == 1
+    assert summary["jobs"][2]["output_files"] == [str(tmp_path / "render_0002.png")]
+
+    # abort on first error if requested
+    config.batch.continue_on_error = False
+    with (
+        patch(
+            "obscura.core.rendering.rendering_pipeline.rendering_pipeline",
+            side_effect=_pipeline,
+        ),
+        pytest.raises(RuntimeError, match="broken mesh"),
+    ):
+        run_batch(config)
+
+
+def test_run_batch_write_error(tmp_path: Path) -> None:
+    """Test that jobs whose images fail to be written are failed.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    config = _batch_config(tmp_path, jobs=[{}, {}])
+
+    def _wait_for_writes(paths: list[str] | None = None) -> None:
+        """Fail the image writes of the first job.
+
+        Args:
+            paths: Paths of the images to wait for.
+        """
+
+        if paths and paths[0].endswith("0000.png"):
+            raise OSError("disk full")
+
+    with (
+        patch(
+            "obscura.core.rendering.rendering_pipeline.rendering_pipeline",
+            side_effect=lambda job_config, **kwargs: [
+                job_config.general.output_file_path
+            ],
+        ),
+        patch("obscura.core.image_io.wait_for_writes", side_effect=_wait_for_writes),
+    ):
+        results = run_batch(config)
+
+    assert [result["status"] for result in results] == ["failed", "done"]
+    assert results[0]["error"] == "disk full"
+    with open(os.path.join(tmp_path, "batch", "batch_summary.json"), "r") as file:
+        assert json.load(file)["num_failed"] == 1
+
+
+def test_run_batch_render_cache(tmp_path: Path) -> None:
+    """Test that cached jobs are not rendered again.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    config = _batch_config(tmp_path, jobs=[{}, {}])
+    config.render_cache = {
+        "mode": True,
+        "directory": str(tmp_path / "cache"),
+        "max_size_mb": 1,
+    }
+
+    with (
+        patch("obscura.core.batch.RenderCache.key", side_effect=["a", "b"]),
+        patch("obscura.core.batch.RenderCache.lookup", side_effect=[["a.png"], None]),
+        patch("obscura.core.batch.RenderCache.store") as mock_store,
+        patch(
+            "obscura.core.rendering.rendering_pipeline.rendering_pipeline",
+            return_value=["b.png"],
+        ) as mock_pipeline,
+    ):
+        results = run_batch(config)
+
+    assert [result["status"] for result in results] == ["cached", "done"]
+    assert [result["output_files"] for result in results] == [["a.png"], ["b.png"]]
+    # first rendered job starts from factory settings
+    mock_pipeline.assert_called_once()
+    assert mock_pipeline.call_args.kwargs["clear_only"] is False
+    mock_store.assert_called_once()
+    assert mock_store.call_args.args[1:] == ("b", ["b.png"])
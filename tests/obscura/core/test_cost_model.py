@@ -0,0 +1,99 @@
+"""Test the render time model of the engines."""
+
+import json
+from pathlib import Path
+
+import numpy as np
+from munch import munchify
+
+from obscura.core.cost_model import (
+    fit_cost_model,
+    load_cost_model,
+    predict_seconds,
+    select_engine,
+)
+
+COST_MODEL = {
+    "CYCLES": [0.1, 1.0, 10.0, 0.4],
+    "BLENDER_WORKBENCH": [0.05, 2.0, 1.5, 0.0],
+}
+
+
+def _benchmark_results() -> dict:
+    """Create benchmark results following the cost model exactly.
+
+    Returns:
+        Benchmark results.
+    """
+
+    results = []
+    for engine, coefficients in COST_MODEL.items():
+        for triangles in [1_000, 100_000, 1_000_000]:
+            for resolution in [[256, 160], [960, 600]]:
+                for samples in [4, 16]:
+                    seconds = predict_seconds(
+                        coefficients,
+                        triangles,
+                        resolution[0] * resolution[1],
+                        samples if engine == "CYCLES" else 0,
+                    )
+                    results.append(
+                        {
+                            "triangles": triangles,
+                            "engine": engine,
+                            "resolution": resolution,
+                            "samples": samples,
+                            "seconds_per_image": seconds,
+                        }
+                    )
+    return {"results": results}
+
+
+def test_fit_cost_model(tmp_path: Path) -> None:
+    """Test that the coefficients are recovered from benchmark results.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    cost_model = fit_cost_model(_benchmark_results())
+
+    for engine, coefficients in COST_MODEL.items():
+        np.testing.assert_allclose(cost_model[engine], coefficients, atol=1e-9)
+
+    # fitted coefficients replace the configured ones of the same engine
+    benchmark_file = tmp_path / "benchmark.json"
+    benchmark_file.write_text(json.dumps(_benchmark_results()))
+    auto = munchify(
+        {
+            "benchmark_file": str(benchmark_file),
+            "cost_model": {
+                "CYCLES": [0.0, 0.0, 0.0, 0.0],
+                "BLENDER_EEVEE_NEXT": [1.0, 0.0, 0.0, 0.0],
+            },
+        }
+    )
+    cost_model = load_cost_model(auto)
+    assert list(cost_model) == ["CYCLES", "BLENDER_EEVEE_NEXT"]
+    np.testing.assert_allclose(cost_model["CYCLES"], COST_MODEL["CYCLES"], atol=1e-9)
+    assert cost_model["BLENDER_EEVEE_NEXT"] == [1.0, 0.0, 0.0, 0.0]
+
+
+def test_select_engine() -> None:
+    """Test that the best engine within the time limit is selected."""
+
+    auto = munchify({"max_seconds": 0.5, "cost_model": COST_MODEL})
+
+    # small thumbnail: 0.64 s with Cycles, 0.11 s with Workbench
+    assert select_engine(auto, 1_000, 256 * 160, 8) == "BLENDER_WORKBENCH"
+    auto.max_seconds = 1.0
+    assert select_engine(auto, 1_000, 256 * 160, 8) == "CYCLES"
+    # none within the limit -> fastest engine
+    auto.max_seconds = 0.01
+    assert select_engine(auto, 1_000, 256 * 160, 8) == "BLENDER_WORKBENCH"
+    assert select_engine(auto, 10_000_000, 256 * 160, 1) == "CYCLES"
+    # engines which can not render the scene are skipped
+    assert (
+        select_engine(auto, 1_000, 256 * 160, 8, exclude=("BLENDER_WORKBENCH",))
+        == "CYCLES"
+    )
@@ -0,0 +1,46 @@
+"""Test content hashes of input files."""
+
+import hashlib
+import os
+from pathlib import Path
+
+from obscura.core.hashing import file_hash, indexed_file_hash
+
+
+def test_file_hash(tmp_path: Path) -> None:
+    """Test that the hash is the SHA-256 of the file's content.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    file_path = tmp_path / "mesh.stl"
+    file_path.write_bytes(b"mesh" * 1000)
+
+    assert (
+        file_hash(str(file_path), chunk_size=7)
+        == hashlib.sha256(b"mesh" * 1000).hexdigest()
+    )
+
+
+def test_indexed_file_hash(tmp_path: Path) -> None:
+    """Test that hashes are memoized until the file changes.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    file_path = tmp_path / "mesh.stl"
+    file_path.write_bytes(b"mesh")
+    directory = str(tmp_path / "hashes")
+
+    digest = indexed_file_hash(str(file_path), directory)
+    assert digest == hashlib.sha256(b"mesh").hexdigest()
+    assert len(os.listdir(directory)) == 1
+
+    # changed files get a new index entry
+    file_path.write_bytes(b"other mesh")
+    assert indexed_file_hash(str(file_path), directory) == (
+        hashlib.sha256(b"other mesh").hexdigest()
+    )
+    assert len(os.listdir(directory)) == 2
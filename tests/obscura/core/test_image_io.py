@@ -0,0 +1,248 @@
+"""Test image output."""
+
+import struct
+import zlib
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from obscura.core.image_io import (
+    PNG_SIGNATURE,
+    AsyncImageWriter,
+    PngWriter,
+    async_writer,
+    png_compression_level,
+    read_tga,
+    text_mask,
+)
+
+
+def _read_png_chunks(path: Path) -> dict[bytes, bytes]:
+    """Read the chunks of a PNG file, concatenating IDAT chunks.
+
+    Args:
+        path: Path of the PNG file.
+
+    Returns:
+        Data of each chunk type.
+    """
+
+    data = path.read_bytes()
+    assert data.startswith(PNG_SIGNATURE)
+
+    chunks: dict[bytes, bytes] = {}
+    offset = len(PNG_SIGNATURE)
+    while offset < len(data):
+        (length,) = struct.unpack(">I", data[offset : offset + 4])
+        chunk_type = data[offset + 4 : offset + 8]
+        chunk = data[offset + 8 : offset + 8 + length]
+        (crc,) = struct.unpack(">I", data[offset + 8 + length : offset + 12 + length])
+        assert crc == zlib.crc32(chunk_type + chunk)
+        chunks[chunk_type] = chunks.get(chunk_type, b"") + chunk
+        offset += length + 12
+    return chunks
+
+
+def _unfilter(scanlines: np.ndarray, channels: int) -> np.ndarray:
+    """Reverse the filters of PNG scanlines.
+
+    Args:
+        scanlines: Scanlines (height, 1 + width * channels) with the
+        filter type in front of every row.
+        channels: Channels per pixel.
+
+    Returns:
+        Pixel rows (height, width * channels).
+    """
+
+    rows = np.zeros((len(scanlines), scanlines.shape[1] - 1), dtype=np.int64)
+    for y, (filter_type, *values) in enumerate(scanlines.astype(np.int64)):
+        for x, value in enumerate(values):
+            left = rows[y, x - channels] if x >= channels else 0
+            up = rows[y - 1, x] if y > 0 else 0
+            upper_left = rows[y - 1, x - channels] if y > 0 and x >= channels else 0
+            if filter_type == 1:
+                value += left
+            elif filter_type == 2:
+                value += up
+            elif filter_type == 4:
+                estimate = left + up - upper_left
+                distances = [abs(estimate - neighbour) for neighbour in (left, up)]
+                distances.append(abs(estimate - upper_left))
+                value += [left, up, upper_left][int(np.argmin(distances))]
+            else:
+                assert filter_type == 0
+            rows[y, x] = value % 256
+    return rows.astype(np.uint8)
+
+
+def test_png_writer(tmp_path: Path) -> None:
+    """Test that rows written in parts form a valid PNG image.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    pixels = np.random.default_rng(0).integers(0, 256, (10, 7, 3), dtype=np.uint8)
+    path = tmp_path / "image.png"
+
+    with PngWriter(str(path), 7, 10, channels=3, chunk_size=16) as writer:
+        writer.write_rows(pixels[:4])
+        writer.write_rows(pixels[4:])
+
+    chunks = _read_png_chunks(path)
+    assert struct.unpack(">IIBBBBB", chunks[b"IHDR"]) == (7, 10, 8, 2, 0, 0, 0)
+    assert b"IEND" in chunks
+    scanlines = np.frombuffer(zlib.decompress(chunks[b"IDAT"]), dtype=np.uint8)
+    scanlines = scanlines.reshape(10, 1 + 7 * 3)
+    assert set(scanlines[:, 0]) <= {1, 2, 4}
+    np.testing.assert_array_equal(_unfilter(scanlines, 3).reshape(10, 7, 3), pixels)
+
+
+def test_png_writer_filters(tmp_path: Path) -> None:
+    """Test that filtered gradients compress better than raw rows.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    x, y = np.meshgrid(np.arange(128), np.arange(96))
+    pixels = np.stack([x, y, (x + y) // 2, np.full_like(x, 255)], axis=-1)
+    pixels = pixels.astype(np.uint8)
+    path = tmp_path / "image.png"
+
+    with PngWriter(str(path), 128, 96, channels=4) as writer:
+        for start in range(0, 96, 40):
+            writer.write_rows(pixels[start : start + 40])
+
+    idat = _read_png_chunks(path)[b"IDAT"]
+    scanlines = np.frombuffer(zlib.decompress(idat), dtype=np.uint8)
+    scanlines = scanlines.reshape(96, 1 + 128 * 4)
+    np.testing.assert_array_equal(_unfilter(scanlines, 4).reshape(96, 128, 4), pixels)
+    raw = np.concatenate(
+        [np.zeros((96, 1), dtype=np.uint8), pixels.reshape(96, -1)], axis=1
+    )
+    assert len(idat) < len(zlib.compress(raw.tobytes(), 6)) / 4
+
+
+def test_png_writer_errors(tmp_path: Path) -> None:
+    """Test that invalid rows and incomplete images are rejected.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    with pytest.raises(ValueError, match="channels"):
+        PngWriter(str(tmp_path / "image.png"), 2, 2, channels=5)
+
+    writer = PngWriter(str(tmp_path / "image.png"), 2, 2)
+    with pytest.raises(ValueError, match="do not match"):
+        writer.write_rows(np.zeros((1, 3, 4), dtype=np.uint8))
+    writer.write_rows(np.zeros((1, 2, 4), dtype=np.uint8))
+    with pytest.raises(ValueError, match="Only 1 of 2 rows"):
+        writer.close()
+
+
+def test_png_compression_level() -> None:
+    """Test that the PNG compression of Blender maps onto valid zlib
+    levels."""
+
+    assert png_compression_level(0) == 0
+    assert png_compression_level(15) == 1
+    assert png_compression_level(50) == 4
+    assert png_compression_level(100) == 9
+    for compression in range(101):
+        zlib.compressobj(png_compression_level(compression))
+
+
+def test_text_mask() -> None:
+    """Test rasterizing text with the built-in font."""
+
+    np.testing.assert_array_equal(
+        text_mask("1-"),
+        [
+            [0, 1, 0, 0, 0, 0, 0],
+            [1, 1, 0, 0, 0, 0, 0],
+            [0, 1, 0, 0, 1, 1, 1],
+            [0, 1, 0, 0, 0, 0, 0],
+            [1, 1, 1, 0, 0, 0, 0],
+        ],
+    )
+    # lowercase letters are drawn as uppercase, unknown characters as "?"
+    np.testing.assert_array_equal(text_mask("e"), text_mask("E"))
+    np.testing.assert_array_equal(text_mask("%"), text_mask("?"))
+    assert text_mask("ab", scale=2).shape == (10, 14)
+    assert text_mask("").shape == (5, 0)
+
+
+def test_read_tga(tmp_path: Path) -> None:
+    """Test reading of an uncompressed TGA image stored from the bottom.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    pixels = np.random.default_rng(0).integers(0, 256, (3, 5, 4), dtype=np.uint8)
+    header = struct.pack("<BBBHHBHHHHBB", 0, 0, 2, 0, 0, 0, 0, 0, 5, 3, 32, 8)
+    path = tmp_path / "image.tga"
+    # BGRA rows from the bottom
+    path.write_bytes(header + pixels[::-1][:, :, [2, 1, 0, 3]].tobytes())
+
+    np.testing.assert_array_equal(read_tga(str(path)), pixels)
+
+    path.write_bytes(struct.pack("<BBBHHBHHHHBB", 0, 0, 10, 0, 0, 0, 0, 0, 5, 3, 32, 8))
+    with pytest.raises(ValueError, match="not supported"):
+        read_tga(str(path))
+
+
+def test_async_image_writer(tmp_path: Path) -> None:
+    """Test that queued images are written and errors are raised on wait.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    writer = AsyncImageWriter(num_threads=1)
+    for index in range(4):
+        writer.submit(
+            str(tmp_path / f"image{index}.png"),
+            np.full((4, 6, 3), index, dtype=np.uint8),
+            compression=1,
+        )
+    writer.wait()
+
+    for index in range(4):
+        chunks = _read_png_chunks(tmp_path / f"image{index}.png")
+        scanlines = np.frombuffer(zlib.decompress(chunks[b"IDAT"]), dtype=np.uint8)
+        assert np.all(_unfilter(scanlines.reshape(4, 1 + 6 * 3), 3) == index)
+
+    # errors are raised when waiting for the failed image only
+    missing_path = str(tmp_path / "missing" / "image.png")
+    writer.submit(missing_path, np.zeros((1, 1, 3)), 1)
+    writer.submit(str(tmp_path / "image.png"), np.zeros((1, 1, 3)), 1)
+    writer.wait([str(tmp_path / "image.png")])
+    with pytest.raises(FileNotFoundError):
+        writer.wait([missing_path])
+    writer.wait()
+
+
+def test_async_writer_threads(tmp_path: Path) -> None:
+    """Test that the writer of the process follows the number of threads
+    and keeps the images queued before a change.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    writer = async_writer(1)
+    assert async_writer(1) is writer
+    writer.submit(str(tmp_path / "image.png"), np.zeros((4, 6, 3), np.uint8), 1)
+
+    new_writer = async_writer(3)
+    assert new_writer is not writer
+    assert new_writer.num_threads == 3
+    assert new_writer.executor._max_workers == 3
+
+    new_writer.wait([str(tmp_path / "image.png")])
+    assert (tmp_path / "image.png").is_file()
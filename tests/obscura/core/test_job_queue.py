@@ -0,0 +1,168 @@
+"""Test distributed rendering via the job queue."""
+
+import multiprocessing
+import os
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import yaml
+from munch import munchify
+
+from obscura.core.job_queue import JobQueue, run_coordinator, run_worker, submit_jobs
+
+
+def _queue_config(tmp_path: Path, **queue: object) -> object:
+    """Create a minimal batch config with a job queue.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+        **queue: Settings of the queue section.
+
+    Returns:
+        Munch type config.
+    """
+
+    return munchify(
+        {
+            "general": {
+                "output_directory": str(tmp_path),
+                "sim_name": "queue",
+                "input_file_path": "base.stl",
+                "output_file_path": str(tmp_path / "render.png"),
+            },
+            "batch": {"mode": True, "jobs": [{}, {}, {}]},
+            "queue": {
+                "mode": True,
+                "directory": str(tmp_path / "jobs"),
+                "lease_seconds": 60,
+                "heartbeat_seconds": 0.05,
+                "max_attempts": 2,
+                "poll_seconds": 0.01,
+                **queue,
+            },
+        }
+    )
+
+
+def test_job_queue_lease_expiry(tmp_path: Path) -> None:
+    """Test that jobs of crashed workers are retried and finally failed.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    queue = JobQueue(str(tmp_path), lease_seconds=10, max_attempts=2)
+    queue.submit("job", munchify({"general": {}}))
+
+    for attempt in [1, 2]:
+        running_path, job = queue.claim("crashed")
+        assert job["attempts"] == attempt
+        assert queue.claim("other") is None
+        assert queue.reap_expired() == 0  # lease still valid
+
+        # no heartbeat of the crashed worker for longer than the lease
+        os.utime(running_path, (time.time() - 20, time.time() - 20))
+        assert queue.reap_expired() == 1
+        assert not queue.heartbeat(running_path)  # lease lost
+
+    assert queue.is_idle()
+    with open(queue.path("failed", "job"), "r") as file:
+        assert yaml.safe_load(file)["error"] == "lease expired"
+
+
+def _claim_all(directory: str, worker_id: str) -> None:
+    """Claim and complete jobs until the queue is empty.
+
+    Args:
+        directory: Queue directory.
+        worker_id: Id of the worker.
+    """
+
+    queue = JobQueue(directory, lease_seconds=60, max_attempts=1)
+    while (claimed := queue.claim(worker_id)) is not None:
+        running_path, job = claimed
+        queue.complete(running_path, job, {"status": "done"})
+
+
+def test_job_queue_concurrent_claims(tmp_path: Path) -> None:
+    """Test that every job is claimed by exactly one of several processes.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    queue = JobQueue(str(tmp_path), lease_seconds=60, max_attempts=1)
+    for index in range(40):
+        queue.submit(f"job{index:02d}", munchify({"general": {}}))
+
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_claim_all, args=(str(tmp_path), f"worker{index}"))
+        for index in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=60)
+        assert process.exitcode == 0
+
+    done = queue.jobs("done")
+    assert len(done) == 40
+    for path in done:
+        with open(path, "r") as file:
+            assert yaml.safe_load(file)["attempts"] == 1
+    assert queue.is_idle()
+
+
+def test_run_worker_and_coordinator(tmp_path: Path) -> None:
+    """Test rendering, retries and the summary of submitted jobs.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    config = _queue_config(tmp_path)
+    job_ids = submit_jobs(config)
+    assert len(job_ids) == 3
+
+    def _pipeline(job_config: object, clear_only: bool, profiler: object) -> list[str]:
+        """Render a job, failing for the second job.
+
+        Args:
+            job_config: Munch type config of the job.
+            clear_only: Whether the scene is only cleared.
+            profiler: Profiler of the job.
+
+        Returns:
+            Paths of the output files.
+        """
+
+        assert "queue" not in job_config
+        if job_config.general.output_file_path.endswith("0001.png"):
+            raise RuntimeError("broken mesh")
+        return [job_config.general.output_file_path]
+
+    with patch(
+        "obscura.core.rendering.rendering_pipeline.rendering_pipeline",
+        side_effect=_pipeline,
+    ) as mock_pipeline:
+        # the broken job is retried once
+        assert run_worker(config) == 4
+
+    assert [call.kwargs["clear_only"] for call in mock_pipeline.call_args_list] == [
+        False,
+        True,
+        True,
+        True,
+    ]
+
+    # the coordinator collects the results of the jobs submitted by itself
+    with patch("obscura.core.job_queue.submit_jobs", return_value=job_ids):
+        results = run_coordinator(config)
+
+    assert [result["status"] for result in results] == ["done", "failed", "done"]
+    assert results[1]["attempts"] == 2
+    assert results[1]["error"] == "broken mesh"
+    assert results[2]["output_files"] == [str(tmp_path / "render_0002.png")]
+    assert os.path.isfile(tmp_path / "queue" / "queue_summary.json")
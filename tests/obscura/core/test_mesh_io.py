@@ -0,0 +1,370 @@
+"""Test mesh reading."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+import vtk
+from vtk.util.numpy_support import numpy_to_vtk
+
+from obscura.core.mesh_io import (
+    read_point_cloud,
+    read_points,
+    read_pvd,
+    read_pvtu,
+    read_stl_welded,
+    read_surface,
+    read_surface_field,
+    read_surface_streaming,
+    weld_vertices,
+    write_binary_stl,
+)
+
+
+def _write_grid(file_path: Path) -> None:
+    """Write a hexahedral grid with 3x2x2 points to a VTU file.
+
+    The grid has the point arrays "x" (x-coordinate) and "velocity"
+    (vectors of length 5) and the cell array "id" (cell index).
+
+    Args:
+        file_path (Path): Path of the VTU file.
+    """
+
+    image = vtk.vtkImageData()
+    image.SetDimensions(3, 2, 2)
+    x = numpy_to_vtk(np.tile([0.0, 1.0, 2.0], 4), deep=True)
+    x.SetName("x")
+    image.GetPointData().AddArray(x)
+    velocity = numpy_to_vtk(np.tile([3.0, 4.0, 0.0], (12, 1)), deep=True)
+    velocity.SetName("velocity")
+    image.GetPointData().AddArray(velocity)
+    cell_id = numpy_to_vtk(np.array([0.0, 1.0]), deep=True)
+    cell_id.SetName("id")
+    image.GetCellData().AddArray(cell_id)
+    append = vtk.vtkAppendFilter()
+    append.SetInputData(image)
+    append.Update()
+
+    writer = vtk.vtkXMLUnstructuredGridWriter()
+    writer.SetInputData(append.GetOutput())
+    writer.SetFileName(str(file_path))
+    writer.Write()
+
+
+def test_read_surface(tmp_path: Path) -> None:
+    """Test extraction of the triangulated surface of a volume mesh.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    file_path = tmp_path / "grid.vtu"
+    _write_grid(file_path)
+
+    points, triangles, point_ids = read_surface(str(file_path))
+
+    # 2 hexahedra with 10 outer quads -> 20 triangles, all points on surface
+    assert points.shape == (12, 3)
+    assert points.dtype == np.float32
+    assert triangles.shape == (20, 3)
+    assert triangles.max() == 11
+    np.testing.assert_array_equal(read_points(str(file_path))[point_ids], points)
+
+
+def test_read_surface_pvtu(tmp_path: Path) -> None:
+    """Test that the surface of a PVTU file matches the surface of the
+    same mesh in a single VTU file.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    source = vtk.vtkRTAnalyticSource()
+    source.SetWholeExtent(0, 6, 0, 3, 0, 4)
+    append = vtk.vtkAppendFilter()
+    append.SetInputConnection(source.GetOutputPort())
+
+    vtu_path = tmp_path / "grid.vtu"
+    writer = vtk.vtkXMLUnstructuredGridWriter()
+    writer.SetInputConnection(append.GetOutputPort())
+    writer.SetFileName(str(vtu_path))
+    writer.Write()
+
+    pvtu_path = tmp_path / "grid.pvtu"
+    parallel_writer = vtk.vtkXMLPUnstructuredGridWriter()
+    parallel_writer.SetInputConnection(append.GetOutputPort())
+    parallel_writer.SetFileName(str(pvtu_path))
+    parallel_writer.SetNumberOfPieces(3)
+    parallel_writer.SetStartPiece(0)
+    parallel_writer.SetEndPiece(2)
+    parallel_writer.Write()
+
+    points, triangles, _ = read_surface(str(vtu_path))
+    pvtu_points, pvtu_triangles, pvtu_point_ids = read_surface(str(pvtu_path))
+
+    # faces between the pieces are removed
+    assert pvtu_points.shape == points.shape == (110, 3)
+    assert pvtu_triangles.shape == triangles.shape == (216, 3)
+    np.testing.assert_array_equal(
+        np.unique(pvtu_points, axis=0), np.unique(points, axis=0)
+    )
+    np.testing.assert_array_equal(
+        read_points(str(pvtu_path))[pvtu_point_ids], pvtu_points
+    )
+
+    _, field_triangles, values = read_surface_field(str(pvtu_path), "RTData")
+    assert field_triangles.shape == (216, 3)
+    assert values.shape == (110,)
+
+
+def test_read_surface_invalid(tmp_path: Path) -> None:
+    """Test errors for unsupported and missing files.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    with pytest.raises(ValueError, match="not supported"):
+        read_surface(str(tmp_path / "mesh.obj"))
+    with pytest.raises(FileNotFoundError, match="not found"):
+        read_surface(str(tmp_path / "mesh.vtu"))
+
+
+def test_read_surface_field(tmp_path: Path) -> None:
+    """Test values of point and cell arrays at the surface points.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    file_path = tmp_path / "grid.vtu"
+    _write_grid(file_path)
+
+    points, triangles, values = read_surface_field(str(file_path), "x")
+    assert triangles.shape == (20, 3)
+    np.testing.assert_array_equal(values, points[:, 0])
+
+    _, _, values = read_surface_field(str(file_path), "velocity")
+    np.testing.assert_allclose(values, 5.0)
+
+    # points of the middle plane are shared by both cells
+    points, _, values = read_surface_field(str(file_path), "id", "cell")
+    np.testing.assert_allclose(
+        values, np.array([0.0, 0.5, 1.0])[points[:, 0].astype(int)]
+    )
+
+    with pytest.raises(ValueError, match="Cell array x not found"):
+        read_surface_field(str(file_path), "x", "cell")
+
+
+def test_read_point_cloud(tmp_path: Path) -> None:
+    """Test points and point arrays of NumPy and VTK files.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    points = np.random.default_rng(0).random((5, 3))
+    np.save(tmp_path / "points.npy", points)
+    np.savez(tmp_path / "points.npz", points=points, radius=np.arange(5.0))
+
+    read, arrays = read_point_cloud(str(tmp_path / "points.npy"), [])
+    np.testing.assert_allclose(read, points, rtol=1e-6)
+    assert read.dtype == np.float32
+    assert arrays == {}
+
+    _, arrays = read_point_cloud(str(tmp_path / "points.npz"), ["radius"])
+    np.testing.assert_array_equal(arrays["radius"], np.arange(5.0))
+
+    file_path = tmp_path / "grid.vtu"
+    _write_grid(file_path)
+    read, arrays = read_point_cloud(str(file_path), ["x", "velocity"])
+    assert read.shape == (12, 3)
+    np.testing.assert_array_equal(arrays["x"], read[:, 0])
+    np.testing.assert_allclose(arrays["velocity"], 5.0)
+
+    with pytest.raises(ValueError, match="Point array id not found"):
+        read_point_cloud(str(file_path), ["id"])
+
+
+def _area(points: np.ndarray, triangles: np.ndarray) -> float:
+    """Compute the total area of triangles.
+
+    Args:
+        points: Points (n, 3).
+        triangles: Triangles (m, 3).
+
+    Returns:
+        Total area.
+    """
+
+    corners = points[triangles]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    return 0.5 * np.linalg.norm(normals, axis=1).sum()
+
+
+def test_read_surface_streaming(tmp_path: Path) -> None:
+    """Test that the surface streamed by pieces matches the full surface.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    # the writer requests the pieces from a streaming pipeline
+    source = vtk.vtkRTAnalyticSource()
+    source.SetWholeExtent(0, 6, 0, 3, 0, 4)
+    append = vtk.vtkAppendFilter()
+    append.SetInputConnection(source.GetOutputPort())
+
+    file_path = tmp_path / "grid.vtu"
+    writer = vtk.vtkXMLUnstructuredGridWriter()
+    writer.SetInputConnection(append.GetOutputPort())
+    writer.SetFileName(str(file_path))
+    writer.SetNumberOfPieces(3)
+    writer.Write()
+
+    points, triangles = read_surface_streaming(str(file_path))
+
+    # 6x3x4 cells: 140 points of which 30 are inner points, faces between
+    # the pieces are removed
+    assert points.shape == (110, 3)
+    assert triangles.shape == (2 * 2 * (6 * 3 + 6 * 4 + 3 * 4), 3)
+    assert np.isclose(_area(points, triangles), 2 * (6 * 3 + 6 * 4 + 3 * 4))
+    assert len(np.unique(points, axis=0)) == len(points)
+
+    # more pieces than stored in the file are read as the stored pieces
+    more_points, more_triangles = read_surface_streaming(str(file_path), 5)
+    np.testing.assert_array_equal(more_points, points)
+    np.testing.assert_array_equal(more_triangles, triangles)
+
+    single_path = tmp_path / "single.vtu"
+    _write_grid(single_path)
+    points, triangles = read_surface_streaming(str(single_path), 2)
+    assert points.shape == (12, 3)
+    assert triangles.shape == (20, 3)
+
+    with pytest.raises(ValueError, match="can not be streamed"):
+        read_surface_streaming(str(tmp_path / "mesh.stl"))
+
+    empty_path = tmp_path / "empty.vtu"
+    writer = vtk.vtkXMLUnstructuredGridWriter()
+    writer.SetInputData(vtk.vtkUnstructuredGrid())
+    writer.SetFileName(str(empty_path))
+    writer.Write()
+    with pytest.raises(ValueError, match="No surface extracted"):
+        read_surface_streaming(str(empty_path))
+
+
+def test_read_pvd(tmp_path: Path) -> None:
+    """Test ordering of the datasets of a ParaView collection.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    file_path = tmp_path / "series.pvd"
+    file_path.write_text(
+        '<VTKFile type="Collection"><Collection>'
+        '<DataSet timestep="1.0" file="b.vtu"/>'
+        '<DataSet timestep="0.5" file="a.vtu"/>'
+        "</Collection></VTKFile>"
+    )
+
+    assert read_pvd(str(file_path)) == [
+        str(tmp_path / "a.vtu"),
+        str(tmp_path / "b.vtu"),
+    ]
+
+    file_path.write_text(
+        '<VTKFile type="Collection"><Collection>'
+        '<DataSet timestep="0"/>'
+        "</Collection></VTKFile>"
+    )
+    with pytest.raises(ValueError, match="DataSet without file attribute"):
+        read_pvd(str(file_path))
+
+
+def test_read_stl_welded(tmp_path: Path) -> None:
+    """Test that the triangle corners of an STL file are merged.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    # 2x2 grid of quads, the last triangle is degenerate
+    x, y = np.meshgrid(np.arange(3.0), np.arange(3.0), indexing="ij")
+    points = np.stack([x.ravel(), y.ravel(), np.zeros(9)], axis=-1)
+    triangles = np.array(
+        [[0, 3, 4], [0, 4, 1], [1, 4, 5], [1, 5, 2], [3, 6, 7], [3, 7, 4], [4, 7, 7]]
+    )
+    write_binary_stl(str(tmp_path / "mesh.stl"), points, triangles)
+
+    welded_points, welded_triangles = read_stl_welded(str(tmp_path / "mesh.stl"))
+
+    assert len(welded_points) == 8  # point 8 is not used
+    assert len(welded_triangles) == 6
+    np.testing.assert_array_equal(
+        welded_points[welded_triangles], points[triangles[:6]].astype(np.float32)
+    )
+
+    write_binary_stl(str(tmp_path / "empty.stl"), points, triangles[:0])
+    welded_points, welded_triangles = read_stl_welded(str(tmp_path / "empty.stl"))
+
+    assert welded_points.shape == (0, 3)
+    assert welded_triangles.shape == (0, 3)
+
+    (tmp_path / "ascii.stl").write_text("solid mesh\nendsolid mesh\n")
+    with pytest.raises(ValueError, match="is no binary STL file"):
+        read_stl_welded(str(tmp_path / "ascii.stl"))
+
+
+def test_weld_vertices() -> None:
+    """Test merging of vertices within the tolerance."""
+
+    corners = np.array(
+        [[0.0, 0.0, 0.0], [1.0, 1.0, 1.0], [1e-8, 0.0, -0.0], [1.0, 1.0, 1.001]],
+        dtype=np.float32,
+    )
+
+    points, indices = weld_vertices(corners, 1e-6)
+    assert len(points) == 3
+    np.testing.assert_array_equal(indices[[0, 2]], indices[0])
+    np.testing.assert_allclose(points[indices], corners, atol=1e-7)
+
+    points, indices = weld_vertices(corners, 1e-2)
+    assert len(points) == 2
+
+    points, indices = weld_vertices(corners, 0.0)
+    assert len(points) == 4
+
+    points, indices = weld_vertices(corners[:0], 1e-6)
+    assert points.shape == (0, 3)
+    assert len(indices) == 0
+
+
+def test_read_pvtu(tmp_path: Path) -> None:
+    """Test the piece files of a parallel VTU file.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    file_path = tmp_path / "mesh.pvtu"
+    file_path.write_text(
+        '<VTKFile type="PUnstructuredGrid"><PUnstructuredGrid>'
+        '<Piece Source="mesh_0.vtu"/><Piece Source="mesh_1.vtu"/>'
+        "</PUnstructuredGrid></VTKFile>"
+    )
+
+    assert read_pvtu(str(file_path)) == [
+        str(tmp_path / "mesh_0.vtu"),
+        str(tmp_path / "mesh_1.vtu"),
+    ]
+
+    file_path.write_text(
+        '<VTKFile type="PUnstructuredGrid"><PUnstructuredGrid>'
+        "<Piece/></PUnstructuredGrid></VTKFile>"
+    )
+    with pytest.raises(ValueError, match="Piece without Source attribute"):
+        read_pvtu(str(file_path))
@@ -0,0 +1,121 @@
+"""Test parallel rendering."""
+
+import json
+import os
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import yaml
+from munch import munchify
+
+from obscura.core.parallel import _worker_command, run_parallel
+
+
+def test_run_parallel(tmp_path: Path) -> None:
+    """Test sharding of jobs over workers and merging of their results.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    config = munchify(
+        {
+            "general": {
+                "output_directory": str(tmp_path),
+                "sim_name": "sim",
+                "input_file_path": "base.stl",
+                "output_file_path": str(tmp_path / "render.png"),
+            },
+            "batch": {"mode": False, "jobs": [{}, {}, {}]},
+            "parallel": {"mode": True, "num_workers": 2, "threads_per_worker": 3},
+            "render": {"threads": 0},
+        }
+    )
+
+    def _popen(command: list[str], env: dict) -> MagicMock:
+        """Run a worker, writing its batch summary or failing the second
+        worker.
+
+        Args:
+            command: Command of the worker with the config file last.
+            env: Environment variables of the worker.
+
+        Returns:
+            Mocked worker process.
+        """
+
+        config_file_path = command[-1]
+        with open(config_file_path, "r") as file:
+            worker_config = munchify(yaml.safe_load(file))
+
+        assert worker_config.render.threads == 3
+        assert worker_config.batch.mode
+        assert not worker_config.parallel.mode
+        assert env["OMP_NUM_THREADS"] == "3"
+
+        process = MagicMock()
+        if worker_config.general.sim_name == "sim_worker01":
+            process.wait.return_value = 1
+            return process
+
+        process.wait.return_value = 0
+        os.makedirs(tmp_path / worker_config.general.sim_name)
+        with open(
+            tmp_path / worker_config.general.sim_name / "batch_summary.json", "w"
+        ) as file:
+            json.dump(
+                {
+                    "jobs": [
+                        {
+                            "input_file_path": job["general"]["input_file_path"],
+                            "output_files": [job["general"]["output_file_path"]],
+                            "status": "done",
+                            "error": None,
+                            "seconds": 1.0,
+                        }
+                        for job in worker_config.batch.jobs
+                    ]
+                },
+                file,
+            )
+        return process
+
+    with patch(
+        "obscura.core.parallel.subprocess.Popen", side_effect=_popen
+    ) as mock_popen:
+        results = run_parallel(config)
+
+    assert mock_popen.call_count == 2
+    assert [result["index"] for result in results] == [0, 1, 2]
+    assert [result["worker"] for result in results] == [0, 1, 0]
+    assert [result["status"] for result in results] == ["done", "failed", "done"]
+    assert results[2]["output_files"] == [str(tmp_path / "render_0002.png")]
+
+    with open(tmp_path / "sim" / "parallel_summary.json", "r") as file:
+        summary = json.load(file)
+    assert summary["num_workers"] == 2
+    assert summary["num_failed"] == 1
+
+
+def test_worker_command() -> None:
+    """Test the worker command within and outside of Blender."""
+
+    # bpy is not imported outside of Blender
+    with patch.dict(sys.modules, {"bpy": None}):
+        command = _worker_command("worker.yaml")
+        assert sys.modules["bpy"] is None
+    assert command == [
+        sys.executable,
+        "-m",
+        "obscura.main",
+        "--config_file_path",
+        "worker.yaml",
+    ]
+
+    mock_bpy = MagicMock()
+    mock_bpy.app.binary_path = "/opt/blender/blender"
+    with patch.dict(sys.modules, {"bpy": mock_bpy}):
+        command = _worker_command("worker.yaml")
+    assert command[:2] == ["/opt/blender/blender", "--background"]
+    assert "'worker.yaml'" in command[-1]
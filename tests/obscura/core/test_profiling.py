@@ -0,0 +1,55 @@
+"""Test profiling."""
+
+import csv
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from obscura.core.profiling import StageProfiler
+
+
+def test_stage_profiler(tmp_path: Path) -> None:
+    """Test recording and writing of stage timings.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    profiler = StageProfiler(use_cprofile=True)
+
+    with profiler.profile():
+        with profiler.stage("load"):
+            sum(range(1000))
+        profiler.label = "job0001"
+        with profiler.stage("load"):
+            pass
+        with pytest.raises(RuntimeError):
+            with profiler.stage("render"):
+                raise RuntimeError("render failed")
+
+    # failing stages are recorded as well
+    assert [record["stage"] for record in profiler.records] == [
+        "load",
+        "load",
+        "render",
+    ]
+    assert profiler.records[0]["label"] is None
+    assert profiler.records[1]["label"] == "job0001"
+    assert all(record["wall_time"] >= 0 for record in profiler.records)
+    assert all(record["process_peak_rss_mb"] > 0 for record in profiler.records)
+    assert all(record["peak_rss_increase_mb"] >= 0 for record in profiler.records)
+
+    profiler.write(str(tmp_path))
+
+    with open(tmp_path / "profile.json", "r") as file:
+        profile = json.load(file)
+    assert set(profile["totals"]) == {"load", "render"}
+    assert len(profile["stages"]) == 3
+
+    with open(tmp_path / "profile.csv", "r", newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert [row["stage"] for row in rows] == ["load", "load", "render"]
+
+    assert os.path.isfile(tmp_path / "profile.prof")
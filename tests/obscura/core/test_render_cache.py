@@ -0,0 +1,143 @@
+"""Test render cache."""
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+from munch import Munch, munchify
+
+from obscura.core.config import merge_config
+from obscura.core.render_cache import RenderCache
+
+
+def test_render_cache_key(tmp_path: Path, cache_config: Munch) -> None:
+    """Test that only input contents and render settings change the key.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+        cache_config (Munch): Config with an input file from the fixture.
+    """
+
+    config = cache_config
+    cache = RenderCache.from_config(config)
+    key = cache.key(config)
+
+    moved = merge_config(
+        config,
+        {
+            "general": {"log_file": "other.log", "output_file_path": "other.png"},
+            "render_cache": {"force": True},
+            "queue": {"directory": str(tmp_path / "other_queue")},
+            "mesh_cache": {"directory": str(tmp_path / "other_meshes")},
+        },
+    )
+    assert cache.key(moved) == key
+    assert (
+        cache.key(merge_config(config, {"material": {"material_roughness": 1}})) != key
+    )
+
+    (tmp_path / "mesh.stl").write_bytes(b"solid changed mesh")
+    assert cache.key(config) != key
+
+    assert RenderCache.from_config(munchify({"render_cache": {"mode": False}})) is None
+
+
+def test_render_cache_store_lookup(tmp_path: Path, cache_config: Munch) -> None:
+    """Test restoring cached images to another output file path.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+        cache_config (Munch): Config with an input file from the fixture.
+    """
+
+    config = cache_config
+    cache = RenderCache.from_config(config)
+    key = cache.key(config)
+    assert cache.lookup(config, key) is None
+
+    (tmp_path / "out").mkdir()
+    output_files = [str(tmp_path / "out" / f"render_view000{i}.png") for i in (1, 2)]
+    for index, output_file in enumerate(output_files):
+        Path(output_file).write_bytes(b"image %d" % index)
+    cache.store(config, key, output_files)
+
+    other = merge_config(
+        config, {"general": {"output_file_path": str(tmp_path / "new" / "a.png")}}
+    )
+    restored = cache.lookup(other, key)
+
+    assert restored == [
+        str(tmp_path / "new" / "a_view0001.png"),
+        str(tmp_path / "new" / "a_view0002.png"),
+    ]
+    assert Path(restored[1]).read_bytes() == b"image 1"
+
+    # forced renders skip the lookup
+    assert RenderCache(cache.directory, 1, force=True).lookup(config, key) is None
+
+
+def test_render_cache_evict(tmp_path: Path, cache_config: Munch) -> None:
+    """Test that the least recently used entries are evicted above the
+    maximum size.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+        cache_config (Munch): Config with an input file from the fixture.
+    """
+
+    config = cache_config
+    cache = RenderCache.from_config(config)
+    (tmp_path / "out").mkdir()
+    output_file = tmp_path / "out" / "render.png"
+    output_file.write_bytes(bytes(2**19 - 1))  # two entries fit into 1 MB
+
+    cache.store(config, "old", [str(output_file)])
+    os.utime(os.path.join(cache.directory, "old"), (0, 0))
+    cache.store(config, "middle", [str(output_file)])
+    os.utime(os.path.join(cache.directory, "middle"), (1, 1))
+    assert cache.lookup(config, "old") is not None  # marked as recently used
+    cache.store(config, "new", [str(output_file)])
+
+    assert cache.lookup(config, "middle") is None
+    assert cache.lookup(config, "old") is not None
+    assert cache.lookup(config, "new") is not None
+
+
+def test_render_cache_key_hashes_once(cache_config: Munch) -> None:
+    """Test that unchanged input files are only hashed once.
+
+    Args:
+        cache_config (Munch): Config with an input file from the fixture.
+    """
+
+    config = cache_config
+    cache = RenderCache.from_config(config)
+
+    with patch("obscura.core.hashing.file_hash", return_value="hash") as mock_file_hash:
+        assert cache.key(config) == cache.key(config)
+
+    mock_file_hash.assert_called_once()
+
+
+def test_render_cache_key_pvtu_pieces(tmp_path: Path, cache_config: Munch) -> None:
+    """Test that changed pieces of a .pvtu file change the key.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+        cache_config (Munch): Config with an input file from the fixture.
+    """
+
+    config = cache_config
+    config.general.input_file_path = str(tmp_path / "mesh.pvtu")
+    (tmp_path / "mesh.pvtu").write_text(
+        '<VTKFile type="PUnstructuredGrid"><PUnstructuredGrid>'
+        '<Piece Source="mesh_0.vtu"/><Piece Source="mesh_1.vtu"/>'
+        "</PUnstructuredGrid></VTKFile>"
+    )
+    (tmp_path / "mesh_0.vtu").write_text("piece 0")
+    (tmp_path / "mesh_1.vtu").write_text("piece 1")
+    cache = RenderCache.from_config(config)
+    key = cache.key(config)
+
+    (tmp_path / "mesh_1.vtu").write_text("changed piece 1")
+    assert cache.key(config) != key
@@ -4,6 +4,7 @@ from unittest.mock import MagicMock, patch
 
 from munch import munchify
 
+from obscura.core.profiling import StageProfiler
 from obscura.core.run import run_obscura
 
 
@@ -17,7 +18,9 @@ def test_run_obscura() -> None:
     # patch RunManager and rendering_pipeline
     with (
         patch("obscura.core.run.RunManager", return_value=mock_run_manager),
-        patch("obscura.core.run.rendering_pipeline") as mock_pipeline,
+        patch(
+            "obscura.core.rendering.rendering_pipeline.rendering_pipeline"
+        ) as mock_pipeline,
     ):
         run_obscura(mock_config)
 
@@ -28,4 +31,62 @@ def test_run_obscura() -> None:
         assert isinstance(args[0], float)
 
         # check rendering pipeline called correctly
-        mock_pipeline.assert_called_once_with(mock_config)
+        mock_pipeline.assert_called_once()
+        args, kwargs = mock_pipeline.call_args
+        assert args == (mock_config,)
+        assert isinstance(kwargs["profiler"], StageProfiler)
+
+        # check stage profile written
+        mock_run_manager.write_profile.assert_called_once_with(kwargs["profiler"])
+
+
+def test_run_obscura_batch() -> None:
+    """Test that batch mode dispatches to the batch runner."""
+
+    mock_config = munchify({"batch": {"mode": True}})
+
+    with (
+        patch("obscura.core.run.RunManager"),
+        patch(
+            "obscura.core.rendering.rendering_pipeline.rendering_pipeline"
+        ) as mock_pipeline,
+        patch("obscura.core.batch.run_batch") as mock_run_batch,
+    ):
+        run_obscura(mock_config)
+
+        mock_run_batch.assert_called_once()
+        assert mock_run_batch.call_args[0][0] == mock_config
+        mock_pipeline.assert_not_called()
+
+
+def test_run_obscura_parallel() -> None:
+    """Test that parallel mode dispatches to the parallel runner."""
+
+    mock_config = munchify({"parallel": {"mode": True}, "batch": {"mode": True}})
+
+    with (
+        patch("obscura.core.run.RunManager"),
+        patch("obscura.core.batch.run_batch") as mock_run_batch,
+        patch("obscura.core.parallel.run_parallel") as mock_run_parallel,
+    ):
+        run_obscura(mock_config)
+
+        mock_run_parallel.assert_called_once_with(mock_config)
+        mock_run_batch.assert_not_called()
+
+
+def test_run_obscura_server() -> None:
+    """Test that server mode dispatches to the render server."""
+
+    mock_config = munchify({"server": {"mode": True}, "batch": {"mode": True}})
+
+    with (
+        patch("obscura.core.run.RunManager"),
+        patch("obscura.core.batch.run_batch") as mock_run_batch,
+        patch("obscura.core.server.run_server") as mock_run_server,
+    ):
+        run_obscura(mock_config)
+
+        mock_run_server.assert_called_once()
+        assert mock_run_server.call_args[0][0] == mock_config
+        mock_run_batch.assert_not_called()
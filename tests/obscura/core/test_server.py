@@ -0,0 +1,231 @@
+"""Test render server."""
+
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from munch import munchify
+
+from obscura.core.server import RenderServer
+
+
+def _request(url: str, data: dict | None = None) -> tuple[int, bytes]:
+    """Send a request to the server.
+
+    Args:
+        url: Request URL.
+        data: JSON data to post, GET request if None.
+
+    Returns:
+        Status code and body of the response.
+    """
+
+    request = urllib.request.Request(
+        url, data=json.dumps(data).encode() if data is not None else None
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as error:
+        return error.code, error.read()
+
+
+def test_render_server(tmp_path: Path) -> None:
+    """Test submitting jobs, polling their status and fetching images.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    config = munchify(
+        {
+            "general": {"output_directory": str(tmp_path), "sim_name": "server"},
+            "server": {"host": "127.0.0.1", "port": 0, "max_queue_size": 1},
+        }
+    )
+    server = RenderServer(config)
+    host, port = server.address
+    url = f"http://{host}:{port}"
+    release = threading.Event()
+
+    def _pipeline(job_config: object, clear_only: bool, profiler: object) -> list:
+        """Render a job once released, failing for jobs without a lens.
+
+        Args:
+            job_config: Munch type config of the job.
+            clear_only: Whether the scene is only cleared.
+            profiler: Profiler of the job.
+
+        Returns:
+            Paths of the output files.
+        """
+
+        if job_config.get("camera", {}).get("lens") is None:
+            raise RuntimeError("broken job")
+        release.wait(timeout=5)
+        Path(job_config.general.output_file_path).parent.mkdir(parents=True)
+        Path(job_config.general.output_file_path).write_bytes(b"png")
+        return [job_config.general.output_file_path]
+
+    def _wait_for(job_id: str, status: str) -> None:
+        """Wait up to five seconds until a job reaches a status.
+
+        Args:
+            job_id: Id of the job.
+            status: Expected status of the job.
+        """
+
+        for _ in range(100):
+            if server.status(job_id)["status"] == status:
+                return
+            time.sleep(0.05)
+
+    with patch(
+        "obscura.core.server.rendering_pipeline", side_effect=_pipeline
+    ) as mock_pipeline:
+        thread = threading.Thread(target=server.serve)
+        thread.start()
+        try:
+            status, body = _request(f"{url}/jobs", {"camera": {"lens": 50}})
+            assert status == 202
+            first_job = json.loads(body)
+            _wait_for(first_job["id"], "running")
+
+            # queue is bounded while the first job is rendering
+            status, body = _request(f"{url}/jobs", {})
+            assert status == 202
+            second_job = json.loads(body)
+            assert _request(f"{url}/jobs", {})[0] == 503
+            assert _request(f"{url}/jobs", [1, 2])[0] == 400
+            assert _request(f"{url}/jobs/{first_job['id']}/image")[0] == 409
+
+            release.set()
+            _wait_for(second_job["id"], "failed")
+            assert _request(f"{url}/jobs/{first_job['id']}/image") == (200, b"png")
+        finally:
+            release.set()
+            server.stop()
+            thread.join(timeout=5)
+
+    # Blender is only reset for the first job
+    assert [call.kwargs["clear_only"] for call in mock_pipeline.call_args_list] == [
+        False,
+        True,
+    ]
+
+    job = server.status(first_job["id"])
+    assert job["status"] == "done"
+    assert job["output_files"] == [
+        str(tmp_path / "server" / "jobs" / f"{first_job['id']}.png")
+    ]
+    assert server.status(second_job["id"])["error"] == "broken job"
+
+
+def test_render_server_requests(tmp_path: Path) -> None:
+    """Test image and error responses of the HTTP interface.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    config = munchify(
+        {
+            "general": {"output_directory": str(tmp_path), "sim_name": "server"},
+            "server": {"host": "127.0.0.1", "port": 0, "max_queue_size": 4},
+        }
+    )
+    server = RenderServer(config)
+    host, port = server.address
+    url = f"http://{host}:{port}"
+    image_path = tmp_path / "server" / "jobs" / "finished.png"
+    image_path.parent.mkdir(parents=True)
+    image_path.write_bytes(b"png")
+    other_path = tmp_path / "other.png"
+    other_path.write_bytes(b"png")
+
+    job = {"id": "finished", "status": "done", "output_files": [str(image_path)]}
+    server.jobs[job["id"]] = job
+    # images outside of the job directory are never served
+    server.jobs["other"] = dict(job, id="other", output_files=[str(other_path)])
+
+    thread = threading.Thread(target=server.serve)
+    thread.start()
+    try:
+        assert _request(f"{url}/jobs/{job['id']}/image") == (200, b"png")
+        assert _request(f"{url}/jobs/{job['id']}")[0] == 200
+        assert _request(f"{url}/jobs/other/image")[0] == 404
+        assert _request(f"{url}/jobs/unknown")[0] == 404
+        assert _request(f"{url}/jobs/{job['id']}/other")[0] == 404
+        assert _request(f"{url}/other", {})[0] == 404
+        # sections overridden by values are rejected with their message
+        status, body = _request(f"{url}/jobs", {"render": 5})
+        assert status == 400
+        assert json.loads(body) == {"error": "render must be a section!"}
+    finally:
+        server.stop()
+        thread.join(timeout=5)
+
+    with pytest.raises(TypeError, match="JSON object"):
+        server.submit([])  # type: ignore[arg-type]
+    with pytest.raises(ValueError, match="general can not be set"):
+        server.submit({"general": {"output_file_path": "/etc/image.png"}})
+    with pytest.raises(ValueError, match="render.auto.benchmark_file can not be set"):
+        server.submit({"render": {"auto": {"benchmark_file": "/etc/passwd"}}})
+    with pytest.raises(ValueError, match="file_format must be one of"):
+        server.submit({"render": {"output": {"file_format": "TIFF"}}})
+    server.config.render = {"output": {"file_format": "PNG"}}
+    with pytest.raises(TypeError, match="render.output must be a section"):
+        server.submit({"render": {"output": "JPEG"}})
+
+    # the extension matches the output format
+    server.submit({"render": {"output": {"file_format": "JPEG"}}})
+    job_id, job_config = server.queue.get_nowait()
+    assert job_config.general.output_file_path == os.path.join(
+        server.job_directory, f"{job_id}.jpg"
+    )
+
+
+def test_render_server_forgets_finished_jobs(tmp_path: Path) -> None:
+    """Test that only the latest finished jobs, their output files and
+    profiler records are kept.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    config = munchify(
+        {
+            "general": {"output_directory": str(tmp_path), "sim_name": "server"},
+            "server": {"host": "127.0.0.1", "port": 0, "max_queue_size": 4},
+        }
+    )
+    server = RenderServer(config)
+    server.http_server.server_close()
+    server.profiler.records = [{"stage": "render"}] * 5
+
+    with (
+        patch("obscura.core.server.MAX_FINISHED_JOBS", 2),
+        patch("obscura.core.server.MAX_PROFILER_RECORDS", 3),
+    ):
+        job_ids = [server.submit({})["id"] for _ in range(3)]
+        os.makedirs(server.job_directory)
+        for job_id in job_ids:
+            for suffix in [".png", "_colorbar.png"]:
+                with open(os.path.join(server.job_directory, job_id + suffix), "w"):
+                    pass
+            server._finish(job_id, status="done")
+
+    assert server.status(job_ids[0]) is None
+    assert server.status(job_ids[2])["status"] == "done"
+    assert sorted(os.listdir(server.job_directory)) == [
+        f"{job_id}{suffix}"
+        for job_id in sorted(job_ids[1:])
+        for suffix in [".png", "_colorbar.png"]
+    ]
+    assert len(server.profiler.records) == 3
@@ -96,3 +96,26 @@ def test_run_manager_finish_run() -> None:
 
         mock_log_full_width.assert_called_with("RUN FINISHED")
         mock_log.info.assert_called_once()
+
+
+def test_run_manager_write_profile(tmp_path: Path) -> None:
+    """Test write_profile function.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    mock_config = munchify(
+        {
+            "general": {
+                "output_directory": str(tmp_path),
+                "sim_name": "sim_name",
+            }
+        }
+    )
+    mock_profiler = MagicMock()
+
+    run_manager = RunManager(mock_config)
+    run_manager.write_profile(mock_profiler)
+
+    mock_profiler.write.assert_called_once_with(os.path.join(tmp_path, "sim_name"))
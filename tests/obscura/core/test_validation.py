@@ -0,0 +1,155 @@
+"""Test config validation."""
+
+from pathlib import Path
+
+import yaml
+from munch import munchify
+
+from obscura.core.validation import validate_config
+
+PARAMS_FILE_PATH = (
+    Path(__file__).parents[3] / "src" / "obscura" / "configs" / "params.yaml"
+)
+
+
+def _config(tmp_path: Path) -> object:
+    """Load the reference config with an existing input file.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+
+    Returns:
+        Munch type config.
+    """
+
+    with open(PARAMS_FILE_PATH, "r") as file:
+        config = munchify(yaml.safe_load(file))
+    (tmp_path / "mesh.stl").touch()
+    config.general.input_file_path = str(tmp_path / "mesh.stl")
+    return config
+
+
+def test_validate_config(tmp_path: Path) -> None:
+    """Test that the reference config is valid.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    assert validate_config(_config(tmp_path)) == []
+
+
+def test_validate_config_without_features(tmp_path: Path) -> None:
+    """Test that configs without the optional feature sections are valid.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    config = _config(tmp_path)
+    for section in [
+        "time_series",
+        "mesh_cache",
+        "lod",
+        "scene_template",
+        "scalar_field",
+        "material_library",
+    ]:
+        del config[section]
+    del config.general.loader
+    del config.camera.framing, config.camera.multi_view
+    del config.render.progressive, config.render.tiles
+
+    assert validate_config(config) == []
+
+
+def test_validate_config_errors(tmp_path: Path) -> None:
+    """Test missing entries, wrong types, choices and input files.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    config = _config(tmp_path)
+    del config.material
+    config.render.samples = "many"
+    config.light.key_light_intensity = True
+    # entries of inactive sections are not required
+    config.camera.framing = {"mode": False}
+
+    assert validate_config(config) == [
+        "material is missing!",
+        "light.key_light_intensity has an invalid type!",
+        "render.samples has an invalid type!",
+    ]
+
+    config = _config(tmp_path)
+    config.camera.type = "FISHEYE"
+    config.general.input_file_path = str(tmp_path / "missing.stl")
+
+    assert validate_config(config) == [
+        "camera.type must be one of PERSP, ORTHO!",
+        f"Input file {tmp_path / 'missing.stl'} not found!",
+    ]
+
+    config = _config(tmp_path)
+    config.batch.mode = True
+    config.batch.input_file_paths = [str(tmp_path / "*.vtu")]
+
+    assert validate_config(config) == [
+        f"Input file {tmp_path / '*.vtu'} not found!",
+    ]
+
+    config = _config(tmp_path)
+    config.general.loader = "points"
+    config.mesh_cache.mode = True
+    config.scalar_field.update(mode=True, array_name="id", association="cell")
+
+    assert validate_config(config) == [
+        "scalar_field of point clouds requires association point!",
+        "Point clouds support neither time_series nor mesh_cache!",
+    ]
+
+    config = _config(tmp_path)
+    config.render.thumbnail.mode = True
+    config.render.thumbnail.engine = "AUTO"
+    config.render.workbench.lighting = "SHADOW"
+    del config.render.auto.max_seconds
+
+    assert validate_config(config) == [
+        "render.workbench.lighting must be one of STUDIO, MATCAP, FLAT!",
+        "render.auto.max_seconds is missing!",
+    ]
+
+    config = _config(tmp_path)
+    config.material_library.update(mode=True, max_materials=0)
+
+    assert validate_config(config) == [
+        "material_library.max_materials must be at least 1!",
+    ]
+
+    config = _config(tmp_path)
+    config.general.loader = "vtk"
+    config.mesh_cache.mode = True
+    config.scalar_field.update(mode=True, array_name="id", association="point")
+
+    assert validate_config(config) == [
+        "scalar_field supports neither time_series nor mesh_cache!",
+    ]
+
+    config = _config(tmp_path)
+    config.general.loader = "points"
+    config.render.engine = "BLENDER_WORKBENCH"
+    config.scalar_field.update(mode=True, array_name="id", association="point")
+
+    assert validate_config(config) == [
+        "BLENDER_WORKBENCH can not color point clouds by scalar_field!",
+    ]
+
+    config = _config(tmp_path)
+    config.render.tiles.mode = True
+    config.render.budget.mode = True
+
+    assert validate_config(config) == [
+        "render.tiles does not support render.budget!",
+    ]
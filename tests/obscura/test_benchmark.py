@@ -0,0 +1,89 @@
+"""Test benchmark."""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+from munch import munchify
+
+from obscura.benchmark import compare_results, run_benchmark, synthetic_mesh
+from obscura.core.mesh_io import read_surface
+
+
+def test_synthetic_mesh() -> None:
+    """Test size and closedness of the synthetic mesh."""
+
+    points, triangles = synthetic_mesh(1000)
+
+    assert 1000 <= len(triangles) < 1200
+    assert triangles.max() == len(points) - 1
+    # closed surface: every edge is shared by exactly two triangles
+    edges = np.sort(triangles[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+    _, counts = np.unique(edges, axis=0, return_counts=True)
+    assert np.all(counts == 2)
+
+
+def test_run_benchmark(tmp_path: Path) -> None:
+    """Test benchmark cases and comparison of results.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    config = munchify(
+        {
+            "general": {"input_file_path": None, "output_file_path": None},
+            "render": {"preview": {"mode": True}},
+        }
+    )
+
+    with patch(
+        "obscura.core.rendering.rendering_pipeline.rendering_pipeline"
+    ) as mock_pipeline:
+        results = run_benchmark(
+            config,
+            sizes=[100],
+            engines=["BLENDER_EEVEE_NEXT", "CYCLES"],
+            resolutions=[(64, 32)],
+            samples=[4, 8],
+            repeats=2,
+            output_directory=str(tmp_path),
+        )
+
+    # samples are only varied for Cycles
+    cases = [(case["engine"], case["samples"]) for case in results["results"]]
+    assert cases == [("BLENDER_EEVEE_NEXT", 4), ("CYCLES", 4), ("CYCLES", 8)]
+    assert mock_pipeline.call_count == 6
+    # the generated mesh size is recorded instead of the target size
+    assert results["results"][0]["triangles"] == len(synthetic_mesh(100)[1])
+    assert results["results"][0]["triangles"] != 100
+
+    case_config = mock_pipeline.call_args[0][0]
+    assert case_config.general.input_file_path == str(tmp_path / "mesh_100.stl")
+    assert case_config.render.resolution_x == 64
+    assert not case_config.render.preview.mode
+    points, _, _ = read_surface(case_config.general.input_file_path)
+    assert len(points) == len(synthetic_mesh(100)[0])
+
+    baseline = {"results": [dict(results["results"][1])]}
+    baseline["results"][0]["images_per_minute"] /= 2
+    comparison = compare_results(results, baseline)
+    assert len(comparison) == 1
+    assert np.isclose(comparison[0]["speedup"], 2.0)
+
+    # the peak memory of a case is its increase of the process peak
+    with (
+        patch("obscura.core.rendering.rendering_pipeline.rendering_pipeline"),
+        patch("obscura.benchmark.peak_rss_mb", side_effect=[100.0, 150.0]),
+    ):
+        memory_results = run_benchmark(
+            config,
+            sizes=[100],
+            engines=["BLENDER_WORKBENCH"],
+            resolutions=[(64, 32)],
+            samples=[4],
+            repeats=1,
+            output_directory=str(tmp_path),
+        )
+    assert memory_results["results"][0]["process_peak_rss_mb"] == 150.0
+    assert memory_results["results"][0]["peak_rss_increase_mb"] == 50.0
@@ -1,5 +1,7 @@
 """Test main."""
 
+import subprocess  # nosec B404
+import sys
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -25,9 +27,14 @@ def test_main_config_file_exists(tmp_path: Path) -> None:
     with (
         patch(
             "argparse.ArgumentParser.parse_args",
-            return_value=MagicMock(config_file_path=str(config_file_path)),
+            return_value=MagicMock(
+                config_file_path=str(config_file_path),
+                validate=False,
+                force=False,
+                worker=False,
+            ),
         ),
-        patch("obscura.main.run_obscura") as mock_run_obscura,
+        patch("obscura.core.run.run_obscura") as mock_run_obscura,
     ):
         main()
 
@@ -45,3 +52,51 @@ def test_main_config_file_not_exists() -> None:
     ):
         with pytest.raises(RuntimeError, match="Config file not found!"):
             main()
+
+
+def test_main_validate(tmp_path: Path) -> None:
+    """Test that validation does not execute a run.
+
+    Args:
+        tmp_path (Path): Temporary path from pytest.
+    """
+
+    config_file_path = tmp_path / "test_config.yaml"
+    with open(config_file_path, "w") as f:
+        yaml.dump({"key": "value"}, f)
+    args = MagicMock(config_file_path=str(config_file_path), validate=True)
+
+    with (
+        patch("argparse.ArgumentParser.parse_args", return_value=args),
+        patch("obscura.main.validate_config", return_value=[]) as mock_validate,
+        patch("obscura.core.run.run_obscura") as mock_run_obscura,
+    ):
+        main()
+
+        mock_validate.assert_called_once_with(munchify({"key": "value"}))
+        mock_run_obscura.assert_not_called()
+
+    with (
+        patch("argparse.ArgumentParser.parse_args", return_value=args),
+        patch("obscura.main.validate_config", return_value=["general is missing!"]),
+        pytest.raises(RuntimeError, match="Config is invalid"),
+    ):
+        main()
+
+
+def test_main_import_is_lightweight() -> None:
+    """Test that importing the entry point does not import Blender or VTK."""
+
+    result = subprocess.run(  # nosec B603
+        [
+            sys.executable,
+            "-c",
+            "import sys, obscura.main; "
+            "print(*sorted({'bpy', 'vtk', 'numpy'} & set(sys.modules)))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.strip() == ""